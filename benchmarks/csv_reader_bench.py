@@ -0,0 +1,61 @@
+"""
+Compare script_helpers.read_delimited (Arrow, multithreaded) with the
+plain pandas.read_csv call the scripts used before, on a synthetic UTF-16
+Facebook export.
+
+    python benchmarks/csv_reader_bench.py --size 1m
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+import generate_data
+from run_benchmarks import DATA_DIR, SCRIPTS_DIR, SIZES
+
+sys.path.insert(0, SCRIPTS_DIR)
+from script_helpers import read_delimited  # noqa: E402
+
+COLUMNS = ["adset_name", "full name", "phone"]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared CSV reader against pandas")
+    parser.add_argument("--size", choices=SIZES, default="1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    options = parser.parse_args()
+
+    rows = SIZES[options.size]
+    data_dir = os.path.join(DATA_DIR, options.size)
+    os.makedirs(data_dir, exist_ok=True)
+    path = os.path.join(data_dir, "facebook_leads.csv")
+    if not os.path.exists(path):
+        print("🧪 Generating input...")
+        generate_data.generate_facebook_csv(path, rows)
+
+    cases = {
+        "pandas (all columns)": lambda: pd.read_csv(path, encoding="utf-16", sep="\t"),
+        "read_delimited (all columns)": lambda: read_delimited(path, sep="\t"),
+        "read_delimited (3 columns)": lambda: read_delimited(path, sep="\t", usecols=COLUMNS),
+    }
+    baseline = None
+    for name, func in cases.items():
+        seconds, df = best_of(options.repeat, func)
+        baseline = baseline or seconds
+        print(f"   {name:<30} {seconds:7.2f}s  {len(df) / seconds:>12,.0f} rows/s  "
+              f"({baseline / seconds:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Synthetic input generators for the benchmark suite.
+
+Each generator writes a file with the same layout the scripts in scripts/
+expect (column positions, encodings, preamble lines), streaming rows to
+disk so even the 10M-row presets never have to fit in memory.
+"""
+import csv
+import os
+import random
+import zipfile
+
+from openpyxl import Workbook
+
+# Excel sheets stop at 1,048,576 rows (header included)
+XLSX_MAX_ROWS = 1_048_575
+
+FIRST_NAMES = ["ΓΙΩΡΓΟΣ", "ΜΑΡΙΑ", "ΝΙΚΟΣ", "ΕΛΕΝΗ", "ΔΗΜΗΤΡΗΣ", "ΚΑΤΕΡΙΝΑ",
+               "ΚΩΣΤΑΣ", "ΑΝΝΑ", "ΓΙΑΝΝΗΣ", "ΣΟΦΙΑ", "ΠΑΝΑΓΙΩΤΗΣ", "ΔΕΣΠΟΙΝΑ"]
+LAST_NAMES = ["ΠΑΠΑΔΟΠΟΥΛΟΣ", "ΓΕΩΡΓΙΟΥ", "ΝΙΚΟΛΑΟΥ", "ΙΩΑΝΝΙΔΗΣ", "ΚΩΝΣΤΑΝΤΙΝΟΥ",
+              "ΠΑΠΑΔΑΚΗΣ", "ΟΙΚΟΝΟΜΟΥ", "ΜΑΚΡΗΣ", "ΔΗΜΗΤΡΙΟΥ", "ΑΛΕΞΙΟΥ"]
+FORM_NAMES = ["Fiber_Promo", "Mobile_Unlimited", "TV_Bundle", "Business_Pack"]
+
+
+def capped_rows(rows, file_kind="xlsx"):
+    if file_kind == "xlsx" and rows > XLSX_MAX_ROWS:
+        print(f"⚠️ {rows} rows do not fit in one xlsx sheet, capping at {XLSX_MAX_ROWS}")
+        return XLSX_MAX_ROWS
+    return rows
+
+
+def random_name(rng):
+    return rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+
+
+def random_mobile(rng):
+    return "69" + "".join(rng.choice("0123456789") for _ in range(8))
+
+
+def application_number(index):
+    """Application numbers in the mixed formats seen in real ALL exports"""
+    base = 1_000_000_000 + index
+    style = index % 4
+    if style == 0:
+        return f"1-{base}"
+    if style == 1:
+        return str(base)
+    if style == 2:
+        return f"VOD{base}"
+    return f"LB_VODAFONE_{base}"
+
+
+def write_xlsx(path, header, rows_iter):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(header)
+    for row in rows_iter:
+        ws.append(row)
+    wb.save(path)
+
+
+def generate_all_export(path, rows, seed=1):
+    """ALL export: AIOS.py reads columns 11, 12, 14 and 17"""
+    rng = random.Random(seed)
+    rows = capped_rows(rows)
+    header = [f"COL_{i}" for i in range(20)]
+    header[11], header[12], header[14], header[17] = "ΕΠΩΝΥΜΟ", "ΟΝΟΜΑ", "ΑΡ. ΑΙΤΗΣΗΣ", "ΚΙΝΗΤΟ"
+
+    def make_rows():
+        for i in range(rows):
+            first, last = random_name(rng)
+            row = [None] * 20
+            row[0] = i
+            row[11], row[12] = last, first
+            row[14] = application_number(i)
+            row[17] = f"+30 {random_mobile(rng)}"
+            yield row
+
+    write_xlsx(path, header, make_rows())
+    return rows
+
+
+def generate_aios_files(folder, all_rows, activated_ratio=0.6, seed=2):
+    """AIOS_DP / AIOS_MOB / AIOS_ONE_NET with a share of the ALL applications"""
+    rng = random.Random(seed)
+    all_rows = capped_rows(all_rows)
+    activated = [i for i in range(all_rows) if rng.random() < activated_ratio]
+    thirds = [activated[0::3], activated[1::3], activated[2::3]]
+
+    def dp_rows():
+        for i in thirds[0]:
+            first, last = random_name(rng)
+            row = [None] * 12
+            row[0], row[10], row[11] = f"1-{1_000_000_000 + i}", first, last
+            yield row
+
+    def name_rows(indices, width, name_col):
+        for i in indices:
+            first, last = random_name(rng)
+            row = [None] * width
+            row[1], row[name_col] = str(1_000_000_000 + i), f"{first} {last}"
+            yield row
+
+    paths = {
+        "AIOS_DP": os.path.join(folder, "AIOS_DP.xlsx"),
+        "AIOS_MOB": os.path.join(folder, "AIOS_MOB.xlsx"),
+        "AIOS_ONE_NET": os.path.join(folder, "AIOS_ONE_NET.xlsx"),
+    }
+    write_xlsx(paths["AIOS_DP"], [f"COL_{i}" for i in range(12)], dp_rows())
+    write_xlsx(paths["AIOS_MOB"], [f"COL_{i}" for i in range(6)], name_rows(thirds[1], 6, 5))
+    write_xlsx(paths["AIOS_ONE_NET"], [f"COL_{i}" for i in range(7)], name_rows(thirds[2], 7, 6))
+    return paths
+
+
+def generate_facebook_csv(path, rows, seed=3):
+    """Facebook lead export: UTF-16, tab separated"""
+    rng = random.Random(seed)
+    header = ["id", "created_time", "ad_id", "ad_name", "adset_id", "adset_name",
+              "campaign_id", "campaign_name", "form_id", "form_name", "is_organic",
+              "platform", "full name", "phone"]
+    with open(path, "w", encoding="utf-16", newline="") as f:
+        writer = csv.writer(f, delimiter="\t")
+        writer.writerow(header)
+        for i in range(rows):
+            first, last = random_name(rng)
+            form = rng.choice(FORM_NAMES)
+            writer.writerow([
+                f"l:{i}", "2025-01-01T10:00:00+0200", i, form, i % 50, f"{form}_adset",
+                i % 10, f"{form}_campaign", i % 5, form, "false", "fb",
+                f"{first} {last}", f"p:+30{random_mobile(rng)}",
+            ])
+    return rows
+
+
+def generate_tiktok_xlsx(path, rows, seed=4):
+    """TikTok lead_generation_*.xlsx export"""
+    rng = random.Random(seed)
+    rows = capped_rows(rows)
+
+    def make_rows():
+        for _ in range(rows):
+            first, last = random_name(rng)
+            form = rng.choice(FORM_NAMES)
+            yield [f"{first} {last}", f"+30{random_mobile(rng)}", form, f"{form}_form"]
+
+    write_xlsx(path, ["Name", "Phone number", "ad_name", "form_name"], make_rows())
+    return rows
+
+
+def generate_dialer_csv(path, agents, seed=5):
+    """Dialer agent report: a few preamble lines before the real header"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("Agent Time Detail\n")
+        f.write("Time range: 2025-01-01 00:00:00 to 2025-01-31 23:59:59\n")
+        f.write("\n")
+        writer = csv.writer(f)
+        writer.writerow(["Χρήστης ", "ID", "CALLS", "TIME", "PAUSE", "PAUSETIME %",
+                         "WAIT", "TALK", "TALK TIME %", "DISPO", "DEAD", "DEAD TIME %"])
+        for i in range(agents):
+            talk = rng.uniform(20, 70)
+            pause = rng.uniform(5, 30)
+            dead = max(0.0, 100 - talk - pause - rng.uniform(0, 20))
+            writer.writerow([
+                f"agent_{i:05d}", i, rng.randint(50, 900), "160:00:00", "20:00:00",
+                f"{pause:.1f}%", "10:00:00", "90:00:00", f"{talk:.1f}%",
+                "05:00:00", "03:00:00", f"{dead:.1f}%",
+            ])
+    return agents
+
+
+def generate_media_zip(path, members, member_size=16 * 1024, seed=6):
+    """ZIP shaped like the MediaTrack drops copy.py sorts into its tree"""
+    rng = random.Random(seed)
+    fixed = ["index_updated.html", "style_updated.css", "app_updated.js", "server.js",
+             "package.json", "database.js", "externalApis.js", "Dockerfile",
+             "docker-compose.yml", ".env.example", ".github/workflows/deploy.yml"]
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for i in range(members):
+            name = fixed[i] if i < len(fixed) else f"routes/route_{i}.js"
+            payload = bytes(rng.getrandbits(8) for _ in range(256)) * (member_size // 256)
+            zf.writestr(name, payload)
+    return members
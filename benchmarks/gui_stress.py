@@ -0,0 +1,151 @@
+"""
+Headless stress test for the GUI runner.
+
+Starts many ScriptTab runs at once (Qt offscreen platform) on a fake
+script that floods stdout, and records how late the event loop got
+(EventLoopMonitor), how many output lines per second reached the tabs,
+and how much the GUI process grew.
+
+    python benchmarks/gui_stress.py --tabs 20 --lines 20000
+    python benchmarks/gui_stress.py --tabs 50 --max-p95-lag-ms 100
+
+Exits with code 1 if a run failed or a --max-* limit was exceeded, so it
+can guard against regressions.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+
+from PyQt6.QtCore import QTimer  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+import gui_runner  # noqa: E402
+from script_helpers import process_rss_mb  # noqa: E402
+
+FAKE_SCRIPT = '''\
+import os, sys, time
+lines = int(os.environ.get("STRESS_LINES", "10000"))
+burst = int(os.environ.get("STRESS_BURST", "500"))
+for i in range(lines):
+    print(f"line {i:07d} " + "x" * 80)
+    if i % burst == burst - 1:
+        sys.stdout.flush()
+        time.sleep(0.001)
+print("done")
+'''
+
+
+def make_fake_script(work_dir):
+    folder = os.path.join(work_dir, "stress_script")
+    os.makedirs(folder)
+    with open(os.path.join(folder, "stress.py"), "w", encoding="utf-8") as f:
+        f.write(FAKE_SCRIPT)
+    return folder
+
+
+def run_stress(tabs, lines, work_dir, threshold_ms):
+    app = QApplication.instance() or QApplication(sys.argv)
+    folder = make_fake_script(work_dir)
+    os.environ["STRESS_LINES"] = str(lines)
+
+    script_tabs = []
+    for i in range(tabs):
+        tab = gui_runner.ScriptTab(folder)
+        tab.output_dir = os.path.join(work_dir, f"out_{i}")
+        os.makedirs(tab.output_dir)
+        script_tabs.append(tab)
+
+    received = [0]
+    results = []
+    monitor = gui_runner.EventLoopMonitor(threshold_ms=threshold_ms)
+    rss_before = process_rss_mb()
+
+    def count_line(_line):
+        received[0] += 1
+
+    def tab_finished(success, message):
+        results.append((success, message))
+        if len(results) == tabs:
+            QTimer.singleShot(0, app.quit)
+
+    def start_all():
+        for tab in script_tabs:
+            tab.start_run([], interactive=False)
+            tab.runner_thread.output_signal.connect(count_line)
+            tab.runner_thread.finished_signal.connect(tab_finished)
+
+    monitor.start()
+    start = time.perf_counter()
+    QTimer.singleShot(0, start_all)
+    app.exec()
+    elapsed = time.perf_counter() - start
+    monitor.stop()
+    rss_after = process_rss_mb()
+
+    failed = [message for success, message in results if not success]
+    report = {
+        "tabs": tabs,
+        "lines_per_tab": lines,
+        "runner": type(script_tabs[0].runner_thread).__name__,
+        "seconds": round(elapsed, 3),
+        "lines_received": received[0],
+        "lines_per_sec": round(received[0] / elapsed, 1) if elapsed else None,
+        "rss_before_mb": round(rss_before, 1) if rss_before is not None else None,
+        "rss_after_mb": round(rss_after, 1) if rss_after is not None else None,
+        "rss_growth_mb": round(rss_after - rss_before, 1) if None not in (rss_before, rss_after) else None,
+        "failed_runs": failed,
+    }
+    report.update(monitor.stats())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress the GUI runner with many concurrent noisy scripts")
+    parser.add_argument("--tabs", type=int, default=20, help="concurrent runs (one ScriptTab each)")
+    parser.add_argument("--lines", type=int, default=10000, help="output lines per run")
+    parser.add_argument("--stall-ms", type=int, default=200, help="event loop lag logged as a stall")
+    parser.add_argument("--max-p95-lag-ms", type=float, help="fail if the 95th percentile lag is higher")
+    parser.add_argument("--max-rss-growth-mb", type=float, help="fail if the GUI process grows more")
+    options = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="gui_stress_") as work_dir:
+        print(f"🧪 {options.tabs} concurrent runs x {options.lines} lines...")
+        report = run_stress(options.tabs, options.lines, work_dir, options.stall_ms)
+
+    report["timestamp"] = datetime.now().isoformat(timespec="seconds")
+    for key, value in report.items():
+        print(f"   {key:<16} {value}")
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    report_path = os.path.join(RESULTS_DIR, f"gui_stress_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Results saved to: {report_path}")
+
+    problems = []
+    if report["failed_runs"]:
+        problems.append(f"{len(report['failed_runs'])} run(s) failed")
+    if options.max_p95_lag_ms is not None and report.get("p95_lag_ms", 0) > options.max_p95_lag_ms:
+        problems.append(f"p95 lag {report['p95_lag_ms']} ms > {options.max_p95_lag_ms} ms")
+    if (options.max_rss_growth_mb is not None and report["rss_growth_mb"] is not None
+            and report["rss_growth_mb"] > options.max_rss_growth_mb):
+        problems.append(f"RSS grew {report['rss_growth_mb']} MB > {options.max_rss_growth_mb} MB")
+    if problems:
+        print("❌ " + "; ".join(problems))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+End-to-end benchmark runner for the scripts in scripts/.
+
+Generates synthetic inputs (cached under benchmarks/data/<size>/), runs
+every script the same way the GUI does (OUTPUT_DIR env var, input paths
+as arguments) and records wall time, peak memory and rows/sec.
+
+    python benchmarks/run_benchmarks.py --size 10k
+    python benchmarks/run_benchmarks.py --size 1m --save-baseline
+    python benchmarks/run_benchmarks.py --size 1m --scripts AIOS leads
+
+Results are compared against benchmarks/baseline.json (per size); a case
+that is slower or heavier than the baseline by more than --tolerance is
+reported as a regression and makes the run exit with code 1.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import generate_data
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.join(os.path.dirname(BENCH_DIR), "scripts")
+DATA_DIR = os.path.join(BENCH_DIR, "data")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+
+# Timing differences below this are noise (interpreter start-up, disk cache)
+MIN_SECONDS_DELTA = 0.5
+
+# Dialer reports have one row per agent, real call centres stay in the hundreds
+MAX_DIALER_AGENTS = 500
+
+
+# ---------- Input preparation ----------
+def prepare_aios(data_dir, rows):
+    all_path = os.path.join(data_dir, "ALL_export.xlsx")
+    aios_paths = [os.path.join(data_dir, f"{kind}.xlsx") for kind in ("AIOS_DP", "AIOS_MOB", "AIOS_ONE_NET")]
+    if not os.path.exists(all_path):
+        generate_data.generate_all_export(all_path, rows)
+    if not all(os.path.exists(p) for p in aios_paths):
+        generate_data.generate_aios_files(data_dir, rows)
+    return [all_path] + aios_paths, generate_data.capped_rows(rows)
+
+
+def prepare_leads(data_dir, rows):
+    facebook_path = os.path.join(data_dir, "Απλοποιημένη φόρμα_Leads_bench.csv")
+    tiktok_path = os.path.join(data_dir, "lead_generation_bench.xlsx")
+    half = rows // 2
+    if not os.path.exists(facebook_path):
+        generate_data.generate_facebook_csv(facebook_path, half)
+    if not os.path.exists(tiktok_path):
+        generate_data.generate_tiktok_xlsx(tiktok_path, half)
+    return [facebook_path, tiktok_path], half + generate_data.capped_rows(half)
+
+
+def prepare_facebook_list(data_dir, rows):
+    path = os.path.join(data_dir, "facebook_leads.csv")
+    if not os.path.exists(path):
+        generate_data.generate_facebook_csv(path, rows)
+    return [path], rows
+
+
+def prepare_agent_monthly(data_dir, rows):
+    agents = min(rows, MAX_DIALER_AGENTS)
+    path = os.path.join(data_dir, "agent.csv")
+    if not os.path.exists(path):
+        generate_data.generate_dialer_csv(path, agents)
+    return [path], agents
+
+
+def prepare_copy(data_dir, rows):
+    members = max(20, rows // 100)
+    path = os.path.join(data_dir, "mediatrack.zip")
+    if not os.path.exists(path):
+        generate_data.generate_media_zip(path, members)
+    return [path], members
+
+
+CASES = {
+    "AIOS": ("AIOS/AIOS.py", prepare_aios),
+    "leads": ("leads/leads.py", prepare_leads),
+    "facebook_list": ("facebook_list/list_script.py", prepare_facebook_list),
+    "agent_monthly": ("agent_monthly/monthly_report_script.py", prepare_agent_monthly),
+    "copy": ("copy/copy.py", prepare_copy),
+}
+
+
+# ---------- Measurement ----------
+def run_and_measure(args, cwd, env, log_file):
+    """Run a script to completion; return (return_code, seconds, peak_mb or None)"""
+    start = time.perf_counter()
+    process = subprocess.Popen(args, cwd=cwd, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+
+    if hasattr(os, "wait4"):
+        # rusage of this one child: ru_maxrss is KB on Linux, bytes on macOS
+        _, status, usage = os.wait4(process.pid, 0)
+        elapsed = time.perf_counter() - start
+        process.returncode = os.waitstatus_to_exitcode(status)
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return process.returncode, elapsed, usage.ru_maxrss / scale
+
+    peak = None
+    try:
+        import psutil
+        handle = psutil.Process(process.pid)
+        peak = 0
+        while process.poll() is None:
+            try:
+                peak = max(peak, handle.memory_info().rss)
+            except psutil.Error:
+                break
+            time.sleep(0.05)
+        peak /= 1024 * 1024
+    except ImportError:
+        pass
+    return_code = process.wait()
+    return return_code, time.perf_counter() - start, peak
+
+
+def run_case(name, size_name, rows):
+    script_rel, prepare = CASES[name]
+    data_dir = os.path.join(DATA_DIR, size_name)
+    os.makedirs(data_dir, exist_ok=True)
+
+    print(f"🧪 {name}: preparing inputs...")
+    inputs, rows_processed = prepare(data_dir, rows)
+
+    with tempfile.TemporaryDirectory(prefix=f"bench_{name}_") as work_dir:
+        output_dir = os.path.join(work_dir, "output")
+        os.makedirs(output_dir)
+        env = os.environ.copy()
+        env["OUTPUT_DIR"] = output_dir
+        env["PYTHONIOENCODING"] = "utf-8"
+        env["MPLBACKEND"] = "Agg"
+        args = [sys.executable, os.path.join(SCRIPTS_DIR, script_rel)] + inputs
+
+        log_path = os.path.join(work_dir, "script_output.txt")
+        with open(log_path, "w", encoding="utf-8") as log_file:
+            return_code, seconds, peak_mb = run_and_measure(args, work_dir, env, log_file)
+
+        if return_code != 0:
+            with open(log_path, encoding="utf-8", errors="replace") as f:
+                print(f.read()[-2000:])
+
+    result = {
+        "return_code": return_code,
+        "rows": rows_processed,
+        "seconds": round(seconds, 3),
+        "peak_mb": round(peak_mb, 1) if peak_mb is not None else None,
+        "rows_per_sec": round(rows_processed / seconds, 1) if seconds else None,
+    }
+    print(f"   {'✅' if return_code == 0 else '❌'} {seconds:.2f}s, "
+          f"peak {result['peak_mb']} MB, {result['rows_per_sec']} rows/s")
+    return result
+
+
+# ---------- Baseline comparison ----------
+def compare_with_baseline(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or result["return_code"] != 0:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            regressed = ratio > 1 + tolerance
+            if metric == "seconds" and new - old < MIN_SECONDS_DELTA:
+                regressed = False
+            marker = "⚠️ REGRESSION" if regressed else "ok"
+            print(f"   {name:<15} {metric:<8} {old:>10} → {new:<10} ({ratio:.2f}x) {marker}")
+            if regressed:
+                regressions.append((name, metric, ratio))
+    return regressions
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_FILE):
+        return {}
+    with open(BASELINE_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scripts in scripts/ on synthetic data")
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--scripts", nargs="+", choices=CASES, default=list(CASES))
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown/memory growth vs the baseline (0.2 = 20%%)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as the new baseline for this size")
+    options = parser.parse_args()
+
+    rows = SIZES[options.size]
+    results = {name: run_case(name, options.size, rows) for name in options.scripts}
+
+    report = {
+        "size": options.size,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "results": results,
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    report_path = os.path.join(RESULTS_DIR, f"{options.size}_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n📄 Results saved to: {report_path}")
+
+    baseline = load_baseline()
+    regressions = []
+    if options.size in baseline:
+        print("\n📊 Compared with baseline:")
+        regressions = compare_with_baseline(results, baseline[options.size]["results"], options.tolerance)
+
+    if options.save_baseline:
+        baseline[options.size] = report
+        with open(BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        print(f"📌 Baseline for {options.size} updated: {BASELINE_FILE}")
+
+    failed = [name for name, result in results.items() if result["return_code"] != 0]
+    if failed:
+        print(f"❌ Failed scripts: {', '.join(failed)}")
+    if regressions or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,36 @@
+import time
+# Taken before the heavy imports below, for --startup-trace
+STARTUP_T0 = time.perf_counter()
+STARTUP_WALL_T0 = time.time()
 import sys
 import os
 import subprocess
+import codecs
+import signal
+import threading
 import json
-import configparser
-import markdown
 import shutil
-import time
+import glob
+import zipfile
+import fnmatch
+import csv
+import tempfile
+import atexit
+from array import array
 from datetime import datetime
 from functools import partial
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QTabWidget, QTextEdit, QSplitter,
     QFileDialog, QProgressBar, QMessageBox, QComboBox, QCheckBox,
-    QGroupBox, QLineEdit, QToolBar, QStatusBar, QDialog, QDialogButtonBox
+    QGroupBox, QLineEdit, QToolBar, QStatusBar, QDialog, QDialogButtonBox,
+    QListWidget, QListWidgetItem, QAbstractItemView, QTableView, QHeaderView
+)
+from PyQt6.QtGui import QIcon, QAction, QPalette, QColor, QFont, QPainter, QKeySequence
+from PyQt6.QtCore import (
+    Qt, QSettings, QThread, QObject, QTimer, QFileSystemWatcher, QProcess,
+    QProcessEnvironment, QAbstractListModel, QModelIndex, pyqtSignal
 )
-from PyQt6.QtGui import QIcon, QAction, QPalette, QColor, QFont
-from PyQt6.QtCore import Qt, QSettings, QThread, pyqtSignal
 
 # ---------- robust resource resolver ----------
 def resource_path(rel_path: str) -> str:
@@ -25,6 +40,126 @@ def resource_path(rel_path: str) -> str:
         base_dir = os.path.dirname(__file__)
     return os.path.join(base_dir, rel_path.replace("/", os.sep))
 
+# ---------- Startup Trace ----------
+class StartupTrace:
+    """Timing of each start-up phase, enabled with --startup-trace.
+
+    Lines go to stderr and, since the windowed EXE has no console, also to
+    a log file in the temp folder.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.last = STARTUP_T0
+        self.log_path = os.path.join(tempfile.gettempdir(), "BifteKYS_startup_trace.log")
+
+    def enable(self):
+        self.enabled = True
+        with open(self.log_path, "w", encoding="utf-8") as f:
+            f.write(f"Startup trace {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+        frozen = getattr(sys, 'frozen', False)
+        self.log(f"frozen={frozen} base_dir={os.path.dirname(resource_path('app_logo.png'))}"
+                 + (f" bundle={getattr(sys, '_MEIPASS', '-')}" if frozen else ""))
+        try:
+            import psutil
+            # Covers the EXE bootloader unpacking the bundle before Python runs
+            launch = STARTUP_WALL_T0 - psutil.Process().create_time()
+            self.log(f"process launch → interpreter ready: {launch * 1000:.0f} ms")
+        except Exception:
+            pass  # psutil is optional
+
+    def log(self, text):
+        print(f"⏱️ [startup] {text}", file=sys.stderr)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    def mark(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.log(f"{phase:<32} +{(now - self.last) * 1000:7.1f} ms  (total {(now - STARTUP_T0) * 1000:7.1f} ms)")
+        self.last = now
+
+startup_trace = StartupTrace()
+
+# ---------- UI Responsiveness ----------
+class EventLoopMonitor(QObject):
+    """Measure how late the GUI event loop dispatches a periodic timer.
+
+    A watchdog thread notices when the main thread stops ticking for more
+    than threshold_ms and logs a stack sample of what it is doing, so a
+    "frozen window" report comes with the code that froze it.
+    """
+    def __init__(self, interval_ms=50, threshold_ms=200, log_path=None, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.log_path = log_path or os.path.join(tempfile.gettempdir(), "BifteKYS_ui_stalls.log")
+        self.lags_ms = []
+        self.stalls = 0
+        self.main_thread_id = threading.get_ident()
+        self.last_tick = time.perf_counter()
+        self.watchdog = None
+        self.running = False
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self):
+        self.lags_ms = []
+        self.stalls = 0
+        self.running = True
+        self.last_tick = time.perf_counter()
+        self.timer.start(self.interval_ms)
+        self.watchdog = threading.Thread(target=self.watch, daemon=True)
+        self.watchdog.start()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def tick(self):
+        now = time.perf_counter()
+        lag = max(0.0, (now - self.last_tick) * 1000 - self.interval_ms)
+        self.lags_ms.append(lag)
+        self.last_tick = now
+        if lag > self.threshold_ms:
+            self.stalls += 1
+            self.log(f"UI stall: event loop {lag:.0f} ms late")
+
+    def watch(self):
+        sampled_tick = None
+        while self.running:
+            time.sleep(self.threshold_ms / 2000)
+            blocked_ms = (time.perf_counter() - self.last_tick) * 1000 - self.interval_ms
+            # One stack sample per stall, taken while it is still happening
+            if blocked_ms > self.threshold_ms and sampled_tick != self.last_tick:
+                sampled_tick = self.last_tick
+                frame = sys._current_frames().get(self.main_thread_id)
+                if frame is not None:
+                    import traceback
+                    stack = "".join(traceback.format_stack(frame, limit=12))
+                    self.log(f"UI blocked for {blocked_ms:.0f} ms so far, main thread is in:\n{stack}")
+
+    def log(self, text):
+        print(f"🐢 {text}", file=sys.stderr)
+        try:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(f"{datetime.now():%H:%M:%S} {text}\n")
+        except OSError:
+            pass
+
+    def stats(self):
+        lags = sorted(self.lags_ms)
+        if not lags:
+            return {"samples": 0}
+        return {
+            "samples": len(lags),
+            "mean_lag_ms": round(sum(lags) / len(lags), 1),
+            "p95_lag_ms": round(lags[min(len(lags) - 1, int(len(lags) * 0.95))], 1),
+            "max_lag_ms": round(lags[-1], 1),
+            "stalls": self.stalls,
+        }
+
 # ---------- Theme Manager ----------
 class ThemeManager:
     @staticmethod
@@ -67,7 +202,7 @@ class ThemeManager:
             QTabBar::tab:selected {
                 background: #2a82da;
             }
-            QTextEdit, QListView, QTreeView {
+            QTextEdit, QListView, QTreeView, QTableView {
                 background-color: #252525;
                 color: #ffffff;
                 border: 1px solid #444;
@@ -169,7 +304,7 @@ class ThemeManager:
                 background: #2a82da;
                 color: white;
             }
-            QTextEdit, QListView, QTreeView {
+            QTextEdit, QListView, QTreeView, QTableView {
                 background-color: white;
                 border: 1px solid #ccc;
             }
@@ -247,21 +382,210 @@ class ThemeManager:
             }
             """)
 
+# ---------- Script Arguments ----------
+# Past these limits the input paths are handed over in a manifest file instead
+# of argv (Windows caps the whole command line at 32767 characters)
+MANIFEST_MIN_FILES = 100
+MANIFEST_MIN_CHARS = 8000
+
+def build_script_args(script_file, input_files, profile_path=None):
+    """Return (args, manifest_path); manifest_path is None when argv is used."""
+    args = [sys.executable]
+    if profile_path:
+        # cProfile still dumps the stats when the script calls sys.exit()
+        args += ["-m", "cProfile", "-o", profile_path]
+    args.append(script_file)
+    command_length = sum(len(f) + 3 for f in input_files)
+    if len(input_files) < MANIFEST_MIN_FILES and command_length < MANIFEST_MIN_CHARS:
+        return args + list(input_files), None
+
+    # Scripts expand "@manifest" through script_helpers.resolve_input_files
+    fd, manifest_path = tempfile.mkstemp(prefix="inputs_", suffix=".json")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(list(input_files), f, ensure_ascii=False)
+    return args + ["@" + manifest_path], manifest_path
+
+# ---------- Output Staging ----------
+# Each run writes into its own folder under <output>/.staging; the finished
+# outputs are then moved next to the older ones without overwriting them
+STAGING_FOLDER = ".staging"
+
+def create_staging_dir(output_dir, script_name):
+    """Private OUTPUT_DIR for one run, on the same drive so publishing is a rename"""
+    staging_root = os.path.join(output_dir, STAGING_FOLDER)
+    os.makedirs(staging_root, exist_ok=True)
+    return tempfile.mkdtemp(prefix=f"{script_name}_{datetime.now():%Y%m%d_%H%M%S}_", dir=staging_root)
+
+def collision_free_names(name):
+    """name, then "name (2).ext", "name (3).ext", ..."""
+    yield name
+    stem, ext = os.path.splitext(name)
+    number = 2
+    while True:
+        yield f"{stem} ({number}){ext}"
+        number += 1
+
+def move_no_clobber(source, target):
+    """Atomically move source to target unless target exists; False if it does"""
+    if os.name == "nt":
+        try:
+            os.rename(source, target)  # refuses to replace on Windows
+        except FileExistsError:
+            return False
+        return True
+    if not os.path.isdir(source):
+        try:
+            os.link(source, target)  # fails if target exists, no window for a race
+        except FileExistsError:
+            return False
+        except OSError:
+            pass  # filesystems without hard links (FAT, some network shares)
+        else:
+            os.remove(source)
+            return True
+    return claim_and_rename(source, target)
+
+def claim_and_rename(source, target):
+    """POSIX rename() replaces an empty folder or any file, so first claim the
+    name with an exclusive create; the rename then only replaces our own claim."""
+    is_dir = os.path.isdir(source)
+    try:
+        if is_dir:
+            os.mkdir(target)
+        else:
+            os.close(os.open(target, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    except FileExistsError:
+        return False
+    try:
+        os.rename(source, target)
+    except OSError:
+        # Someone wrote into the claimed folder meanwhile: leave it, try another name
+        try:
+            os.rmdir(target) if is_dir else os.remove(target)
+        except OSError:
+            pass
+        return False
+    return True
+
+def publish_outputs(staging_dir, output_dir):
+    """Move everything in staging_dir into output_dir; returns [(name, published_name)]"""
+    published = []
+    for name in sorted(os.listdir(staging_dir)):
+        source = os.path.join(staging_dir, name)
+        for candidate in collision_free_names(name):
+            if move_no_clobber(source, os.path.join(output_dir, candidate)):
+                published.append((name, candidate))
+                break
+    discard_staging_dir(staging_dir)
+    return published
+
+def discard_staging_dir(staging_dir):
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    try:
+        os.rmdir(os.path.dirname(staging_dir))  # only if no other run is staging
+    except OSError:
+        pass
+
+def publish_messages(published):
+    for name, published_name in published:
+        if name == published_name:
+            yield f"📦 Saved {name}"
+        else:
+            yield f"📦 {name} already exists, saved as {published_name}"
+
+# ---------- Profiling ----------
+PROFILE_TOP_N = 30
+
+def format_profile_report(profile_path, top_n=PROFILE_TOP_N):
+    """Top-N functions of a cProfile dump, sorted by cumulative time."""
+    import io
+    import pstats
+    stream = io.StringIO()
+    stats = pstats.Stats(profile_path, stream=stream)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(top_n)
+    return stream.getvalue()
+
+# ---------- Process Control ----------
+# Seconds a stopped script gets to exit on its own before the tree is killed
+STOP_GRACE_SECONDS = 5
+
+def apply_posix_limits(cpu_seconds, memory_mb):
+    """Runs in the child before exec; the limits are inherited by its workers."""
+    import resource
+    if cpu_seconds:
+        # SIGXCPU at the soft limit, SIGKILL shortly after
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+    if memory_mb:
+        memory_bytes = memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+def process_group_kwargs(limits=None):
+    """Popen kwargs that start the script in its own process group/session."""
+    limits = limits or {}
+    if sys.platform.startswith("win"):
+        # CPU/memory limits would need a job object; only the wall clock applies here
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+
+    kwargs = {"start_new_session": True}
+    cpu_seconds = limits.get("cpu_time_limit", 0)
+    memory_mb = limits.get("memory_limit_mb", 0)
+    if cpu_seconds or memory_mb:
+        kwargs["preexec_fn"] = partial(apply_posix_limits, cpu_seconds, memory_mb)
+    return kwargs
+
+def terminate_process_tree(process, timeout=STOP_GRACE_SECONDS):
+    """Ask the whole process group to exit, then kill whatever is left."""
+    if process.poll() is None:
+        try:
+            if sys.platform.startswith("win"):
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass
+        try:
+            process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            pass
+
+    # Grandchildren may outlive the script itself, so always sweep the group
+    if sys.platform.startswith("win"):
+        subprocess.call(["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+def exit_result(return_code, timed_out=False, wall_clock_limit=0):
+    """(success, message) for a finished script, as shown in the tabs"""
+    if timed_out:
+        return False, f"Script stopped: wall clock limit of {wall_clock_limit}s exceeded"
+    if return_code == 0:
+        return True, "Script completed successfully"
+    if hasattr(signal, "SIGXCPU") and return_code == -signal.SIGXCPU:
+        return False, "Script stopped: CPU time limit exceeded"
+    return False, f"Script failed with return code {return_code}"
+
 # ---------- Script Runner Thread ----------
 class ScriptRunnerThread(QThread):
     output_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
     finished_signal = pyqtSignal(bool, str)
     
-    def __init__(self, args, cwd, env):
+    def __init__(self, args, cwd, env, limits=None):
         super().__init__()
         self.args = args
         self.cwd = cwd
         self.env = env
+        self.limits = limits or {}
         self.process = None
         self.is_running = True
+        self.timed_out = False
         
     def run(self):
+        wall_clock_timer = None
         try:
             self.process = subprocess.Popen(
                 self.args, 
@@ -269,10 +593,18 @@ class ScriptRunnerThread(QThread):
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 text=True,
+                errors="replace",
                 env=self.env,
                 bufsize=1,
-                universal_newlines=True
+                universal_newlines=True,
+                **process_group_kwargs(self.limits)
             )
+
+            wall_clock_limit = self.limits.get("wall_clock_limit", 0)
+            if wall_clock_limit:
+                wall_clock_timer = threading.Timer(wall_clock_limit, self.wall_clock_expired)
+                wall_clock_timer.daemon = True
+                wall_clock_timer.start()
             
             # Read output in real-time
             for line in iter(self.process.stdout.readline, ''):
@@ -283,30 +615,1102 @@ class ScriptRunnerThread(QThread):
             self.process.stdout.close()
             return_code = self.process.wait()
             
-            if return_code == 0:
-                self.finished_signal.emit(True, "Script completed successfully")
-            else:
-                self.finished_signal.emit(False, f"Script failed with return code {return_code}")
+            self.finished_signal.emit(*exit_result(return_code, self.timed_out, wall_clock_limit))
                 
         except Exception as e:
             self.finished_signal.emit(False, f"Error running script: {str(e)}")
+        finally:
+            if wall_clock_timer:
+                wall_clock_timer.cancel()
+
+    def wall_clock_expired(self):
+        self.timed_out = True
+        if self.process:
+            terminate_process_tree(self.process)
     
     def stop(self):
         self.is_running = False
         if self.process:
+            # Graceful-then-forced shutdown waits, keep it off the GUI thread
+            threading.Thread(target=terminate_process_tree, args=(self.process,), daemon=True).start()
+
+# ---------- Event-driven Runner ----------
+class WindowsJob:
+    """Job object holding a script and every process it starts.
+
+    taskkill /T walks the tree from a live parent, so it cannot reach
+    grandchildren once the script itself has exited; terminating the job can.
+    """
+    PROCESS_SET_QUOTA = 0x0100
+    PROCESS_TERMINATE = 0x0001
+
+    def __init__(self, pid):
+        import ctypes
+        from ctypes import wintypes
+        self.ctypes = ctypes
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+        kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+        kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+        kernel32.OpenProcess.restype = wintypes.HANDLE
+        kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+        kernel32.TerminateJobObject.argtypes = [wintypes.HANDLE, wintypes.UINT]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        self.kernel32 = kernel32
+
+        self.handle = kernel32.CreateJobObjectW(None, None)
+        if not self.handle:
+            raise ctypes.WinError(ctypes.get_last_error())
+        process = kernel32.OpenProcess(self.PROCESS_SET_QUOTA | self.PROCESS_TERMINATE, False, pid)
+        if not process:
+            error = ctypes.get_last_error()
+            self.close()
+            raise ctypes.WinError(error)
+        try:
+            if not kernel32.AssignProcessToJobObject(self.handle, process):
+                error = ctypes.get_last_error()
+                self.close()
+                raise ctypes.WinError(error)
+        finally:
+            kernel32.CloseHandle(process)
+
+    def terminate(self):
+        if self.handle:
+            self.kernel32.TerminateJobObject(self.handle, 1)
+
+    def close(self):
+        if self.handle:
+            self.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+# Partial lines (progress dots, prompts) are shown after this much silence
+PARTIAL_LINE_FLUSH_MS = 300
+
+class ScriptProcessRunner(QObject):
+    """Run a script with QProcess on the GUI event loop, no thread per run.
+
+    Output is read as raw bytes whenever it arrives and decoded with an
+    incremental UTF-8 decoder, so split multi-byte characters, partial
+    lines and stray binary output are all handled. Same signals and
+    start()/stop()/isRunning()/wait() as ScriptRunnerThread.
+    """
+    output_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(bool, str)
+
+    # Runners whose process is still alive, so a stopped run is not garbage collected
+    live_runners = set()
+
+    def __init__(self, args, cwd, env, limits=None):
+        super().__init__()
+        self.args = args
+        self.cwd = cwd
+        self.env = dict(env)
+        # The decoder below expects UTF-8 whatever the console code page is
+        self.env.setdefault("PYTHONIOENCODING", "utf-8")
+        self.limits = limits or {}
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.pending = ""
+        self.timed_out = False
+        self.stopping = False
+        self.pid = None
+        self.job = None
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.ProcessChannelMode.MergedChannels)
+        self.process.readyReadStandardOutput.connect(self.read_output)
+        self.process.started.connect(self.process_started)
+        self.process.finished.connect(self.process_finished)
+        self.process.errorOccurred.connect(self.process_error)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush_partial_line)
+        self.wall_clock_timer = QTimer(self)
+        self.wall_clock_timer.setSingleShot(True)
+        self.wall_clock_timer.timeout.connect(self.wall_clock_expired)
+        self.kill_timer = QTimer(self)
+        self.kill_timer.setSingleShot(True)
+        self.kill_timer.timeout.connect(self.kill_tree)
+
+    @staticmethod
+    def supported(limits=None):
+        """QProcess cannot set rlimits, and needs Qt 6.7+ (CreateNewSession) for its own session on POSIX"""
+        if sys.platform.startswith("win"):
+            return True
+        limits = limits or {}
+        if limits.get("cpu_time_limit") or limits.get("memory_limit_mb"):
+            return False
+        return (hasattr(QProcess, "setUnixProcessParameters")
+                and hasattr(QProcess, "UnixProcessFlag")
+                and hasattr(QProcess.UnixProcessFlag, "CreateNewSession"))
+
+    def start(self):
+        environment = QProcessEnvironment()
+        for key, value in self.env.items():
+            environment.insert(key, value)
+        self.process.setProcessEnvironment(environment)
+        self.process.setWorkingDirectory(self.cwd)
+        self.process.setProgram(self.args[0])
+        self.process.setArguments(self.args[1:])
+        if not sys.platform.startswith("win"):
+            # Own session, so stop() can signal the whole process group
+            self.process.setUnixProcessParameters(QProcess.UnixProcessFlag.CreateNewSession)
+        ScriptProcessRunner.live_runners.add(self)
+        self.process.start()
+
+    def process_started(self):
+        self.pid = self.process.processId()
+        if sys.platform.startswith("win"):
+            # Children started from here on join the job (the script is still importing)
+            try:
+                self.job = WindowsJob(self.pid)
+            except OSError:
+                self.job = None
+        wall_clock_limit = self.limits.get("wall_clock_limit", 0)
+        if wall_clock_limit:
+            self.wall_clock_timer.start(wall_clock_limit * 1000)
+
+    def isRunning(self):
+        return self.process.state() != QProcess.ProcessState.NotRunning
+
+    def wait(self, msecs=-1):
+        return self.process.waitForFinished(msecs) if self.isRunning() else True
+
+    def read_output(self):
+        data = bytes(self.process.readAllStandardOutput())
+        text = self.pending + self.decoder.decode(data)
+        lines = text.splitlines(keepends=True)
+        self.pending = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            self.output_signal.emit(line)
+        if self.pending:
+            self.flush_timer.start(PARTIAL_LINE_FLUSH_MS)
+
+    def flush_partial_line(self):
+        if self.pending:
+            self.output_signal.emit(self.pending)
+            self.pending = ""
+
+    def process_finished(self, exit_code, exit_status):
+        self.read_output()
+        self.pending += self.decoder.decode(b"", final=True)
+        self.flush_partial_line()
+        self.wall_clock_timer.stop()
+        self.kill_timer.stop()
+        # Grandchildren may outlive the script itself, so sweep what is left
+        self.sweep_tree()
+
+        crashed = exit_status == QProcess.ExitStatus.CrashExit
+        if self.timed_out:
+            self.finished_signal.emit(False, f"Script stopped: wall clock limit of {self.limits['wall_clock_limit']}s exceeded")
+        elif not crashed and exit_code == 0:
+            self.finished_signal.emit(True, "Script completed successfully")
+        elif crashed and hasattr(signal, "SIGXCPU") and exit_code == signal.SIGXCPU:
+            self.finished_signal.emit(False, "Script stopped: CPU time limit exceeded")
+        elif crashed:
+            self.finished_signal.emit(False, f"Script was terminated by signal {exit_code}")
+        else:
+            self.finished_signal.emit(False, f"Script failed with return code {exit_code}")
+
+    def process_error(self, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.release()
+            self.finished_signal.emit(False, f"Error running script: {self.process.errorString()}")
+
+    def wall_clock_expired(self):
+        self.timed_out = True
+        self.stop()
+
+    def stop(self):
+        """Ask the process group to exit, kill it after STOP_GRACE_SECONDS"""
+        if self.stopping or not self.isRunning():
+            return
+        self.stopping = True
+        if sys.platform.startswith("win"):
             self.process.terminate()
+        else:
+            try:
+                os.killpg(self.pid, signal.SIGTERM)
+            except (OSError, TypeError):
+                self.process.terminate()
+        self.kill_timer.start(STOP_GRACE_SECONDS * 1000)
+
+    def group_alive(self):
+        """POSIX: is anything left in the script's process group?"""
+        try:
+            os.killpg(self.pid, 0)
+            return True
+        except (OSError, TypeError):
+            return False
+
+    def sweep_tree(self):
+        """After the script exited: leftovers get SIGTERM and the grace period before
+        SIGKILL (POSIX), or end with the job (Windows, where nothing gentler exists)"""
+        if self.pid and not sys.platform.startswith("win") and self.group_alive():
+            try:
+                os.killpg(self.pid, signal.SIGTERM)
+            except OSError:
+                pass
+            self.kill_timer.start(STOP_GRACE_SECONDS * 1000)
+            return
+        self.kill_tree()
+
+    def kill_tree(self):
+        if self.pid:
+            if sys.platform.startswith("win"):
+                if self.job:
+                    self.job.terminate()
+                elif self.isRunning():
+                    subprocess.Popen(["taskkill", "/F", "/T", "/PID", str(self.pid)],
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            elif self.group_alive():
+                try:
+                    os.killpg(self.pid, signal.SIGKILL)
+                except OSError:
+                    pass
+        if not self.isRunning():
+            self.release()
+
+    def release(self):
+        if self.job:
+            self.job.close()
+            self.job = None
+        ScriptProcessRunner.live_runners.discard(self)
+
+def create_runner(args, cwd, env, limits=None, job=None):
+    """
+    The runner daemon when one is listening (job describes the run for it),
+    else the event-driven QProcess runner where it can honour the limits,
+    else the thread runner.
+    """
+    if job is not None:
+        conn = connect_daemon()
+        if conn is not None:
+            return DaemonRunner(conn, job)
+    if ScriptProcessRunner.supported(limits):
+        return ScriptProcessRunner(args, cwd, env, limits)
+    return ScriptRunnerThread(args, cwd, env, limits)
+
+def call_when_finished(runner, callback):
+    """Call callback once runner is completely done, without blocking the GUI on it"""
+    if runner is None or not runner.isRunning():
+        callback()
+        return
+    if isinstance(runner, QThread):
+        def thread_finished():
+            # finished is emitted in the thread's last moments, this returns at once
+            runner.wait()
+            callback()
+        runner.finished.connect(thread_finished, Qt.ConnectionType.SingleShotConnection)
+    else:
+        runner.finished_signal.connect(lambda _success, _message: callback(),
+                                       Qt.ConnectionType.SingleShotConnection)
+
+# ---------- Partitioned Execution ----------
+SPLITTABLE_FORMATS = ('.csv', '.txt')
+COPY_BLOCK_SIZE = 4 * 1024 * 1024
+
+def detect_text_layout(path):
+    """Return (bom, newline bytes, code unit size) of a row-oriented text file."""
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith(b'\xff\xfe'):
+        return b'\xff\xfe', b'\n\x00', 2
+    if head.startswith(b'\xfe\xff'):
+        return b'\xfe\xff', b'\x00\n', 2
+    if head.startswith(b'\xef\xbb\xbf'):
+        return b'\xef\xbb\xbf', b'\n', 1
+    return b'', b'\n', 1
+
+def find_line_end(f, start, newline, unit):
+    """Offset just past the first newline at or after start (aligned to the code unit)."""
+    start -= start % unit
+    f.seek(start)
+    offset = start
+    while True:
+        block = f.read(COPY_BLOCK_SIZE)
+        if not block:
+            return offset
+        pos = block.find(newline)
+        while pos != -1 and pos % unit:
+            pos = block.find(newline, pos + 1)
+        if pos != -1:
+            return offset + pos + len(newline)
+        # Keep alignment and do not cut a newline sequence across blocks
+        step = len(block) - (len(newline) - 1)
+        step -= step % unit
+        offset += max(step, unit)
+        f.seek(offset)
+
+def split_row_file(path, parts, work_dir):
+    """
+    Split a text file into up to `parts` byte ranges aligned on line
+    boundaries; every part keeps the BOM and header line and the original
+    file name (the scripts detect the source from it).
+    Quoted fields containing newlines are not supported.
+    """
+    bom, newline, unit = detect_text_layout(path)
+    size = os.path.getsize(path)
+    part_paths = []
+    with open(path, 'rb') as f:
+        header_end = find_line_end(f, len(bom), newline, unit)
+        f.seek(0)
+        header = f.read(header_end)
+
+        bounds = [header_end]
+        for i in range(1, parts):
+            target = header_end + (size - header_end) * i // parts
+            bounds.append(max(bounds[-1], find_line_end(f, target, newline, unit)))
+        bounds.append(size)
+
+        for i, (begin, end) in enumerate(zip(bounds, bounds[1:])):
+            if end <= begin:
+                continue
+            part_dir = os.path.join(work_dir, f"part_{i + 1}")
+            os.makedirs(os.path.join(part_dir, "output"), exist_ok=True)
+            part_path = os.path.join(part_dir, os.path.basename(path))
+            with open(part_path, 'wb') as out:
+                out.write(header)
+                f.seek(begin)
+                remaining = end - begin
+                while remaining:
+                    block = f.read(min(COPY_BLOCK_SIZE, remaining))
+                    out.write(block)
+                    remaining -= len(block)
+            part_paths.append(part_path)
+    return part_paths
+
+def merge_partition_outputs(output_dirs, destination):
+    """Concatenate same-named CSV/xlsx outputs of all parts; other files get a part suffix."""
+    from openpyxl import Workbook, load_workbook
+    merged = []
+    names = sorted({name for d in output_dirs for name in os.listdir(d)})
+    for name in names:
+        sources = [os.path.join(d, name) for d in output_dirs if os.path.isfile(os.path.join(d, name))]
+        target = os.path.join(destination, name)
+        ext = os.path.splitext(name)[1].lower()
+        if ext == '.csv':
+            with open(target, 'wb') as out:
+                for i, source in enumerate(sources):
+                    with open(source, 'rb') as f:
+                        if i:
+                            f.readline()  # header already written
+                        shutil.copyfileobj(f, out, COPY_BLOCK_SIZE)
+        elif ext == '.xlsx':
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet()
+            for i, source in enumerate(sources):
+                part_wb = load_workbook(source, read_only=True)
+                rows = part_wb.worksheets[0].iter_rows(values_only=True)
+                if i:
+                    next(rows, None)
+                for row in rows:
+                    ws.append(row)
+                part_wb.close()
+            wb.save(target)
+        else:
+            for i, source in enumerate(sources, 1):
+                stem, suffix = os.path.splitext(name)
+                shutil.copy2(source, os.path.join(destination, f"{stem}_part{i}{suffix}"))
+            continue
+        merged.append(name)
+    return merged
+
+def pick_partition_input(input_files, min_size_mb):
+    """The largest splittable input above the size threshold, or None."""
+    candidates = [
+        f for f in input_files
+        if f.lower().endswith(SPLITTABLE_FORMATS) and os.path.isfile(f)
+        and os.path.getsize(f) >= min_size_mb * 1024 * 1024
+    ]
+    return max(candidates, key=os.path.getsize) if candidates else None
+
+class PartitionedRunnerThread(QThread):
+    """Split one big input, run the script on every part at once, merge the outputs.
+
+    Exposes the same signals and stop() as ScriptRunnerThread.
+    """
+    output_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, script_file, input_files, split_file, partitions, cwd, env, limits, output_dir):
+        super().__init__()
+        self.script_file = script_file
+        self.input_files = input_files
+        self.split_file = split_file
+        self.partitions = partitions
+        self.cwd = cwd
+        self.env = env
+        self.limits = limits or {}
+        self.output_dir = output_dir
+        self.processes = []
+        self.is_running = True
+
+    def run(self):
+        work_dir = tempfile.mkdtemp(prefix="partitioned_")
+        try:
+            self.output_signal.emit(f"✂️ Splitting {os.path.basename(self.split_file)} into {self.partitions} parts...")
+            part_files = split_row_file(self.split_file, self.partitions, work_dir)
+            others = [f for f in self.input_files if f != self.split_file]
+
+            readers = []
+            output_dirs = []
+            for i, part_file in enumerate(part_files, 1):
+                if not self.is_running:
+                    break
+                part_output = os.path.join(os.path.dirname(part_file), "output")
+                output_dirs.append(part_output)
+                env = dict(self.env, OUTPUT_DIR=part_output)
+                # Decoded as UTF-8 whatever the console code page is, like the other runners
+                env.setdefault("PYTHONIOENCODING", "utf-8")
+                # The remaining (small) inputs only go to the first part
+                args, _ = build_script_args(self.script_file, [part_file] + (others if i == 1 else []))
+                process = subprocess.Popen(
+                    args, cwd=self.cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                    text=True, encoding="utf-8", errors="replace", bufsize=1,
+                    **process_group_kwargs(self.limits)
+                )
+                self.processes.append(process)
+                reader = threading.Thread(target=self.forward_output, args=(process, i), daemon=True)
+                reader.start()
+                readers.append(reader)
+
+            for reader in readers:
+                reader.join()
+            return_codes = [process.wait() for process in self.processes]
+            if not self.is_running:
+                self.finished_signal.emit(False, "Stopped by user")
+                return
+            failed = [i for i, code in enumerate(return_codes, 1) if code != 0]
+            if failed:
+                self.finished_signal.emit(False, f"Script failed on part(s) {', '.join(map(str, failed))}")
+                return
+
+            self.output_signal.emit("🔗 Merging part outputs...")
+            merged = merge_partition_outputs(output_dirs, self.output_dir)
+            for name in merged:
+                self.output_signal.emit(f"🔗 Merged {len(output_dirs)} parts into {name}")
+            self.finished_signal.emit(True, f"Script completed successfully ({len(part_files)} parallel parts)")
+        except Exception as e:
+            self.finished_signal.emit(False, f"Error running partitioned script: {str(e)}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def forward_output(self, process, part_number):
+        for line in iter(process.stdout.readline, ''):
+            self.output_signal.emit(f"[part {part_number}] {line}")
+        process.stdout.close()
+
+    def stop(self):
+        self.is_running = False
+        for process in self.processes:
+            threading.Thread(target=terminate_process_tree, args=(process,), daemon=True).start()
+
+# ---------- Log Console ----------
+# Lines starting with these are coloured and picked by the level filter
+ERROR_PREFIXES = ("❌", "Traceback", "Error")
+WARNING_PREFIXES = ("⚠",)
+LEVEL_NONE, LEVEL_WARNING, LEVEL_ERROR = 0, 1, 2
+LEVEL_FILTERS = [
+    ("All lines", None),
+    ("Errors", {LEVEL_ERROR}),
+    ("Warnings", {LEVEL_WARNING}),
+    ("Errors + warnings", {LEVEL_WARNING, LEVEL_ERROR}),
+]
+LOG_FLUSH_MS = 50
+LOG_SEARCH_DELAY_MS = 200
+LOG_SCAN_CHUNK = 50_000
+LOG_CACHE_LINES = 5000
+# A single huge line (e.g. a dumped blob) is cut short in the view, not in the log file
+MAX_DISPLAY_CHARS = 2000
+
+def line_level(line):
+    stripped = line.lstrip()
+    if stripped.startswith(ERROR_PREFIXES):
+        return LEVEL_ERROR
+    if stripped.startswith(WARNING_PREFIXES):
+        return LEVEL_WARNING
+    return LEVEL_NONE
+
+class LogStore:
+    """Append-only log file in the temp folder plus a line-offset index.
+
+    Memory per line is one offset and one level byte; the text is read
+    back from disk only for the lines on screen.
+    """
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="BifteKYS_log_", suffix=".txt")
+        self.file = os.fdopen(fd, "w+b")
+        self.offsets = array('Q')
+        self.levels = bytearray()
+        self.end = 0
+        self.cache = {}
+        atexit.register(self.close)
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append_lines(self, lines):
+        data = "".join(line + "\n" for line in lines).encode("utf-8", errors="replace")
+        self.file.seek(self.end)
+        self.file.write(data)
+        self.file.flush()
+        # Published only after the bytes are on disk, the filter thread reads up to len(self)
+        position = self.end
+        for line in lines:
+            self.offsets.append(position)
+            position += len(line.encode("utf-8", errors="replace")) + 1
+            self.levels.append(line_level(line))
+        self.end = position
+
+    def line(self, number):
+        text = self.cache.get(number)
+        if text is None:
+            if len(self.cache) >= LOG_CACHE_LINES:
+                self.cache.clear()
+            self.file.seek(self.offsets[number])
+            text = self.file.readline().decode("utf-8", errors="replace").rstrip("\n")
+            self.cache[number] = text
+        return text
+
+    def text(self, numbers):
+        return "\n".join(self.line(number) for number in numbers)
+
+    def clear(self):
+        self.file.seek(0)
+        self.file.truncate()
+        self.offsets = array('Q')
+        self.levels = bytearray()
+        self.end = 0
+        self.cache.clear()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.file.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class LogFilterThread(QThread):
+    """Scan a range of the log for a search text and/or level, off the GUI thread"""
+    matches_found = pyqtSignal(int, object, int)  # generation, line numbers, scanned up to
+
+    def __init__(self, path, start_offset, first_line, levels, query, wanted_levels, generation):
+        super().__init__()
+        self.path = path
+        self.start_offset = start_offset
+        self.first_line = first_line
+        self.levels = levels
+        self.query = query
+        self.wanted_levels = wanted_levels
+        self.generation = generation
+        self.cancelled = False
+
+    def run(self):
+        matches = []
+        number = self.first_line
+        with open(self.path, "rb") as f:
+            f.seek(self.start_offset)
+            for level in self.levels:
+                if self.cancelled:
+                    return
+                raw = f.readline() if self.query else None
+                if (self.wanted_levels is None or level in self.wanted_levels) and (
+                        not self.query
+                        or self.query in raw.decode("utf-8", errors="replace").casefold()):
+                    matches.append(number)
+                number += 1
+                if (number - self.first_line) % LOG_SCAN_CHUNK == 0:
+                    self.matches_found.emit(self.generation, matches, number)
+                    matches = []
+        self.matches_found.emit(self.generation, matches, number)
+
+class LogModel(QAbstractListModel):
+    """Rows are all log lines, or only the matching ones while a filter is on"""
+    def __init__(self, store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.rows = None
+        self.colors = {LEVEL_ERROR: QColor("#e5534b"), LEVEL_WARNING: QColor("#c69026")}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.store) if self.rows is None else len(self.rows)
+
+    def line_number(self, row):
+        return row if self.rows is None else self.rows[row]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        number = self.line_number(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            text = self.store.line(number)
+            return text if len(text) <= MAX_DISPLAY_CHARS else text[:MAX_DISPLAY_CHARS] + " …"
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.colors.get(self.store.levels[number])
+        return None
+
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+class LogView(QTableView):
+    """One-column table with fixed row heights, a placeholder text and Ctrl+C.
+
+    A table rather than a QListView: the list lays out every row on insert,
+    the table's header only keeps a row count when all rows are one height.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.placeholder = ""
+        self.horizontalHeader().hide()
+        self.horizontalHeader().setStretchLastSection(True)
+        self.verticalHeader().hide()
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(self.fontMetrics().height() + 4)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            model = self.model()
+            rows = sorted(index.row() for index in self.selectedIndexes())
+            QApplication.clipboard().setText(model.store.text(model.line_number(row) for row in rows))
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.placeholder and self.model().rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().color(QPalette.ColorRole.PlaceholderText))
+            painter.drawText(self.viewport().rect().adjusted(6, 4, -6, -4),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop, self.placeholder)
+
+class LogConsole(QWidget):
+    """Run output backed by a LogStore: only the visible lines are rendered.
+
+    Drop-in for the read-only QTextEdit it replaces (append, clear,
+    setPlaceholderText). Appends are batched every LOG_FLUSH_MS; search and
+    the level filter run on a LogFilterThread.
+    """
+    def __init__(self, placeholder="", parent=None):
+        super().__init__(parent)
+        self.store = LogStore()
+        self.model = LogModel(self.store, self)
+        self.pending = []
+        self.generation = 0
+        self.scanned = 0
+        self.scan_thread = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        search_row = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search output...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.level_combo = QComboBox()
+        for label, _levels in LEVEL_FILTERS:
+            self.level_combo.addItem(label)
+        self.match_label = QLabel("")
+        search_row.addWidget(self.search_edit)
+        search_row.addWidget(self.level_combo)
+        search_row.addWidget(self.match_label)
+        layout.addLayout(search_row)
+
+        self.view = LogView()
+        self.view.setModel(self.model)
+        self.setPlaceholderText(placeholder)
+        layout.addWidget(self.view)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.timeout.connect(self.flush)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.apply_filter)
+        self.search_edit.textChanged.connect(lambda _text: self.search_timer.start(LOG_SEARCH_DELAY_MS))
+        self.level_combo.currentIndexChanged.connect(self.apply_filter)
+
+    def setPlaceholderText(self, text):
+        self.view.placeholder = text
+        self.view.viewport().update()
+
+    def append(self, text):
+        for line in text.replace("\r\n", "\n").rstrip("\n").split("\n"):
+            # Progress bars redraw with \r, keep what the terminal would show last
+            self.pending.append(line.rsplit("\r", 1)[-1])
+        if not self.flush_timer.isActive():
+            self.flush_timer.start(LOG_FLUSH_MS)
+
+    def flush(self):
+        if not self.pending:
+            return
+        lines, self.pending = self.pending, []
+        scrollbar = self.view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        if self.model.rows is None:
+            first = len(self.store)
+            self.model.beginInsertRows(QModelIndex(), first, first + len(lines) - 1)
+            self.store.append_lines(lines)
+            self.model.endInsertRows()
+        else:
+            self.store.append_lines(lines)
+            self.start_scan()
+        if at_bottom:
+            self.view.scrollToBottom()
+
+    def clear(self):
+        self.pending = []
+        self.generation += 1
+        if self.scan_thread is not None:
+            self.scan_thread.cancelled = True
+        self.scanned = 0
+        self.model.beginResetModel()
+        self.store.clear()
+        if self.model.rows is not None:
+            self.model.rows = array('Q')
+        self.model.endResetModel()
+        self.update_match_label()
+
+    def apply_filter(self):
+        self.generation += 1
+        self.scanned = 0
+        query = self.search_edit.text().casefold()
+        if not query and LEVEL_FILTERS[self.level_combo.currentIndex()][1] is None:
+            self.model.set_rows(None)
+            self.view.scrollToBottom()
+        else:
+            self.model.set_rows(array('Q'))
+            self.start_scan()
+        self.update_match_label()
+
+    def start_scan(self):
+        if self.scan_thread is not None:
+            # The running scan is stale or will pick the new lines up when it ends
+            if self.scan_thread.generation != self.generation:
+                self.scan_thread.cancelled = True
+            return
+        end = len(self.store)
+        if self.model.rows is None or self.scanned >= end:
+            return
+        self.scan_thread = LogFilterThread(
+            self.store.path, self.store.offsets[self.scanned], self.scanned,
+            bytes(self.store.levels[self.scanned:end]), self.search_edit.text().casefold(),
+            LEVEL_FILTERS[self.level_combo.currentIndex()][1], self.generation)
+        self.scan_thread.matches_found.connect(self.add_matches)
+        self.scan_thread.finished.connect(self.scan_finished)
+        self.scan_thread.start()
+
+    def add_matches(self, generation, numbers, scanned):
+        if generation != self.generation or self.model.rows is None:
+            return
+        if numbers:
+            first = len(self.model.rows)
+            self.model.beginInsertRows(QModelIndex(), first, first + len(numbers) - 1)
+            self.model.rows.extend(numbers)
+            self.model.endInsertRows()
+        self.scanned = scanned
+        self.update_match_label()
+
+    def scan_finished(self):
+        self.scan_thread = None
+        self.start_scan()
+
+    def update_match_label(self):
+        if self.model.rows is None:
+            self.match_label.setText("")
+        else:
+            scanning = " (searching...)" if self.scanned < len(self.store) else ""
+            self.match_label.setText(f"{len(self.model.rows)} matches{scanning}")
+
+# ---------- Input Schema Sniffing ----------
+SNIFF_ROWS = 5                   # data rows read after the header
+SNIFF_BYTES = 64 * 1024          # text files: only the first bytes are decoded
+SNIFF_DELIMITERS = ("\t", ",", ";", "|")
+SNIFF_TEXT_FORMATS = (".csv", ".txt")
+SNIFF_ARROW_FORMATS = (".arrow", ".feather")
+
+def sniff_text_encoding(head):
+    """Same BOM rules as script_helpers.sniff_encoding (Facebook exports are UTF-16)"""
+    for bom, encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"),
+                          (codecs.BOM_UTF16_BE, "utf-16")):
+        if head.startswith(bom):
+            return encoding
+    if len(head) >= 4 and head[1:4:2] == b"\x00\x00" and head[0:4:2] != b"\x00\x00":
+        return "utf-16-le"
+    return "utf-8"
+
+def xlsx_first_sheet(archive):
+    """Path of the first worksheet inside an .xlsx (the sheet the scripts read)"""
+    from xml.etree import ElementTree
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheet = next(el for el in workbook.iter() if el.tag.endswith("}sheet"))
+    rel_id = next(value for key, value in sheet.attrib.items() if key.endswith("}id"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    target = next(el.get("Target") for el in rels if el.get("Id") == rel_id)
+    return target.lstrip("/") if target.startswith("/") else "xl/" + target
+
+def xlsx_head_rows(path, max_rows):
+    """First rows of an .xlsx, streamed from the sheet XML.
+
+    openpyxl loads the whole shared-string table even in read-only mode
+    (seconds on a large ALL export), so only the strings the first rows
+    point at are read here.
+    """
+    from xml.etree import ElementTree
+    with zipfile.ZipFile(path) as archive:
+        rows, shared = [], {}
+        with archive.open(xlsx_first_sheet(archive)) as sheet:
+            for _event, el in ElementTree.iterparse(sheet):
+                if not el.tag.endswith("}row"):
+                    continue
+                row = {}
+                for cell in el:
+                    ref, kind = cell.get("r", ""), cell.get("t")
+                    column = 0
+                    for ch in ref:
+                        if not ch.isalpha():
+                            break
+                        column = column * 26 + ord(ch.upper()) - 64
+                    column = column - 1 if column else len(row)
+                    if kind == "inlineStr":
+                        value = "".join(t.text or "" for t in cell.iter() if t.tag.endswith("}t"))
+                    else:
+                        value = next((v.text or "" for v in cell if v.tag.endswith("}v")), "")
+                        if kind == "s" and value:
+                            shared[int(value)] = None
+                            value = int(value)
+                    row[column] = value
+                rows.append(row)
+                el.clear()
+                if len(rows) >= max_rows:
+                    break
+        if shared and "xl/sharedStrings.xml" in archive.namelist():
+            last = max(shared)
+            with archive.open("xl/sharedStrings.xml") as strings:
+                index = 0
+                for _event, el in ElementTree.iterparse(strings):
+                    if el.tag.endswith("}si"):
+                        if index in shared:
+                            shared[index] = "".join(t.text or "" for t in el.iter() if t.tag.endswith("}t"))
+                        el.clear()
+                        index += 1
+                        if index > last:
+                            break
+
+    def text(value):  # shared strings were kept as their int index
+        return (shared.get(value) or "") if isinstance(value, int) else value
+
+    return [[text(row.get(i, "")) for i in range(max(row) + 1 if row else 0)] for row in rows]
+
+def read_head_rows(path, max_rows):
+    """First max_rows rows of a file as lists of strings, without parsing the rest.
+
+    Returns None for formats that cannot be sniffed.
+    """
+    lower = path.lower()
+    if lower.endswith(".xlsx"):
+        return xlsx_head_rows(path, max_rows)
+    if lower.endswith(SNIFF_TEXT_FORMATS):
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+        encoding = sniff_text_encoding(head)
+        text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(head)
+        lines = text.splitlines()
+        if len(head) == SNIFF_BYTES and len(lines) > 1:
+            lines.pop()  # probably cut in the middle
+        rows = []
+        for line in lines[:max_rows]:
+            delimiter = max(SNIFF_DELIMITERS, key=line.count)
+            rows.append(next(csv.reader([line], delimiter=delimiter), []))
+        return rows
+    if lower.endswith(SNIFF_ARROW_FORMATS):
+        try:
+            import pyarrow.ipc
+        except ImportError:
+            return None
+        with pyarrow.ipc.open_file(path) as reader:
+            return [list(reader.schema.names)]
+    return None
+
+def file_matches(file_name, patterns):
+    file_name = file_name.lower()
+    return any(fnmatch.fnmatchcase(file_name, pattern.lower()) for pattern in patterns)
+
+def header_problems(rows, schema):
+    """(header row index, problems) for the best header candidate in rows"""
+    wanted = [column.strip().lower() for column in schema.get("columns", [])]
+    min_columns = schema.get("min_columns", len(wanted))
+    best = (0, ["empty file"])
+    for index, row in enumerate(rows[:schema.get("header_within", 1)]):
+        header = {cell.strip().lower() for cell in row}
+        problems = []
+        missing = [name for name, key in zip(schema.get("columns", []), wanted) if key not in header]
+        if missing:
+            problems.append("missing " + ", ".join(missing))
+        if not missing and len(row) < min_columns:
+            problems.append(f"{len(row)} columns, needs {min_columns}")
+        if not problems:
+            return index, []
+        if index == 0 or len(problems) < len(best[1]):
+            best = (index, problems)
+    return best
+
+def sniff_file(path, schemas):
+    """Match one file against a script's schemas: (level, text), level ok/warning/error/skipped.
+
+    A role is detected when the file name, format and header all agree; the
+    message for a mismatch names what the script would trip over.
+    """
+    name = os.path.basename(path)
+    max_rows = max(schema.get("header_within", 1) for schema in schemas.values()) + SNIFF_ROWS
+    try:
+        rows = read_head_rows(path, max_rows)
+    except Exception as e:
+        return "error", f"unreadable ({e.__class__.__name__})"
+    if rows is None:
+        return "skipped", "not checked"
+
+    by_content = None
+    named = []
+    failed = []
+    considered = 0
+    for role, schema in schemas.items():
+        formats = tuple(ext.lower() for ext in schema.get("formats", []))
+        if formats and not name.lower().endswith(formats):
+            continue
+        considered += 1
+        header_index, problems = header_problems(rows, schema)
+        name_ok = file_matches(name, schema.get("file", ["*"]))
+        if not problems:
+            if not rows[header_index + 1:]:
+                return "warning", f"{role}, but no data rows"
+            if name_ok:
+                return "ok", role
+            by_content = by_content or role
+        elif name_ok and "file" in schema:
+            named.append((role, problems))
+        else:
+            failed.append((role, problems))
+    if named:
+        role, problems = named[0]
+        hint = f" (looks like {by_content})" if by_content else ""
+        return "error", f"named like {role}, but {'; '.join(problems)}{hint}"
+    if by_content:
+        return "warning", f"looks like {by_content}, but the file name does not match"
+    if not considered:
+        return "error", f"unexpected format ({os.path.splitext(name)[1] or 'no extension'})"
+    if len(failed) == 1:
+        role, problems = failed[0]
+        return "error", f"not a {role} ({'; '.join(problems)})"
+    return "error", "matches none of: " + ", ".join(schemas)
+
+class SchemaSniffThread(QThread):
+    """Sniff dropped files one by one; emits (path, (level, text)) per file"""
+    file_sniffed = pyqtSignal(str, object)
+
+    def __init__(self, paths, schemas):
+        super().__init__()
+        self.paths = paths
+        self.schemas = schemas
+
+    def run(self):
+        for path in self.paths:
+            if self.isInterruptionRequested():
+                return
+            self.file_sniffed.emit(path, sniff_file(path, self.schemas))
 
 # ---------- Drop Area ----------
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num_bytes < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+
+class FileScanThread(QThread):
+    """Expand dropped folders and glob patterns into (path, size, mtime) tuples.
+
+    Folders are walked recursively with os.scandir and filtered by the
+    script's input formats; explicitly dropped files are always kept.
+    """
+    scan_finished = pyqtSignal(list)
+
+    def __init__(self, paths, input_formats):
+        super().__init__()
+        self.paths = paths
+        self.input_formats = tuple(ext.strip().lower() for ext in input_formats if ext.strip())
+
+    def run(self):
+        found = []
+        for path in self.paths:
+            if self.isInterruptionRequested():
+                return
+            if os.path.isdir(path):
+                found.extend(self.walk(path))
+            elif glob.has_magic(path):
+                for match in glob.iglob(path, recursive=True):
+                    if os.path.isfile(match) and match.lower().endswith(self.input_formats):
+                        found.append(self.describe(match))
+            elif os.path.isfile(path):
+                found.append(self.describe(path))
+        found.sort(key=lambda item: item[2])  # oldest first
+        self.scan_finished.emit(found)
+
+    def walk(self, root):
+        stack = [root]
+        while stack:
+            if self.isInterruptionRequested():
+                return
+            try:
+                with os.scandir(stack.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file() and entry.name.lower().endswith(self.input_formats):
+                            stat = entry.stat()
+                            yield (entry.path, stat.st_size, stat.st_mtime)
+            except OSError:
+                continue
+
+    @staticmethod
+    def describe(path):
+        stat = os.stat(path)
+        return (path, stat.st_size, stat.st_mtime)
+
 class DropArea(QLabel):
-    def __init__(self, parent=None):
+    files_changed = pyqtSignal(list)
+    max_listed_files = 8
+
+    def __init__(self, input_formats=None, schemas=None, parent=None):
         super().__init__(parent)
         self.setText("\n\n Drop input file(s) here ")
         self.setStyleSheet("QLabel { border: 2px dashed #555; font-size:16px; }")
         self.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.setAcceptDrops(True)
+        self.input_formats = input_formats or ['.csv', '.xlsx', '.txt']
         self.dropped_files = []
+        self.scan_thread = None
+        self.stale_scans = []  # interrupted scans kept alive until they exit
+        self.schemas = schemas or {}
+        self.found = []
+        self.sniff_results = {}
+        self.sniff_thread = None
         self.setMinimumHeight(100)
 
+    @property
+    def scanning(self):
+        return self.scan_thread is not None
+
     def dragEnterEvent(self, event):
         if event.mimeData().hasUrls():
             event.accept()
@@ -315,16 +1719,210 @@ class DropArea(QLabel):
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
-            self.dropped_files = [url.toLocalFile() for url in event.mimeData().urls()]
-            file_list = "\n".join([os.path.basename(f) for f in self.dropped_files])
-            self.setText(f"Dropped files:\n{file_list}")
+            paths = [url.toLocalFile() for url in event.mimeData().urls()]
+            self.start_scan(paths)
             event.accept()
 
+    def start_scan(self, paths):
+        if self.scan_thread:
+            self.scan_thread.requestInterruption()
+            self.stale_scans.append(self.scan_thread)
+        self.stop_sniff()
+        self.dropped_files = []
+        self.setText("Scanning dropped items...")
+        self.scan_thread = FileScanThread(paths, self.input_formats)
+        self.scan_thread.scan_finished.connect(self.scan_done)
+        self.scan_thread.finished.connect(self.release_stale_scans)
+        self.scan_thread.start()
+
+    def scan_done(self, found):
+        if self.sender() is not self.scan_thread:
+            return  # superseded by a newer drop
+        self.scan_thread = None
+        self.dropped_files = [path for path, _size, _mtime in found]
+        self.found = found
+        self.setText(self.summary_text(found))
+        self.files_changed.emit(self.dropped_files)
+        self.start_sniff()
+
+    def release_stale_scans(self):
+        self.stale_scans = [t for t in self.stale_scans if t.isRunning()]
+
+    # 🔎 Header check in the background, so a wrong file shows up before Run
+    def start_sniff(self):
+        if not self.schemas or not self.dropped_files:
+            return
+        self.sniff_thread = SchemaSniffThread(self.dropped_files, self.schemas)
+        self.sniff_thread.file_sniffed.connect(self.file_sniffed)
+        self.sniff_thread.finished.connect(self.release_stale_scans)
+        self.sniff_thread.start()
+
+    def stop_sniff(self):
+        if self.sniff_thread:
+            self.sniff_thread.requestInterruption()
+            self.stale_scans.append(self.sniff_thread)
+        self.sniff_thread = None
+        self.sniff_results = {}
+
+    def file_sniffed(self, path, result):
+        if self.sender() is not self.sniff_thread:
+            return
+        self.sniff_results[path] = result
+        self.setText(self.summary_text(self.found))
+
+    def sniff_failures(self):
+        """[(path, reason)] for dropped files that do not fit the script"""
+        return [(path, text) for path, (level, text) in self.sniff_results.items() if level == "error"]
+
+    def summary_text(self, found):
+        if not found:
+            return "No matching input files found.\n\n Drop input file(s) here "
+        total = sum(size for _path, size, _mtime in found)
+        lines = [f"Dropped files: {len(found)} ({format_size(total)})"]
+        failures = sum(1 for level, _text in self.sniff_results.values() if level == "error")
+        if failures:
+            lines[0] += f", {failures} not matching this script"
+        for path, size, _mtime in found[:self.max_listed_files]:
+            line = f"{os.path.basename(path)}  [{format_size(size)}]"
+            level, text = self.sniff_results.get(path, ("skipped", ""))
+            if level == "ok":
+                line += f"  → {text}"
+            elif level in ("warning", "error"):
+                line += f"  {'⚠️' if level == 'warning' else '❌'} {text}"
+            lines.append(line)
+        if len(found) > self.max_listed_files:
+            lines.append(f"... and {len(found) - self.max_listed_files} more")
+        return "\n".join(lines)
+
+# ---------- Folder Watcher ----------
+class FolderWatcher(QObject):
+    """Watch a folder for new input files and emit them in coalesced batches.
+
+    A file is only reported once its size and mtime have stopped changing
+    between two polls, so half-copied exports are never picked up. A file
+    that is replaced (or deleted and exported again) under the same name is
+    reported again.
+    """
+    batch_ready = pyqtSignal(list)
+
+    def __init__(self, folder, input_formats, settle_ms=2000, batch_ms=5000, parent=None):
+        super().__init__(parent)
+        self.folder = folder
+        self.input_formats = tuple(ext.strip().lower() for ext in input_formats if ext.strip())
+        self.known_files = self.list_matching_files()  # ignore files already there
+        self.pending = {}  # path -> (size, mtime_ns) seen on the previous poll
+        self.ready = []
+
+        self.watcher = QFileSystemWatcher([folder], self)
+        self.watcher.directoryChanged.connect(self.scan_folder)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(settle_ms)
+        self.poll_timer.timeout.connect(self.check_pending)
+
+        self.batch_timer = QTimer(self)
+        self.batch_timer.setSingleShot(True)
+        self.batch_timer.setInterval(batch_ms)
+        self.batch_timer.timeout.connect(self.flush_batch)
+
+    def list_matching_files(self):
+        """path -> (size, mtime_ns) of the input files in the folder"""
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError:
+            return {}
+        files = {}
+        for entry in entries:
+            if not entry.name.lower().endswith(self.input_formats):
+                continue
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+            except OSError:
+                continue
+        return files
+
+    def scan_folder(self, _path=None):
+        files = self.list_matching_files()
+        # Forget files that are gone, so a new export under the same name counts
+        for file_path in [path for path in self.known_files if path not in files]:
+            del self.known_files[file_path]
+        for file_path, signature in files.items():
+            if self.known_files.get(file_path) == signature or file_path in self.pending:
+                continue
+            self.pending[file_path] = None
+        if self.pending and not self.poll_timer.isActive():
+            self.poll_timer.start()
+
+    def check_pending(self):
+        for file_path, previous in list(self.pending.items()):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # File vanished (temp file renamed or moved away)
+                del self.pending[file_path]
+                continue
+            current = (stat.st_size, stat.st_mtime_ns)
+            if previous == current and stat.st_size > 0:
+                del self.pending[file_path]
+                self.known_files[file_path] = current
+                self.ready.append(file_path)
+                self.batch_timer.start()  # restart: keep coalescing the burst
+            else:
+                self.pending[file_path] = current
+        if not self.pending:
+            self.poll_timer.stop()
+
+    def flush_batch(self):
+        if self.pending:
+            # Part of the burst is still being written, wait for it
+            self.batch_timer.start()
+            return
+        if self.ready:
+            batch, self.ready = self.ready, []
+            self.batch_ready.emit(batch)
+
+    def stop(self):
+        self.poll_timer.stop()
+        self.batch_timer.stop()
+        self.watcher.removePaths(self.watcher.directories())
+
+# ---------- Script Discovery ----------
+def find_script_file(folder_path):
+    for file in os.listdir(folder_path):
+        if file.endswith(".py"):
+            return os.path.join(folder_path, file)
+    return None
+
+def list_script_folders(scripts_dir):
+    try:
+        entries = sorted(os.listdir(scripts_dir))
+    except FileNotFoundError:
+        return []
+    # Skip __pycache__ (from script_helpers.py imports) and hidden folders
+    return [
+        os.path.join(scripts_dir, folder) for folder in entries
+        if not folder.startswith(("_", ".")) and os.path.isdir(os.path.join(scripts_dir, folder))
+    ]
+
+def default_parameter_env(params):
+    """Environment for a script's parameters at their configured defaults"""
+    env = {}
+    for param_name, param_config in params.items():
+        default = param_config.get('default', '')
+        if param_config.get('type') == 'checkbox':
+            env[param_name.upper()] = "1" if default else "0"
+        else:
+            env[param_name.upper()] = str(default)
+    return env
+
 # ---------- Script Configuration ----------
 class ScriptConfig:
     def __init__(self, folder_path):
         self.folder_path = folder_path
         self.config_file = os.path.join(folder_path, "script_config.ini")
+        import configparser  # first needed when a tab is built, keep it off start-up
         self.config = configparser.ConfigParser()
         self.load_config()
         
@@ -353,6 +1951,46 @@ class ScriptConfig:
         except:
             return {}
     
+    def get_schemas(self):
+        """Input file roles: {role: {file, formats, columns, min_columns, header_within}}"""
+        try:
+            schemas = json.loads(self.config['DEFAULT'].get('schemas', '{}', raw=True))
+        except ValueError:
+            return {}
+        return schemas if isinstance(schemas, dict) else {}
+    
+    def get_resource_limits(self):
+        """Optional cpu_time_limit (s), memory_limit_mb and wall_clock_limit (s); 0 = no limit"""
+        limits = {}
+        for key in ('cpu_time_limit', 'memory_limit_mb', 'wall_clock_limit'):
+            try:
+                limits[key] = max(0, int(self.config['DEFAULT'].get(key, '0')))
+            except ValueError:
+                limits[key] = 0
+        return limits
+    
+    def get_partitioning(self):
+        """None, or {'partitions': n, 'min_size_mb': m} for execution_mode = partitioned"""
+        section = self.config['DEFAULT']
+        if section.get('execution_mode', 'single').strip().lower() != 'partitioned':
+            return None
+        try:
+            partitions = int(section.get('partitions', '0'))
+            min_size_mb = float(section.get('partition_min_size_mb', '50'))
+        except ValueError:
+            return None
+        return {
+            'partitions': partitions if partitions > 0 else (os.cpu_count() or 2),
+            'min_size_mb': min_size_mb,
+        }
+    
+    def get_checkpointing(self):
+        """checkpoints = true: the script keeps per-file results so batches can resume"""
+        try:
+            return self.config['DEFAULT'].getboolean('checkpoints', fallback=False)
+        except ValueError:
+            return False
+    
     def set_parameters(self, params):
         self.config['DEFAULT']['parameters'] = json.dumps(params)
         self.save_config()
@@ -366,6 +2004,13 @@ class ScriptTab(QWidget):
         self.config = ScriptConfig(folder_path)
         self.settings = QSettings("BifteKYS", "ScriptRunner")
         self.runner_thread = None
+        self.folder_watcher = None
+        self.queued_files = []
+        self.manifest_file = None
+        self.profile_file = None
+        self.staging_dir = None
+        self.run_active = False
+        self.interactive_run = True
         self.output_dir = self.settings.value(f"{os.path.basename(folder_path)}/output_dir", os.path.expanduser("~"))
         self.script_name = os.path.basename(folder_path)  # Store script name for backup organization
         
@@ -378,7 +2023,7 @@ class ScriptTab(QWidget):
         layout.addWidget(info_label)
         
         # Drop zone
-        self.drop_area = DropArea()
+        self.drop_area = DropArea(self.config.get_input_formats(), self.config.get_schemas())
         layout.addWidget(self.drop_area)
         
         # Parameters group
@@ -394,10 +2039,23 @@ class ScriptTab(QWidget):
         self.stop_button = QPushButton("Stop")
         self.stop_button.clicked.connect(self.stop_script)
         self.stop_button.setEnabled(False)
+        self.watch_button = QPushButton("Watch Folder")
+        self.watch_button.setCheckable(True)
+        self.watch_button.toggled.connect(self.toggle_watch_folder)
         buttons.addWidget(self.choose_folder_btn)
         buttons.addWidget(self.run_button)
         buttons.addWidget(self.stop_button)
+        buttons.addWidget(self.watch_button)
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.setToolTip("Re-run the last unfinished batch, skipping files it already processed")
+        self.resume_button.clicked.connect(self.resume_run)
+        self.resume_button.setVisible(self.config.get_checkpointing())
+        buttons.addWidget(self.resume_button)
+        self.profile_checkbox = QCheckBox("Profile this run")
+        self.profile_checkbox.setToolTip("Run under cProfile and show the slowest functions afterwards")
+        buttons.addWidget(self.profile_checkbox)
         layout.addLayout(buttons)
+        self.update_resume_button()
         
         # Progress bar
         self.progress_bar = QProgressBar()
@@ -406,10 +2064,15 @@ class ScriptTab(QWidget):
         
         # Splitter: console + README
         splitter = QSplitter(Qt.Orientation.Vertical)
-        self.output_box = QTextEdit(readOnly=True)
-        self.output_box.setPlaceholderText("Script output will appear here...")
+        self.output_box = LogConsole("Script output will appear here...")
         splitter.addWidget(self.output_box)
         
+        self.profile_box = QTextEdit(readOnly=True)
+        self.profile_box.setFont(QFont("Consolas", 9))
+        self.profile_box.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.profile_box.setVisible(False)
+        splitter.addWidget(self.profile_box)
+        
         self.readme_box = QTextEdit(readOnly=True)
         self.readme_box.setPlaceholderText("No README found.")
         self.load_readme()
@@ -422,10 +2085,7 @@ class ScriptTab(QWidget):
         self.update_output_folder_label()
 
     def find_script(self):
-        for file in os.listdir(self.folder_path):
-            if file.endswith(".py"):
-                return os.path.join(self.folder_path, file)
-        return None
+        return find_script_file(self.folder_path)
 
     def setup_parameters_ui(self, layout):
         params = self.config.get_parameters()
@@ -489,6 +2149,7 @@ class ScriptTab(QWidget):
                     
                     # If it's markdown, convert to HTML
                     if readme_file.endswith('.md'):
+                        import markdown  # only needed for .md readmes, keep it off start-up
                         content = markdown.markdown(content)
                         self.readme_box.setHtml(content)
                     else:
@@ -503,16 +2164,50 @@ class ScriptTab(QWidget):
             self.output_dir = folder
             self.settings.setValue(f"{os.path.basename(self.folder_path)}/output_dir", self.output_dir)
             self.update_output_folder_label()
+            self.update_resume_button()
             self.output_box.append(f"📁 Output folder set to: {self.output_dir}\n")
 
     def update_output_folder_label(self):
         self.choose_folder_btn.setText(f"Output: {os.path.basename(self.output_dir)}")
 
+    def toggle_watch_folder(self, enabled):
+        if not enabled:
+            if self.folder_watcher:
+                self.folder_watcher.stop()
+                self.folder_watcher = None
+                self.output_box.append("👀 Stopped watching folder\n")
+            self.watch_button.setText("Watch Folder")
+            return
+
+        last_folder = self.settings.value(f"{self.script_name}/watch_folder", self.output_dir)
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder to Watch", last_folder)
+        if not folder:
+            self.watch_button.setChecked(False)
+            return
+
+        self.settings.setValue(f"{self.script_name}/watch_folder", folder)
+        self.folder_watcher = FolderWatcher(folder, self.config.get_input_formats(), parent=self)
+        self.folder_watcher.batch_ready.connect(self.queue_auto_run)
+        self.watch_button.setText(f"Watching: {os.path.basename(folder)}")
+        self.output_box.append(f"👀 Watching folder: {folder}\n")
+
+    def queue_auto_run(self, input_files):
+        self.queued_files.extend(f for f in input_files if f not in self.queued_files)
+        if self.run_active:
+            self.output_box.append(f"⏳ {len(input_files)} new file(s) queued until the current run finishes\n")
+            return
+        self.start_queued_run()
+
+    def start_queued_run(self):
+        input_files, self.queued_files = self.queued_files, []
+        self.output_box.append(f"👀 Auto-run for {len(input_files)} new file(s)\n")
+        self.start_run(input_files, interactive=False)
+
     def run_script(self):
-        if not self.script_file:
-            self.output_box.append("❌ No Python script found in this folder.\n")
+        if self.drop_area.scanning:
+            self.output_box.append("⏳ Still scanning the dropped items, try again in a moment.\n")
             return
-            
+
         # Validate input files
         input_files = self.drop_area.dropped_files
         if not input_files:
@@ -521,45 +2216,149 @@ class ScriptTab(QWidget):
                                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if reply == QMessageBox.StandardButton.No:
                 return
-        
+        failures = self.drop_area.sniff_failures()
+        if failures:
+            listed = "\n".join(f"{os.path.basename(path)}: {reason}" for path, reason in failures[:10])
+            reply = QMessageBox.question(self, "Unexpected Input Files",
+                                       f"{len(failures)} file(s) do not match what this script expects:\n\n"
+                                       f"{listed}\n\nRun anyway?",
+                                       QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+            if reply == QMessageBox.StandardButton.No:
+                return
+        self.start_run(input_files)
+
+    def start_run(self, input_files, interactive=True, resume=False):
+        if not self.script_file:
+            self.output_box.append("❌ No Python script found in this folder.\n")
+            return
+
+        # The previous runner may still be returning from run() after its finish
+        # signal (or stopping); start once it is done
+        if self.runner_thread and self.runner_thread.isRunning():
+            self.run_active = True
+            self.run_button.setEnabled(False)
+            call_when_finished(self.runner_thread, partial(self.start_run, input_files, interactive, resume))
+            return
+
+        # Outputs go to a private staging folder, moved into place when the run succeeds
+        try:
+            self.staging_dir = create_staging_dir(self.output_dir, self.script_name)
+        except OSError as e:
+            self.output_box.append(f"❌ Could not use the output folder {self.output_dir}: {e}\n")
+            self.run_active = False
+            self.run_button.setEnabled(True)
+            self.update_resume_button()
+            return
+
+        self.run_active = True
+        self.interactive_run = interactive
+
         # Backup input files if enabled in settings
         if self.settings.value("backup_input", False, type=bool):
             self.backup_input_files(input_files)
         
-        # Prepare environment
-        env = os.environ.copy()
-        env["OUTPUT_DIR"] = self.output_dir
-        
-        # Add parameters to environment
+        # Parameters as environment variables (kept apart for the runner daemon)
+        param_env = {}
         for param_name, widget in self.param_widgets.items():
             if isinstance(widget, QComboBox):
-                env[param_name.upper()] = widget.currentText()
+                param_env[param_name.upper()] = widget.currentText()
             elif isinstance(widget, QCheckBox):
-                env[param_name.upper()] = "1" if widget.isChecked() else "0"
+                param_env[param_name.upper()] = "1" if widget.isChecked() else "0"
             elif isinstance(widget, QLineEdit):
-                env[param_name.upper()] = widget.text()
+                param_env[param_name.upper()] = widget.text()
             elif isinstance(widget, QWidget):  # File browser case
                 line_edit = widget.findChild(QLineEdit)
                 if line_edit:
-                    env[param_name.upper()] = line_edit.text()
+                    param_env[param_name.upper()] = line_edit.text()
+
+        param_env["FINAL_OUTPUT_DIR"] = self.output_dir
         
-        # Prepare script arguments
-        args = [sys.executable, self.script_file]
-        for file_path in input_files:
-            args.append(file_path)
+        # Prepare environment
+        env = os.environ.copy()
+        env["OUTPUT_DIR"] = self.staging_dir
+        env.update(param_env)
         
-        # Clear output and show progress
-        self.output_box.clear()
+        # Prepare script arguments (large input lists go through a manifest file)
+        self.profile_file = None
+        if self.profile_checkbox.isChecked():
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.profile_file = os.path.join(self.output_dir, f"{self.script_name}_{timestamp}.prof")
+        args, self.manifest_file = build_script_args(self.script_file, input_files, self.profile_file)
+        
+        # Clear output and show progress (keep the log of auto-runs)
+        if interactive:
+            self.output_box.clear()
+        if self.profile_file:
+            self.output_box.append(f"⏱️ Profiling enabled, stats will be saved to: {self.profile_file}\n")
+        if self.manifest_file:
+            self.output_box.append(f"📄 Passing {len(input_files)} input files via manifest: {self.manifest_file}\n")
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         self.run_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         
-        # Run script in a separate thread
-        self.runner_thread = ScriptRunnerThread(args, self.folder_path, env)
+        # Run script off the GUI thread (or split across parallel parts)
+        partitioning = self.config.get_partitioning()
+        split_file = None
+        if partitioning:
+            split_file = pick_partition_input(input_files, partitioning['min_size_mb'])
+        if split_file and self.profile_file:
+            # One profile per part would not add up to anything useful
+            self.output_box.append("⏱️ Profiling is on, so the script runs as a single process (not partitioned)\n")
+            split_file = None
+        if split_file:
+            if self.config.get_checkpointing():
+                self.output_box.append("ℹ️ Partitioned runs do not write checkpoints, Resume will not be available for this batch\n")
+            self.runner_thread = PartitionedRunnerThread(
+                self.script_file, input_files, split_file, partitioning['partitions'],
+                self.folder_path, env, self.config.get_resource_limits(), self.staging_dir
+            )
+        else:
+            if self.config.get_checkpointing():
+                checkpoint_env = self.prepare_checkpoint(input_files, resume)
+                env.update(checkpoint_env)
+                param_env.update(checkpoint_env)
+            job = {"script": self.script_name, "input_files": input_files, "env": param_env,
+                   "output_dir": self.staging_dir, "profile_path": self.profile_file}
+            self.runner_thread = create_runner(args, self.folder_path, env,
+                                               self.config.get_resource_limits(), job)
+            if isinstance(self.runner_thread, DaemonRunner):
+                self.output_box.append("🛰️ Submitted to the runner daemon\n")
         self.runner_thread.output_signal.connect(self.output_box.append)
         self.runner_thread.finished_signal.connect(self.script_finished)
         self.runner_thread.start()
+        self.resume_button.setEnabled(False)
+
+    # ---- checkpoints ----
+    def checkpoint_dir(self):
+        return os.path.join(self.output_dir, ".checkpoints", self.script_name)
+
+    def prepare_checkpoint(self, input_files, resume):
+        """Env for script_helpers.BatchCheckpoint; remembers the batch for Resume"""
+        checkpoint_dir = self.checkpoint_dir()
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        if not resume:
+            with open(os.path.join(checkpoint_dir, "inputs.json"), "w", encoding="utf-8") as f:
+                json.dump(input_files, f, ensure_ascii=False)
+        return {"CHECKPOINT_DIR": checkpoint_dir, "RESUME": "1" if resume else "0"}
+
+    def resume_run(self):
+        inputs_file = os.path.join(self.checkpoint_dir(), "inputs.json")
+        try:
+            with open(inputs_file, encoding="utf-8") as f:
+                input_files = json.load(f)
+        except (OSError, ValueError):
+            self.update_resume_button()
+            return
+        missing = [path for path in input_files if not os.path.exists(path)]
+        if missing:
+            self.output_box.append(f"⚠️ {len(missing)} input file(s) of the last batch no longer exist\n")
+        self.start_run(input_files, resume=True)
+        self.output_box.append(f"♻️ Resuming the last batch ({len(input_files)} files)\n")
+
+    def update_resume_button(self):
+        unfinished = os.path.exists(os.path.join(self.checkpoint_dir(), "inputs.json"))
+        self.resume_button.setEnabled(self.config.get_checkpointing() and unfinished and not self.run_active)
 
     def backup_input_files(self, input_files):
         # Get custom backup folder or use default
@@ -587,16 +2386,46 @@ class ScriptTab(QWidget):
 
     def stop_script(self):
         if self.runner_thread:
-            self.runner_thread.stop()
+            # We report the stop ourselves, ignore the thread's own finish signal
+            runner = self.runner_thread
+            runner.finished_signal.disconnect(self.script_finished)
+            if self.staging_dir:
+                # The script can still write during its stop grace period, so the
+                # staging folder goes only once the runner reports the exit
+                staging_dir, self.staging_dir = self.staging_dir, None
+                if runner.isRunning():
+                    runner.finished_signal.connect(lambda _success, _message: discard_staging_dir(staging_dir))
+                else:
+                    discard_staging_dir(staging_dir)
+            runner.stop()
             self.output_box.append("🛑 Script execution stopped by user\n")
             self.script_finished(False, "Stopped by user")
 
     def script_finished(self, success, message):
+        self.run_active = False
+        if self.manifest_file:
+            try:
+                os.remove(self.manifest_file)
+            except OSError:
+                pass
+            self.manifest_file = None
+        published = self.finish_staging(success)
+        if success and not published:
+            message = "Script completed, but its outputs could not be published"
+        success = published
+        if success and self.config.get_checkpointing():
+            # Batch done and published, nothing left to resume
+            shutil.rmtree(self.checkpoint_dir(), ignore_errors=True)
+        self.update_resume_button()
+        self.show_profile_report()
         self.progress_bar.setVisible(False)
         self.run_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         
-        if success:
+        if not self.interactive_run:
+            # Unattended (watch folder) runs only log, no dialogs
+            self.output_box.append(f"{'✅' if success else '❌'} {message}\n")
+        elif success:
             self.output_box.append(f"✅ {message}\n")
             # Offer to open output folder
             reply = QMessageBox.question(self, "Script Completed", 
@@ -612,6 +2441,47 @@ class ScriptTab(QWidget):
                 QMessageBox.critical(self, "Script Error", 
                                    f"An error occurred during script execution:\n\n{message}")
 
+        # Files that arrived in the watched folder meanwhile
+        if self.queued_files:
+            self.start_queued_run()
+
+    def finish_staging(self, success):
+        """Publish the run's outputs; a failed run's are left in staging for a look"""
+        if not self.staging_dir:
+            return success
+        staging_dir, self.staging_dir = self.staging_dir, None
+        if not success:
+            if os.listdir(staging_dir):
+                self.output_box.append(f"⚠️ Outputs of the failed run were kept in: {staging_dir}\n")
+            else:
+                discard_staging_dir(staging_dir)
+            return False
+        try:
+            published = publish_outputs(staging_dir, self.output_dir)
+        except OSError as e:
+            self.output_box.append(f"❌ Could not move the outputs out of {staging_dir}: {e}\n")
+            return False
+        for message in publish_messages(published):
+            self.output_box.append(f"{message}\n")
+        return True
+
+    def show_profile_report(self):
+        if not self.profile_file:
+            self.profile_box.setVisible(False)
+            return
+        if not os.path.exists(self.profile_file):
+            self.output_box.append("⚠️ No profile was written (the script was stopped or crashed early)\n")
+            self.profile_box.setVisible(False)
+            return
+        try:
+            report = format_profile_report(self.profile_file)
+        except Exception as e:
+            self.output_box.append(f"⚠️ Could not read profile: {str(e)}\n")
+            return
+        self.profile_box.setPlainText(f"Top {PROFILE_TOP_N} functions by cumulative time\n{report}")
+        self.profile_box.setVisible(True)
+        self.output_box.append(f"⏱️ Profile saved to: {self.profile_file}\n")
+
     def open_output_folder(self):
         if sys.platform.startswith("win"):
             os.startfile(self.output_dir)  # type: ignore
@@ -620,11 +2490,620 @@ class ScriptTab(QWidget):
         else:
             subprocess.call(["xdg-open", self.output_dir])
 
+# ---------- Pipeline ----------
+def pipeline_temp_root():
+    """Shared-memory backed tmpfs when there is one, so stage hand-offs never touch disk"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return None
+
+class PipelineRunner(QObject):
+    """Run scripts as chained stages.
+
+    Every stage but the last gets a private PIPELINE_DIR; scripts that use
+    script_helpers.write_output_frame drop Arrow/Feather frames there, which
+    become the next stage's inputs. Only the final stage writes to the
+    user's output folder.
+    """
+    output_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+
+    def __init__(self, stage_folders, input_files, output_dir, parent=None):
+        super().__init__(parent)
+        self.stage_folders = stage_folders
+        self.input_files = input_files
+        self.output_dir = output_dir
+        self.work_dir = None
+        self.runner_thread = None
+        self.manifest_file = None
+        self.stage_index = 0
+        self.stage_started = 0.0
+        self.timings = []
+        self.staging_dir = None
+
+    def start(self):
+        self.work_dir = tempfile.mkdtemp(prefix="pipeline_", dir=pipeline_temp_root())
+        self.stage_index = 0
+        self.timings = []
+        self.start_stage(self.input_files)
+
+    def stage_name(self):
+        return os.path.basename(self.stage_folders[self.stage_index])
+
+    def start_stage(self, input_files):
+        # The previous stage's thread may still be returning from run()
+        if self.runner_thread and self.runner_thread.isRunning():
+            call_when_finished(self.runner_thread, partial(self.start_stage, input_files))
+            return
+        folder = self.stage_folders[self.stage_index]
+        script_file = find_script_file(folder)
+        if not script_file:
+            self.finish(False, f"No Python script found in {folder}")
+            return
+        config = ScriptConfig(folder)
+        final = self.stage_index == len(self.stage_folders) - 1
+        stage_dir = os.path.join(self.work_dir, f"stage_{self.stage_index + 1}")
+        os.makedirs(stage_dir, exist_ok=True)
+
+        env = os.environ.copy()
+        env.update(default_parameter_env(config.get_parameters()))
+        if final:
+            try:
+                self.staging_dir = create_staging_dir(self.output_dir, "pipeline")
+            except OSError as e:
+                self.finish(False, f"Could not use the output folder {self.output_dir}: {e}")
+                return
+            env["FINAL_OUTPUT_DIR"] = self.output_dir
+        env["OUTPUT_DIR"] = self.staging_dir if final else stage_dir
+        env["PIPELINE_DIR"] = stage_dir
+        env["PIPELINE_FINAL_STAGE"] = "1" if final else "0"
+
+        args, self.manifest_file = build_script_args(script_file, input_files)
+        self.output_signal.emit(
+            f"▶️ Stage {self.stage_index + 1}/{len(self.stage_folders)}: {self.stage_name()} "
+            f"({len(input_files)} input file(s))"
+        )
+
+        self.runner_thread = create_runner(args, folder, env, config.get_resource_limits())
+        prefix = f"[{self.stage_name()}] "
+        self.runner_thread.output_signal.connect(lambda line: self.output_signal.emit(prefix + line))
+        self.runner_thread.finished_signal.connect(self.stage_finished)
+        self.stage_started = time.perf_counter()
+        self.runner_thread.start()
+
+    def stage_finished(self, success, message):
+        elapsed = time.perf_counter() - self.stage_started
+        self.timings.append((self.stage_name(), elapsed))
+        self.output_signal.emit(f"⏱️ Stage {self.stage_index + 1} ({self.stage_name()}): {elapsed:.2f}s")
+        if self.manifest_file:
+            try:
+                os.remove(self.manifest_file)
+            except OSError:
+                pass
+            self.manifest_file = None
+
+        if not success:
+            self.finish(False, f"Stage {self.stage_name()} failed: {message}")
+            return
+        if self.stage_index == len(self.stage_folders) - 1:
+            total = sum(seconds for _name, seconds in self.timings)
+            self.finish(True, f"Pipeline completed in {total:.2f}s")
+            return
+
+        stage_dir = os.path.join(self.work_dir, f"stage_{self.stage_index + 1}")
+        produced = sorted(os.path.join(stage_dir, f) for f in os.listdir(stage_dir))
+        arrow_files = [f for f in produced if f.lower().endswith(('.arrow', '.feather'))]
+        next_inputs = arrow_files or produced
+        if not next_inputs:
+            self.finish(False, f"Stage {self.stage_name()} produced no output for the next stage")
+            return
+        self.stage_index += 1
+        self.start_stage(next_inputs)
+
+    def stop(self):
+        if self.runner_thread:
+            self.runner_thread.finished_signal.disconnect(self.stage_finished)
+            self.runner_thread.stop()
+        if self.staging_dir:
+            discard_staging_dir(self.staging_dir)
+            self.staging_dir = None
+        self.finish(False, "Stopped by user")
+
+    def finish(self, success, message):
+        if self.work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+            self.work_dir = None
+        if self.staging_dir:
+            staging_dir, self.staging_dir = self.staging_dir, None
+            if success:
+                for line in publish_messages(publish_outputs(staging_dir, self.output_dir)):
+                    self.output_signal.emit(line)
+            else:
+                discard_staging_dir(staging_dir)
+        self.finished_signal.emit(success, message)
+
+class PipelineDialog(QDialog):
+    def __init__(self, scripts_dir, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Pipeline")
+        self.resize(700, 600)
+        self.settings = QSettings("BifteKYS", "ScriptRunner")
+        self.scripts_dir = scripts_dir
+        self.runner = None
+        self.output_dir = self.settings.value("pipeline/output_dir", os.path.expanduser("~"))
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Tick the stages to run and drag them into order:"))
+        self.stage_list = QListWidget()
+        self.stage_list.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.populate_stages()
+        layout.addWidget(self.stage_list)
+
+        formats = set()
+        for folder_path in list_script_folders(scripts_dir):
+            formats.update(ScriptConfig(folder_path).get_input_formats())
+        self.drop_area = DropArea(sorted(formats))
+        layout.addWidget(self.drop_area)
+
+        buttons = QHBoxLayout()
+        self.choose_folder_btn = QPushButton(f"Output: {os.path.basename(self.output_dir)}")
+        self.choose_folder_btn.clicked.connect(self.choose_output_folder)
+        self.run_button = QPushButton("Run Pipeline")
+        self.run_button.clicked.connect(self.run_pipeline)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setEnabled(False)
+        self.stop_button.clicked.connect(self.stop_pipeline)
+        buttons.addWidget(self.choose_folder_btn)
+        buttons.addWidget(self.run_button)
+        buttons.addWidget(self.stop_button)
+        layout.addLayout(buttons)
+
+        self.output_box = LogConsole("Pipeline output and per-stage timings will appear here...")
+        layout.addWidget(self.output_box)
+
+    def populate_stages(self):
+        folders = {os.path.basename(f): f for f in list_script_folders(self.scripts_dir)}
+        saved = self.settings.value("pipeline/stages", [], type=list)
+        ordered = [name for name in saved if name in folders]
+        ordered += [name for name in folders if name not in ordered]
+        for name in ordered:
+            item = QListWidgetItem(name)
+            item.setData(Qt.ItemDataRole.UserRole, folders[name])
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked if name in saved else Qt.CheckState.Unchecked)
+            self.stage_list.addItem(item)
+
+    def selected_stages(self):
+        items = [self.stage_list.item(i) for i in range(self.stage_list.count())]
+        return [item for item in items if item.checkState() == Qt.CheckState.Checked]
+
+    def choose_output_folder(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Output Folder", self.output_dir)
+        if folder:
+            self.output_dir = folder
+            self.settings.setValue("pipeline/output_dir", folder)
+            self.choose_folder_btn.setText(f"Output: {os.path.basename(folder)}")
+
+    def run_pipeline(self):
+        stages = self.selected_stages()
+        if not stages:
+            self.output_box.append("❌ Select at least one stage.\n")
+            return
+        if self.drop_area.scanning or not self.drop_area.dropped_files:
+            self.output_box.append("❌ Drop the input files for the first stage.\n")
+            return
+        self.settings.setValue("pipeline/stages", [item.text() for item in stages])
+
+        self.output_box.clear()
+        self.run_button.setEnabled(False)
+        self.stop_button.setEnabled(True)
+        self.runner = PipelineRunner(
+            [item.data(Qt.ItemDataRole.UserRole) for item in stages],
+            self.drop_area.dropped_files, self.output_dir, parent=self
+        )
+        self.runner.output_signal.connect(self.output_box.append)
+        self.runner.finished_signal.connect(self.pipeline_finished)
+        self.runner.start()
+
+    def stop_pipeline(self):
+        if self.runner:
+            self.runner.stop()
+
+    def pipeline_finished(self, success, message):
+        self.run_button.setEnabled(True)
+        self.stop_button.setEnabled(False)
+        self.output_box.append(f"{'✅' if success else '❌'} {message}\n")
+        if self.runner and self.runner.timings:
+            summary = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.runner.timings)
+            self.output_box.append(f"⏱️ Stage timings: {summary}\n")
+
+# ---------- Runner Daemon ----------
+# One long-lived runner per workstation: GUIs and scheduled tasks submit jobs
+# to it over a local socket (a named pipe on Windows) and share its job limit.
+# Only the user who started it can connect: the key is a random per-user file
+# and, on POSIX, the socket lives in a folder only that user can open.
+DAEMON_KEY_FILE = "runner.key"
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+def daemon_dir():
+    """Private per-user folder for the daemon key (and the socket on POSIX)"""
+    if sys.platform.startswith("win"):
+        path = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.expanduser("~"), "BifteKYS")
+        os.makedirs(path, exist_ok=True)
+        return path
+    import stat
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    path = os.path.join(base, f"BifteKYS_runner-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{path} is not a private folder of this user")
+    return path
+
+def daemon_authkey():
+    """RUNNER_DAEMON_KEY, else the user's key file (created 0600 on first use)"""
+    key = os.environ.get("RUNNER_DAEMON_KEY")
+    if key:
+        return key.encode()
+    folder = daemon_dir()
+    path = os.path.join(folder, DAEMON_KEY_FILE)
+    if not os.path.exists(path):
+        import secrets
+        fd, temp_path = tempfile.mkstemp(dir=folder)  # mkstemp files are 0600
+        with os.fdopen(fd, "w") as f:
+            f.write(secrets.token_hex(32))
+        if not move_no_clobber(temp_path, path):
+            os.remove(temp_path)  # the daemon or another client wrote it first
+    with open(path, "rb") as f:
+        return f.read().strip()
+
+def daemon_address():
+    address = os.environ.get("RUNNER_DAEMON_ADDRESS")
+    if address:
+        return address
+    if sys.platform.startswith("win"):
+        return r"\\.\pipe\BifteKYS_runner"
+    return os.path.join(daemon_dir(), "runner.sock")
+
+def send_message(conn, message):
+    """Messages are JSON, never pickles: recv() would unpickle anything it is sent"""
+    conn.send_bytes(json.dumps(message).encode("utf-8"))
+
+def recv_message(conn):
+    message = json.loads(conn.recv_bytes(MAX_MESSAGE_BYTES).decode("utf-8"))
+    if not isinstance(message, dict):
+        raise ValueError("daemon messages are JSON objects")
+    return message
+
+def connect_daemon():
+    """Connection to a running daemon, or None (then scripts run in-process)"""
+    from multiprocessing.connection import Client, AuthenticationError
+    try:
+        address = daemon_address()
+        if not sys.platform.startswith("win") and not os.path.exists(address):
+            return None
+        return Client(address, authkey=daemon_authkey())
+    except (OSError, EOFError, AuthenticationError):
+        return None
+
+class RunnerDaemon:
+    """Accept run requests from clients, run at most max_jobs scripts at once.
+
+    Request: {"action": "run", "script": <folder name>, "input_files": [...],
+    "env": {PARAM: value}, "output_dir": <staging folder>, "profile_path": None}
+    Replies: {"event": "output", "line": ...} ... then
+    {"event": "finished", "success": bool, "message": str}.
+    The client may send {"action": "stop"} while its job runs. Only the
+    script's declared parameters (and RESUME) are taken from "env".
+    """
+    def __init__(self, scripts_dir, max_jobs):
+        self.scripts_dir = scripts_dir
+        self.max_jobs = max_jobs
+        self.slots = threading.BoundedSemaphore(max_jobs)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.waiting = 0
+
+    def serve(self):
+        from multiprocessing.connection import Listener, AuthenticationError
+        address = daemon_address()
+        if connect_daemon() is not None:
+            print(f"❌ A runner daemon is already listening on {address}")
+            return 1
+        if not sys.platform.startswith("win") and os.path.lexists(address):
+            # Left over from a daemon that crashed; never remove someone else's file
+            import stat
+            info = os.lstat(address)
+            if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+                print(f"❌ {address} exists and is not this user's daemon socket, not removing it")
+                return 1
+            os.remove(address)
+        with Listener(address, authkey=daemon_authkey()) as listener:
+            print(f"🛰️ Runner daemon listening on {address} (max {self.max_jobs} concurrent jobs)")
+            try:
+                while True:
+                    try:
+                        conn = listener.accept()
+                    except (OSError, EOFError, AuthenticationError) as e:
+                        print(f"⚠️ Rejected connection: {e}")
+                        continue
+                    threading.Thread(target=self.handle_client, args=(conn,), daemon=True).start()
+            except KeyboardInterrupt:
+                print("🛑 Runner daemon stopped")
+        return 0
+
+    def handle_client(self, conn):
+        try:
+            request = recv_message(conn)
+            if request.get("action") == "status":
+                send_message(conn, {"event": "status", "running": self.running,
+                                    "waiting": self.waiting, "max_jobs": self.max_jobs})
+            elif request.get("action") == "run":
+                self.run_job(conn, request)
+        except (OSError, EOFError):
+            pass  # client went away
+        except ValueError as e:
+            print(f"⚠️ Rejected malformed request: {e}")
+        finally:
+            conn.close()
+
+    def resolve_script(self, name):
+        for folder in list_script_folders(self.scripts_dir):
+            if os.path.basename(folder) == name:
+                return folder, find_script_file(folder)
+        return None, None
+
+    def job_env(self, config, request):
+        """Script env for a request; raises ValueError for anything not allowed.
+
+        OUTPUT_DIR must be a staging folder, FINAL_OUTPUT_DIR and the
+        checkpoint folder are derived from it, and client env keys other
+        than the declared parameters (LD_PRELOAD, PYTHONPATH, ...) are refused.
+        """
+        output_dir = request.get("output_dir")
+        if (not isinstance(output_dir, str) or not os.path.isabs(output_dir) or os.path.islink(output_dir)
+                or not os.path.isdir(output_dir)
+                or os.path.basename(os.path.dirname(output_dir)) != STAGING_FOLDER):
+            raise ValueError(f"output_dir must be a run's staging folder, got {output_dir!r}")
+        final_output_dir = os.path.dirname(os.path.dirname(output_dir))
+
+        allowed = {name.upper() for name in config.get_parameters()}
+        if config.get_checkpointing():
+            allowed.add("RESUME")
+        client_env = request.get("env") or {}
+        if not isinstance(client_env, dict):
+            raise ValueError("env must be an object")
+        refused = sorted(str(key) for key in client_env if key not in allowed
+                         and key not in ("FINAL_OUTPUT_DIR", "CHECKPOINT_DIR"))
+        if refused:
+            raise ValueError(f"env keys not declared by the script: {', '.join(refused)}")
+
+        env = os.environ.copy()
+        env.update(default_parameter_env(config.get_parameters()))
+        env.update({key: str(value) for key, value in client_env.items() if key in allowed})
+        env["OUTPUT_DIR"] = output_dir
+        env["FINAL_OUTPUT_DIR"] = final_output_dir
+        if config.get_checkpointing() and "RESUME" in client_env:
+            env["CHECKPOINT_DIR"] = os.path.join(final_output_dir, ".checkpoints",
+                                                 os.path.basename(config.folder_path))
+
+        profile_path = request.get("profile_path")
+        if profile_path is not None and (not isinstance(profile_path, str) or not profile_path.endswith(".prof")
+                                         or os.path.dirname(profile_path) != final_output_dir):
+            raise ValueError("profile_path must be a .prof file in the output folder")
+        input_files = request.get("input_files") or []
+        if not isinstance(input_files, list) or not all(isinstance(path, str) for path in input_files):
+            raise ValueError("input_files must be a list of paths")
+        return env, input_files, profile_path
+
+    def run_job(self, conn, request):
+        folder, script_file = self.resolve_script(request.get("script", ""))
+        if not script_file:
+            send_message(conn, {"event": "finished", "success": False,
+                                "message": f"Runner daemon has no script '{request.get('script')}'"})
+            return
+
+        config = ScriptConfig(folder)
+        limits = config.get_resource_limits()
+        try:
+            env, input_files, profile_path = self.job_env(config, request)
+        except ValueError as e:
+            print(f"⚠️ Refused {request.get('script')}: {e}")
+            send_message(conn, {"event": "finished", "success": False, "message": f"Refused by the runner daemon: {e}"})
+            return
+        args, manifest_file = build_script_args(script_file, input_files, profile_path)
+
+        # The process is cleared (under the lock) once it has been reaped, so a late
+        # stop or disconnect never signals a process group id that may be reused
+        state = {"stopped": False, "process": None}
+        state_lock = threading.Lock()
+        def watch_client():
+            # A stop request, or the client disconnecting, stops the job
+            try:
+                while recv_message(conn).get("action") != "stop":
+                    pass
+            except (OSError, EOFError, ValueError):
+                pass
+            with state_lock:
+                state["stopped"] = True
+                process = state["process"]
+            if process:
+                terminate_process_tree(process)
+        threading.Thread(target=watch_client, daemon=True).start()
+
+        with self.lock:
+            self.waiting += 1
+        acquired = self.slots.acquire(blocking=False)
+        if not acquired:
+            send_message(conn, {"event": "output", "line": f"⏳ Waiting for a free slot ({self.running} jobs running)\n"})
+            while not state["stopped"] and not acquired:
+                acquired = self.slots.acquire(timeout=0.5)
+        with self.lock:
+            self.waiting -= 1
+        if not acquired:
+            send_message(conn, {"event": "finished", "success": False, "message": "Stopped by user"})
+            return
+
+        wall_clock_timer = None
+        timed_out = threading.Event()
+        with self.lock:
+            self.running += 1
+        try:
+            process = subprocess.Popen(
+                args, cwd=folder, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, errors="replace", bufsize=1, **process_group_kwargs(limits)
+            )
+            with state_lock:
+                state["process"] = None if state["stopped"] else process
+            if state["stopped"]:
+                terminate_process_tree(process)  # stop arrived while it was starting
+            wall_clock_limit = limits.get("wall_clock_limit", 0)
+            if wall_clock_limit:
+                def expire():
+                    timed_out.set()
+                    with state_lock:
+                        alive = state["process"]
+                    if alive:
+                        terminate_process_tree(alive)
+                wall_clock_timer = threading.Timer(wall_clock_limit, expire)
+                wall_clock_timer.daemon = True
+                wall_clock_timer.start()
+            print(f"▶️ {request['script']} started (pid {process.pid}, {self.running}/{self.max_jobs} slots)")
+
+            for line in iter(process.stdout.readline, ''):
+                send_message(conn, {"event": "output", "line": line})
+            process.stdout.close()
+            return_code = process.wait()
+            with state_lock:
+                state["process"] = None
+            if wall_clock_timer:
+                wall_clock_timer.cancel()
+            if state["stopped"]:
+                success, message = False, "Stopped by user"
+            else:
+                success, message = exit_result(return_code, timed_out.is_set(), wall_clock_limit)
+            print(f"{'✅' if success else '❌'} {request['script']}: {message}")
+            send_message(conn, {"event": "finished", "success": success, "message": message})
+        except (OSError, EOFError):
+            with state_lock:
+                process, state["process"] = state["process"], None
+            if process:
+                terminate_process_tree(process)
+        except Exception as e:
+            send_message(conn, {"event": "finished", "success": False, "message": f"Error running script: {str(e)}"})
+        finally:
+            if wall_clock_timer:
+                wall_clock_timer.cancel()
+            if manifest_file and os.path.exists(manifest_file):
+                os.remove(manifest_file)
+            with self.lock:
+                self.running -= 1
+            self.slots.release()
+
+class DaemonRunner(QThread):
+    """Thin client: a job run by the runner daemon, with the tabs' runner signals.
+
+    Only run() touches the connection; stop() just sets a flag that run()
+    turns into a stop request between polls.
+    """
+    output_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int)
+    finished_signal = pyqtSignal(bool, str)
+    poll_interval = 0.2
+
+    def __init__(self, conn, job):
+        super().__init__()
+        self.conn = conn
+        self.job = job
+        self.stop_requested = threading.Event()
+
+    def run(self):
+        stop_sent = False
+        try:
+            send_message(self.conn, dict(self.job, action="run"))
+            while True:
+                if self.stop_requested.is_set() and not stop_sent:
+                    send_message(self.conn, {"action": "stop"})
+                    stop_sent = True
+                if not self.conn.poll(self.poll_interval):
+                    continue
+                message = recv_message(self.conn)
+                if message.get("event") == "output":
+                    self.output_signal.emit(message["line"])
+                elif message.get("event") == "finished":
+                    self.finished_signal.emit(message["success"], message["message"])
+                    break
+        except (OSError, EOFError, ValueError):
+            self.finished_signal.emit(False, "Lost connection to the runner daemon")
+        finally:
+            self.conn.close()
+
+    def stop(self):
+        self.stop_requested.set()
+
+def submit_job(argv):
+    """Command line client for scheduled tasks: run one script on the daemon"""
+    import argparse
+    parser = argparse.ArgumentParser(prog="gui_runner.py --submit",
+                                     description="Run a script through the runner daemon")
+    parser.add_argument("--submit", metavar="SCRIPT", required=True, help="script folder name, e.g. leads")
+    parser.add_argument("input_files", nargs="*")
+    parser.add_argument("--output-dir", default=os.getcwd())
+    parser.add_argument("--param", action="append", default=[], metavar="NAME=VALUE")
+    options = parser.parse_args(argv)
+
+    conn = connect_daemon()
+    if conn is None:
+        print(f"❌ No runner daemon is listening on {daemon_address()}")
+        return 2
+    params = dict(param.split("=", 1) for param in options.param if "=" in param)
+    env = {name.upper(): value for name, value in params.items()}
+    output_dir = os.path.abspath(options.output_dir)
+    env["FINAL_OUTPUT_DIR"] = output_dir
+    staging_dir = create_staging_dir(output_dir, options.submit)
+    send_message(conn, {"action": "run", "script": options.submit,
+               "input_files": [os.path.abspath(f) for f in options.input_files],
+               "env": env, "output_dir": staging_dir, "profile_path": None})
+    success = False
+    try:
+        while True:
+            message = recv_message(conn)
+            if message.get("event") == "output":
+                print(message["line"], end="", flush=True)
+            elif message.get("event") == "finished":
+                success = message["success"]
+                if success:
+                    for line in publish_messages(publish_outputs(staging_dir, output_dir)):
+                        print(line)
+                print(f"{'✅' if success else '❌'} {message['message']}")
+                return 0 if success else 1
+    except (OSError, EOFError, ValueError):
+        print("❌ Lost connection to the runner daemon")
+        return 1
+    finally:
+        if not success:
+            discard_staging_dir(staging_dir)
+
+def run_daemon(argv):
+    import argparse
+    parser = argparse.ArgumentParser(prog="gui_runner.py --daemon",
+                                     description="Shared runner service for scripts/ jobs")
+    parser.add_argument("--daemon", action="store_true")
+    parser.add_argument("--max-jobs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="scripts allowed to run at the same time (default: half the CPU cores)")
+    parser.add_argument("--scripts-dir", default=resource_path("scripts"))
+    options = parser.parse_args(argv)
+    return RunnerDaemon(options.scripts_dir, options.max_jobs).serve()
+
 # ---------- Main Window ----------
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.settings = QSettings("BifteKYS", "ScriptRunner")
+        self.pipeline_dialog = None
         self.setWindowTitle("BifteKYS Script Runner GUI")
         self.resize(1200, 800)
         
@@ -683,13 +3162,20 @@ class MainWindow(QMainWindow):
                      padding: 6px; border-top: 1px solid #ccc; }
         """)
         main_layout.addWidget(footer)
+        startup_trace.mark("main window shell")
         
-        # Load tabs
-        self.load_tabs()
+        # Tabs are built after the window is shown, one per event loop turn
+        self.pending_tab_folders = []
+        self.loaded_tab_count = 0
+        self.tab_loader = QTimer(self)
+        self.tab_loader.setInterval(0)
+        self.tab_loader.timeout.connect(self.load_next_tab)
+        QTimer.singleShot(0, self.load_tabs)
         
-        # Apply saved theme
+        # Apply saved theme (before the tabs exist, so there is less to restyle)
         dark_mode = self.settings.value("dark_mode", False, type=bool)
         ThemeManager.apply_theme(QApplication.instance(), dark_mode)
+        startup_trace.mark("theme")
 
     def setup_toolbar(self):
         toolbar = QToolBar("Main Toolbar")
@@ -710,6 +3196,11 @@ class MainWindow(QMainWindow):
         settings_action.triggered.connect(self.show_settings)
         toolbar.addAction(settings_action)
         
+        # Pipeline action
+        pipeline_action = QAction("Pipeline", self)
+        pipeline_action.triggered.connect(self.show_pipeline)
+        toolbar.addAction(pipeline_action)
+        
         # Help action
         help_action = QAction("Help", self)
         help_action.triggered.connect(self.show_help)
@@ -792,6 +3283,12 @@ class MainWindow(QMainWindow):
         self.settings.setValue("backup_folder", self.backup_folder_edit.text())
         dialog.accept()
 
+    def show_pipeline(self):
+        if self.pipeline_dialog is None:
+            self.pipeline_dialog = PipelineDialog(self.scripts_dir, self)
+        self.pipeline_dialog.show()
+        self.pipeline_dialog.raise_()
+
     def show_help(self):
         help_text = """
         <h2>BifteKYS Script Runner</h2>
@@ -808,12 +3305,16 @@ class MainWindow(QMainWindow):
         
         <h3>Features:</h3>
         <ul>
-          <li>Real-time output display</li>
+          <li>Real-time output display, searchable and filterable by errors/warnings</li>
           <li>Dark/Light theme support</li>
           <li>Input file backup with timestamps</li>
           <li>Custom backup folder support</li>
           <li>Parameter configuration for scripts</li>
           <li>Multi-file support</li>
+          <li>Watch folder: auto-run when new input files arrive</li>
+          <li>"Profile this run": cProfile report of the slowest functions</li>
+          <li>Pipeline: chain scripts, passing data between stages as Arrow</li>
+          <li>Runner daemon: when one is running, runs are queued on it (shared job limit)</li>
         </ul>
         
         <p>For script-specific instructions, check the README section in each tab.</p>
@@ -851,22 +3352,25 @@ class MainWindow(QMainWindow):
             
         # Show loading indicator
         self.statusBar().showMessage("Loading scripts...")
-        QApplication.processEvents()
-        
-        added = 0
-        try:
-            entries = sorted(os.listdir(self.scripts_dir))
-        except FileNotFoundError:
-            entries = []
-            
-        for folder in entries:
-            folder_path = os.path.join(self.scripts_dir, folder)
-            if os.path.isdir(folder_path):
-                tab = ScriptTab(folder_path)
-                tab_name = folder.replace("_", " ").title()
-                self.tabs.addTab(tab, tab_name)
-                added += 1
-                
+        self.pending_tab_folders = list_script_folders(self.scripts_dir)
+        self.loaded_tab_count = 0
+        self.tab_loader.start()
+
+    def load_next_tab(self):
+        if not self.pending_tab_folders:
+            self.tab_loader.stop()
+            self.finish_loading_tabs()
+            return
+        folder_path = self.pending_tab_folders.pop(0)
+        folder = os.path.basename(folder_path)
+        tab = ScriptTab(folder_path)
+        tab_name = folder.replace("_", " ").title()
+        self.tabs.addTab(tab, tab_name)
+        self.loaded_tab_count += 1
+        startup_trace.mark(f"tab {tab_name}")
+
+    def finish_loading_tabs(self):
+        added = self.loaded_tab_count
         if added == 0:
             placeholder = QTextEdit(
                 "⚠ No script folders found inside /scripts.\n\n"
@@ -880,8 +3384,26 @@ class MainWindow(QMainWindow):
             self.tabs.addTab(placeholder, "No Scripts Found")
             
         self.statusBar().showMessage(f"Loaded {added} scripts")
+        if startup_trace.enabled:
+            startup_trace.mark("all tabs loaded")
+            startup_trace.log(f"trace written to {startup_trace.log_path}")
+            startup_trace.enabled = False  # later refreshes are not start-up
 
 def main():
+    if "--daemon" in sys.argv:
+        sys.exit(run_daemon(sys.argv[1:]))
+    if "--submit" in sys.argv:
+        sys.exit(submit_job(sys.argv[1:]))
+    # Also settable through the environment, for EXE shortcuts
+    if "--startup-trace" in sys.argv or os.environ.get("STARTUP_TRACE") == "1":
+        if "--startup-trace" in sys.argv:
+            sys.argv.remove("--startup-trace")
+        startup_trace.enable()
+    startup_trace.mark("module imports")
+    ui_monitor_enabled = "--monitor-ui" in sys.argv or os.environ.get("MONITOR_UI") == "1"
+    if "--monitor-ui" in sys.argv:
+        sys.argv.remove("--monitor-ui")
+
     app = QApplication(sys.argv)
     app.setApplicationName("BifteKYS Script Runner")
     app.setApplicationVersion("2.0")
@@ -890,9 +3412,17 @@ def main():
     # Set default font
     font = QFont("Segoe UI", 10)
     app.setFont(font)
+    startup_trace.mark("QApplication")
     
     win = MainWindow()
     win.show()
+    startup_trace.mark("window shown")
+    if ui_monitor_enabled:
+        win.ui_monitor = EventLoopMonitor(parent=win)
+        win.ui_monitor.start()
+        app.aboutToQuit.connect(lambda: win.ui_monitor.log(f"summary: {win.ui_monitor.stats()}"))
+    # The first event loop turn paints the window, then the tabs fill in
+    QTimer.singleShot(0, lambda: startup_trace.mark("first event loop turn"))
     sys.exit(app.exec())
 
 if __name__ == "__main__":
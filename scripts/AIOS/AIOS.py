@@ -3,10 +3,60 @@ import numpy as np
 import re
 import os
 import sys
+import sqlite3
+import tempfile
+import zlib
+import unicodedata
+from contextlib import closing
+from difflib import SequenceMatcher
+from datetime import datetime
 from pathlib import Path
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import PatternFill
 
+# Shared helpers live one level up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from script_helpers import (resolve_input_files, optimize_frame, log_memory, BatchCheckpoint, final_output_dir,
+                            iter_xlsx_chunks)
+
+# Column positions read from each kind of export and the names given to them
+FILE_LAYOUTS = {
+    'ALL': ([11, 12, 14, 17], ['Επώνυμο', 'Όνομα', 'Αριθμός Αίτησης', 'Κινητό']),
+    'AIOS_DP': ([0, 10, 11], ['Αριθμός Αίτησης', 'Όνομα', 'Επώνυμο']),
+    'AIOS_MOB': ([1, 5], ['Αριθμός Αίτησης', 'Ονοματεπώνυμο']),
+    'AIOS_ONE_NET': ([1, 6], ['Αριθμός Αίτησης', 'Ονοματεπώνυμο']),
+}
+
+ACTIVE = 'ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ'
+NOT_ACTIVE = 'ΜΗ ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ'
+
+# Second pass for unmatched rows: name similarity first, application number second
+PROBABLE_MATCH_COLUMN = 'Πιθανή αντιστοίχιση'
+FUZZY_MIN_SCORE = 0.85
+FUZZY_NAME_WEIGHT = 0.75
+# Lowest name score that can still reach FUZZY_MIN_SCORE with a perfect number score
+FUZZY_MIN_NAME_SCORE = (FUZZY_MIN_SCORE - (1 - FUZZY_NAME_WEIGHT)) / FUZZY_NAME_WEIGHT
+# Name-pair scores are cached; the cache is emptied past this size (streaming runs)
+NAME_SCORE_CACHE_SIZE = 1_000_000
+
+# ALL workbooks bigger than this switch to streaming mode automatically
+STREAMING_THRESHOLD_MB = 100
+STREAMING_CHUNK_ROWS = 50_000
+
+def detect_file_role(file_name):
+    """Return the FILE_LAYOUTS key for a file name, or None"""
+    file_name = file_name.lower()
+    if 'all' in file_name:
+        return 'ALL'
+    if 'aios_dp' in file_name or 'dp_aios' in file_name:
+        return 'AIOS_DP'
+    if 'aios_mob' in file_name or 'mob_aios' in file_name:
+        return 'AIOS_MOB'
+    if 'aios_one' in file_name or 'one_aios' in file_name or 'one_net' in file_name:
+        return 'AIOS_ONE_NET'
+    return None
+
 def clean_application_number(num):
     """Standardize application number format (1-* or VOD*)"""
     if pd.isna(num) or num is None:
@@ -78,6 +128,113 @@ def clean_duplicate_values(value):
     
     return value_str
 
+# ---------- Fuzzy name matching ----------
+# Latin letters typed instead of their Greek look-alikes (after upper-casing)
+LATIN_TO_GREEK = str.maketrans("ABEZHIKMNOPTYX", "ΑΒΕΖΗΙΚΜΝΟΡΤΥΧ")
+
+def normalize_name_tokens(*parts):
+    """Upper-case Greek name tokens without accents, Latin look-alikes mapped to Greek"""
+    tokens = []
+    for part in parts:
+        if part is None or pd.isna(part):
+            continue
+        text = unicodedata.normalize('NFD', str(part).upper())
+        text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+        text = text.translate(LATIN_TO_GREEK)
+        tokens.extend(re.findall(r'[^\W\d_]+', text))
+    return tokens
+
+def blocking_keys(tokens):
+    """(3-letter prefix of one token, initial of another): word order does not matter"""
+    return {(a[:3], b[:1]) for i, a in enumerate(tokens) for j, b in enumerate(tokens) if i != j}
+
+def digits_only(app_number):
+    return re.sub(r'\D', '', str(app_number))
+
+def fuzzy_matching_enabled():
+    return os.environ.get('FUZZY_MATCHING', '1') == '1'
+
+def aios_display_name(*parts):
+    return ' '.join(str(part) for part in parts if part is not None and not pd.isna(part))
+
+def build_unmatched_pool(aios_frames, all_numbers):
+    """AIOS records whose application number matched nothing in ALL, indexed by blocking key"""
+    pool = []
+    for frame in aios_frames:
+        if frame is None:
+            continue
+        name_columns = (['Όνομα', 'Επώνυμο'] if 'Επώνυμο' in frame.columns else ['Ονοματεπώνυμο'])
+        for row in frame.itertuples(index=False):
+            values = dict(zip(frame.columns, row))
+            app_number = clean_application_number(values['Αριθμός Αίτησης'])
+            if not app_number or app_number in all_numbers:
+                continue
+            pool.append((app_number, aios_display_name(*(values[c] for c in name_columns))))
+    return index_pool(pool)
+
+def index_pool(records):
+    """(app number, display name) records -> pool of (app, tokens, display) and its blocking index"""
+    pool = []
+    seen = set()
+    for app_number, display in records:
+        tokens = normalize_name_tokens(display)
+        if len(tokens) >= 2 and app_number not in seen:
+            seen.add(app_number)
+            pool.append((app_number, tokens, display))
+    index = {}
+    for position, (_app, tokens, _display) in enumerate(pool):
+        for key in blocking_keys(tokens):
+            index.setdefault(key, []).append(position)
+    return pool, index
+
+def find_probable_matches(unmatched_rows, pool, index):
+    """
+    Score unmatched ALL rows, (key, surname, name, app number) tuples, against
+    pool candidates that share a blocking key.
+    Each AIOS record is given to at most one row, best scores first.
+    Returns {row key: "app number (name, score%)"}.
+    """
+    candidates = []
+    name_scores = {}  # the same name pairs come up again and again within a block
+    pool_keys = [' '.join(sorted(tokens)) for _app, tokens, _display in pool]
+    for row_index, surname, name, app_number in unmatched_rows:
+        tokens = normalize_name_tokens(name, surname)
+        if len(tokens) < 2:
+            continue
+        name_key = ' '.join(sorted(tokens))
+        positions = set()
+        for key in blocking_keys(tokens):
+            positions.update(index.get(key, ()))
+        for position in positions:
+            pair = (name_key, pool_keys[position])
+            name_score = name_scores.get(pair)
+            if name_score is None:
+                matcher = SequenceMatcher(None, *pair)
+                name_score = matcher.ratio() if matcher.quick_ratio() >= FUZZY_MIN_NAME_SCORE else 0.0
+                if len(name_scores) >= NAME_SCORE_CACHE_SIZE:
+                    name_scores.clear()
+                name_scores[pair] = name_score
+            if name_score < FUZZY_MIN_NAME_SCORE:
+                continue
+            pool_app = pool[position][0]
+            number_score = SequenceMatcher(None, digits_only(app_number), digits_only(pool_app)).ratio()
+            score = FUZZY_NAME_WEIGHT * name_score + (1 - FUZZY_NAME_WEIGHT) * number_score
+            if score >= FUZZY_MIN_SCORE:
+                candidates.append((score, row_index, position))
+
+    matches = {}
+    used = set()
+    # Ties (common names) go to the earlier row and the lower application number,
+    # so every mode hands out the same matches whatever order it reads the pool in
+    candidates.sort(key=lambda c: (-c[0], c[1], pool[c[2]][0]))
+    for score, row_index, position in candidates:
+        if row_index in matches or position in used:
+            continue
+        used.add(position)
+        pool_app, _tokens, display = pool[position]
+        matches[row_index] = f"{pool_app} ({display}, {score:.0%})"
+    return matches
+
 def process_files(input_files, output_dir):
     """
     Main function to process Excel files and generate result.xlsx
@@ -89,38 +246,36 @@ def process_files(input_files, output_dir):
     
     # Αποθήκευση όλων των αριθμών αιτήσεων από AIOS αρχεία
     aios_app_numbers = set()
+    # Files read in a stopped/failed run are taken from its checkpoint
+    checkpoint = BatchCheckpoint.from_env()
     
     for file_path in input_files:
         file_name = os.path.basename(file_path).lower()
+        role = detect_file_role(file_name)
+        if role is None:
+            continue
+        columns, names = FILE_LAYOUTS[role]
         
         try:
-            if 'all' in file_name:
-                df = pd.read_excel(file_path)
-                all_df = df.iloc[:, [11, 12, 14, 17]].copy()
-                all_df.columns = ['Επώνυμο', 'Όνομα', 'Αριθμός Αίτησης', 'Κινητό']
-                print(f"Processed ALL file: {file_name}")
-                
-            elif 'aios_dp' in file_name or 'dp_aios' in file_name:
-                df = pd.read_excel(file_path)
-                aios_dp_df = df.iloc[:, [0, 10, 11]].copy()
-                aios_dp_df.columns = ['Αριθμός Αίτησης', 'Όνομα', 'Επώνυμο']
+            frame = checkpoint.load(file_path)
+            if frame is None:
+                # Only the columns we use (positions are ascending in FILE_LAYOUTS)
+                frame = pd.read_excel(file_path, usecols=columns)
+                frame.columns = names
+                checkpoint.save(file_path, frame)
+            log_memory(f"read {role}", frame)
+            if role == 'ALL':
+                all_df = frame
+            else:
+                if role == 'AIOS_DP':
+                    aios_dp_df = frame
+                elif role == 'AIOS_MOB':
+                    aios_mob_df = frame
+                else:
+                    aios_one_net_df = frame
                 # Προσθήκη αριθμών αιτήσεων από AIOS αρχεία
-                aios_app_numbers.update(aios_dp_df['Αριθμός Αίτησης'].apply(clean_application_number))
-                print(f"Processed AIOS_DP file: {file_name}")
-                
-            elif 'aios_mob' in file_name or 'mob_aios' in file_name:
-                df = pd.read_excel(file_path)
-                aios_mob_df = df.iloc[:, [1, 5]].copy()
-                aios_mob_df.columns = ['Αριθμός Αίτησης', 'Ονοματεπώνυμο']
-                aios_app_numbers.update(aios_mob_df['Αριθμός Αίτησης'].apply(clean_application_number))
-                print(f"Processed AIOS_MOB file: {file_name}")
-                
-            elif 'aios_one' in file_name or 'one_aios' in file_name or 'one_net' in file_name:
-                df = pd.read_excel(file_path)
-                aios_one_net_df = df.iloc[:, [1, 6]].copy()
-                aios_one_net_df.columns = ['Αριθμός Αίτησης', 'Ονοματεπώνυμο']
-                aios_app_numbers.update(aios_one_net_df['Αριθμός Αίτησης'].apply(clean_application_number))
-                print(f"Processed AIOS_ONE_NET file: {file_name}")
+                aios_app_numbers.update(frame['Αριθμός Αίτησης'].apply(clean_application_number))
+            print(f"Processed {role} file: {file_name}")
                 
         except Exception as e:
             print(f"Error processing {file_name}: {str(e)}")
@@ -137,14 +292,28 @@ def process_files(input_files, output_dir):
     
     # Προσθήκη στήλης κατάστασης
     all_df['Κατάσταση'] = all_df['Αριθμός Αίτησης'].apply(
-        lambda x: 'ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ' if x in aios_app_numbers else 'ΜΗ ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ'
+        lambda x: ACTIVE if x in aios_app_numbers else NOT_ACTIVE
     )
     
+    # Δεύτερο πέρασμα: πιθανές αντιστοιχίσεις ονομάτων για τις μη ενεργοποιημένες
+    if fuzzy_matching_enabled():
+        pool, index = build_unmatched_pool([aios_dp_df, aios_mob_df, aios_one_net_df],
+                                           set(all_df['Αριθμός Αίτησης']))
+        unmatched = all_df[all_df['Κατάσταση'] == NOT_ACTIVE]
+        unmatched_rows = zip(unmatched.index, unmatched['Επώνυμο'], unmatched['Όνομα'],
+                             unmatched['Αριθμός Αίτησης'])
+        matches = find_probable_matches(unmatched_rows, pool, index) if pool else {}
+        all_df[PROBABLE_MATCH_COLUMN] = pd.Series(matches, dtype=object).reindex(all_df.index).fillna('')
+        print(f"🔎 Πιθανές αντιστοιχίσεις με βάση το όνομα: {len(matches)} "
+              f"(από {len(pool)} αιτήσεις AIOS χωρίς αντιστοίχιση)")
+    
     # Αφαίρεση διπλοεγγραφών
-    result_df = all_df.drop_duplicates(subset=['Αριθμός Αίτησης'])
+    result_df = optimize_frame(all_df.drop_duplicates(subset=['Αριθμός Αίτησης']))
+    del all_df, aios_dp_df, aios_mob_df, aios_one_net_df
+    log_memory("result", result_df)
     
     # Ταξινόμηση: πρώτα οι ΜΗ ΕΝΕΡΓΟΠΟΙΗΜΕΝΕΣ, μετά οι ΕΝΕΡΓΟΠΟΙΗΜΕΝΕΣ
-    result_df = result_df.sort_values(by='Κατάσταση', ascending=False)
+    result_df = result_df.sort_values(by='Κατάσταση', ascending=False, kind='stable')
     
     # Αποθήκευση αποτελεσμάτων χωρίς μορφοποίηση πρώτα
     output_path = os.path.join(output_dir, 'result.xlsx')
@@ -163,6 +332,7 @@ def process_files(input_files, output_dir):
     
     # Προσθήκη επικεφαλίδων
     headers = list(formatted_df.columns)
+    status_column = headers.index('Κατάσταση') + 1
     for col_idx, header in enumerate(headers, 1):
         ws.cell(row=1, column=col_idx, value=header)
     
@@ -172,8 +342,8 @@ def process_files(input_files, output_dir):
             ws.cell(row=row_idx+2, column=col_idx, value=value)
         
         # Εφαρμογή χρωματικής μορφοποίησης στη στήλη "Κατάσταση"
-        status_cell = ws.cell(row=row_idx+2, column=len(headers))
-        if row_data['Κατάσταση'] == 'ΜΗ ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ':
+        status_cell = ws.cell(row=row_idx+2, column=status_column)
+        if row_data['Κατάσταση'] == NOT_ACTIVE:
             status_cell.fill = red_fill
         else:
             status_cell.fill = green_fill
@@ -184,8 +354,8 @@ def process_files(input_files, output_dir):
     
     # Εμφάνιση στατιστικών
     total_applications = len(result_df)
-    energized = len(result_df[result_df['Κατάσταση'] == 'ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ'])
-    not_energized = len(result_df[result_df['Κατάσταση'] == 'ΜΗ ΕΝΕΡΓΟΠΟΙΗΜΕΝΗ'])
+    energized = len(result_df[result_df['Κατάσταση'] == ACTIVE])
+    not_energized = len(result_df[result_df['Κατάσταση'] == NOT_ACTIVE])
     
     print(f"\n📋Συνολικές αιτήσεις: {total_applications}")
     print(f"✅Ενεργοποιημένες: {energized}")
@@ -193,8 +363,328 @@ def process_files(input_files, output_dir):
     
     return True
 
+def create_streaming_tables(conn):
+    conn.execute("CREATE TABLE IF NOT EXISTS aios_ids (app TEXT PRIMARY KEY, run_id INTEGER) WITHOUT ROWID")
+    # Names of the AIOS records, for the probable-match pass
+    conn.execute("CREATE TABLE IF NOT EXISTS aios_names (app TEXT PRIMARY KEY, display TEXT) WITHOUT ROWID")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS all_rows (
+            seq INTEGER PRIMARY KEY,
+            surname TEXT, name TEXT, app TEXT UNIQUE, mobile TEXT
+        )""")
+
+def index_aios_file(conn, file_path, role, run_id=0):
+    """Add the cleaned application numbers (and names) of one AIOS file to the on-disk index"""
+    count = 0
+    for chunk in iter_xlsx_chunks(file_path, FILE_LAYOUTS[role][0], STREAMING_CHUNK_ROWS):
+        # The application number is the first column of every AIOS layout
+        records = [(clean_application_number(row[0]), aios_display_name(*row[1:])) for row in chunk]
+        conn.executemany("INSERT OR IGNORE INTO aios_ids (app, run_id) VALUES (?, ?)",
+                         ((app, run_id) for app, _display in records))
+        conn.executemany("INSERT OR IGNORE INTO aios_names (app, display) VALUES (?, ?)", records)
+        count += len(chunk)
+    conn.commit()
+    return count
+
+def load_all_file(conn, file_path):
+    """Stream the ALL file into SQLite; the first row per application number wins"""
+    count = 0
+    for chunk in iter_xlsx_chunks(file_path, FILE_LAYOUTS['ALL'][0], STREAMING_CHUNK_ROWS):
+        conn.executemany(
+            "INSERT OR IGNORE INTO all_rows (surname, name, app, mobile) VALUES (?, ?, ?, ?)",
+            ((surname, name, clean_application_number(app), extract_mobile_number(mobile))
+             for surname, name, app, mobile in chunk)
+        )
+        count += len(chunk)
+        print(f"   ... {count} ALL rows read")
+    conn.commit()
+    return count
+
+def streaming_probable_matches(conn, pool_query, unmatched_query, unmatched_params=()):
+    """
+    Probable-match pass of the on-disk modes, same scoring as process_files.
+    pool_query gives (app, display) of AIOS records missing from ALL,
+    unmatched_query (seq, surname, name, app) of the not activated ALL rows.
+    Returns {seq: text}, or None when fuzzy matching is turned off.
+    """
+    if not fuzzy_matching_enabled():
+        return None
+    pool, index = index_pool(conn.execute(pool_query))
+    matches = find_probable_matches(conn.execute(unmatched_query, unmatched_params), pool, index) if pool else {}
+    print(f"🔎 Πιθανές αντιστοιχίσεις με βάση το όνομα: {len(matches)} "
+          f"(από {len(pool)} αιτήσεις AIOS χωρίς αντιστοίχιση)")
+    return matches
+
+def write_streaming_result(rows, output_path, matches=None):
+    """
+    Write result.xlsx row by row (write-only workbook) from
+    (seq, surname, name, app, mobile, active); the columns are the same as
+    process_files writes, including the probable matches unless turned off.
+    """
+    red_fill = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+    green_fill = PatternFill(start_color="00FF00", end_color="00FF00", fill_type="solid")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(FILE_LAYOUTS['ALL'][1] + ['Κατάσταση'] + ([PROBABLE_MATCH_COLUMN] if matches is not None else []))
+
+    counts = {ACTIVE: 0, NOT_ACTIVE: 0}
+    for seq, surname, name, app, mobile, active in rows:
+        status = ACTIVE if active else NOT_ACTIVE
+        counts[status] += 1
+        status_cell = WriteOnlyCell(ws, value=status)
+        status_cell.fill = green_fill if active else red_fill
+        row = [surname, name, app, mobile, status_cell]
+        if matches is not None:
+            row.append(matches.get(seq, ''))
+        ws.append(row)
+    wb.save(output_path)
+    return counts
+
+def process_files_streaming(input_files, output_dir):
+    """
+    Out-of-core variant of process_files for ALL exports larger than RAM:
+    workbooks are streamed in row chunks (shared strings looked up on disk)
+    and the matching runs in a temporary SQLite database. Peak memory is
+    the chunk plus the AIOS records left without a match in ALL.
+    """
+    roles = [(file_path, detect_file_role(os.path.basename(file_path))) for file_path in input_files]
+    all_files = [file_path for file_path, role in roles if role == 'ALL']
+    if not all_files:
+        print("No ALL file found!")
+        return False
+
+    # The connection closes before the folder is removed, also on errors (Windows cannot
+    # delete an open database file and the real error would be lost)
+    with tempfile.TemporaryDirectory(prefix="aios_stream_") as tmp_dir, \
+            closing(sqlite3.connect(os.path.join(tmp_dir, "aios_stream.sqlite"))) as conn:
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        create_streaming_tables(conn)
+
+        for file_path, role in roles:
+            if role is None or role == 'ALL':
+                continue
+            try:
+                count = index_aios_file(conn, file_path, role)
+                print(f"Indexed {role} file: {os.path.basename(file_path)} ({count} rows)")
+            except Exception as e:
+                print(f"Error processing {os.path.basename(file_path)}: {str(e)}")
+
+        # Όπως και στο process_files, χρησιμοποιείται το τελευταίο αρχείο ALL
+        count = load_all_file(conn, all_files[-1])
+        print(f"Processed ALL file: {os.path.basename(all_files[-1])} ({count} rows)")
+
+        matches = streaming_probable_matches(conn, """
+            SELECT n.app, n.display FROM aios_names n
+            WHERE NOT EXISTS (SELECT 1 FROM all_rows a WHERE a.app = n.app)
+        """, """
+            SELECT a.seq, a.surname, a.name, a.app FROM all_rows a
+            WHERE NOT EXISTS (SELECT 1 FROM aios_ids i WHERE i.app = a.app)
+        """)
+
+        output_path = os.path.join(output_dir, 'result.xlsx')
+        rows = conn.execute("""
+            SELECT a.seq, a.surname, a.name, a.app, a.mobile, i.app IS NOT NULL AS active
+            FROM all_rows a LEFT JOIN aios_ids i ON i.app = a.app
+            ORDER BY active, a.seq
+        """)
+        counts = write_streaming_result(rows, output_path, matches)
+
+    print(f"Final results saved to: {output_path}")
+    print(f"\n📋Συνολικές αιτήσεις: {counts[ACTIVE] + counts[NOT_ACTIVE]}")
+    print(f"✅Ενεργοποιημένες: {counts[ACTIVE]}")
+    print(f"❌Μη ενεργοποιημένες: {counts[NOT_ACTIVE]}")
+    return True
+
+STATE_FILE_NAME = 'aios_state.sqlite'
+
+def open_state_store(state_dir):
+    """
+    Persistent reconciliation state: every application seen in ALL with its
+    status and first activation time, the AIOS index and the input files
+    already processed (so unchanged files are skipped entirely).
+    """
+    conn = sqlite3.connect(os.path.join(state_dir, STATE_FILE_NAME))
+    create_streaming_tables(conn)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS runs (
+            run_id INTEGER PRIMARY KEY, started TEXT
+        );
+        CREATE TABLE IF NOT EXISTS input_files (
+            path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, run_id INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS applications (
+            app TEXT PRIMARY KEY,
+            surname TEXT, name TEXT, mobile TEXT,
+            row_hash INTEGER,
+            status TEXT,
+            first_activated TEXT,
+            seq INTEGER,
+            last_seen_run INTEGER,
+            changed_run INTEGER,
+            activated_run INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS applications_status ON applications (status);
+        CREATE INDEX IF NOT EXISTS applications_changed ON applications (changed_run);
+        CREATE INDEX IF NOT EXISTS applications_activated ON applications (activated_run);
+    """)
+    return conn
+
+def file_unchanged(conn, file_path):
+    stat = os.stat(file_path)
+    row = conn.execute("SELECT size, mtime_ns FROM input_files WHERE path = ?",
+                       (os.path.abspath(file_path),)).fetchone()
+    return row == (stat.st_size, stat.st_mtime_ns)
+
+def remember_file(conn, file_path, run_id):
+    stat = os.stat(file_path)
+    conn.execute("INSERT OR REPLACE INTO input_files VALUES (?, ?, ?, ?)",
+                 (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, run_id))
+
+def row_hash(surname, name, app, mobile):
+    return zlib.crc32("\x1f".join(str(v) for v in (surname, name, app, mobile)).encode('utf-8'))
+
+def upsert_all_file(conn, file_path, run_id):
+    """
+    Insert new applications and update changed ones; returns (rows read, new/changed).
+    The ALL workbook is still read in full (xlsx has no way to seek to
+    appended rows), but only new/changed rows get changed_run = run_id and
+    only those are re-matched afterwards.
+    """
+    next_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM applications").fetchone()[0]
+    count = 0
+    for chunk in iter_xlsx_chunks(file_path, FILE_LAYOUTS['ALL'][0], STREAMING_CHUNK_ROWS):
+        rows = []
+        for surname, name, app, mobile in chunk:
+            app = clean_application_number(app)
+            mobile = extract_mobile_number(mobile)
+            rows.append((app, surname, name, mobile, row_hash(surname, name, app, mobile),
+                         NOT_ACTIVE, next_seq + count + len(rows), run_id, run_id))
+        # Every row seen is stamped with this run, so a later duplicate of an
+        # app already touched in this run is skipped: first occurrence wins
+        conn.executemany("""
+            INSERT INTO applications
+                (app, surname, name, mobile, row_hash, status, seq, last_seen_run, changed_run)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (app) DO UPDATE SET
+                surname = excluded.surname, name = excluded.name, mobile = excluded.mobile,
+                row_hash = excluded.row_hash, last_seen_run = excluded.last_seen_run,
+                changed_run = CASE WHEN applications.row_hash != excluded.row_hash
+                                   THEN excluded.changed_run ELSE applications.changed_run END
+            WHERE applications.last_seen_run IS NOT excluded.last_seen_run
+        """, rows)
+        count += len(chunk)
+        print(f"   ... {count} ALL rows read")
+    conn.commit()
+    changed = conn.execute("SELECT COUNT(*) FROM applications WHERE changed_run = ?",
+                           (run_id,)).fetchone()[0]
+    return count, changed
+
+def mark_new_activations(conn, run_id, activated_at):
+    """Only applications new/changed in this run or AIOS ids new in this run can change status"""
+    cursor = conn.execute("""
+        UPDATE applications SET status = ?, first_activated = ?, activated_run = ?
+        WHERE status != ?
+          AND app IN (SELECT app FROM aios_ids)
+          AND (changed_run = ? OR app IN (SELECT app FROM aios_ids WHERE run_id = ?))
+    """, (ACTIVE, activated_at, run_id, ACTIVE, run_id, run_id))
+    conn.commit()
+    return cursor.rowcount
+
+def write_delta_report(conn, run_id, output_path):
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(FILE_LAYOUTS['ALL'][1] + ['Ενεργοποίηση'])
+    rows = conn.execute("""
+        SELECT surname, name, app, mobile, first_activated FROM applications
+        WHERE activated_run = ? ORDER BY seq
+    """, (run_id,))
+    for row in rows:
+        ws.append(list(row))
+    wb.save(output_path)
+
+def process_files_incremental(input_files, output_dir, state_dir):
+    """
+    Incremental reconciliation against the persisted state in state_dir:
+    unchanged input files are skipped, only new/changed ALL rows are
+    written, and only those (or newly seen AIOS ids) are re-matched.
+    Writes the full result.xlsx plus activated_delta.xlsx for this run.
+    """
+    roles = [(file_path, detect_file_role(os.path.basename(file_path))) for file_path in input_files]
+    all_files = [file_path for file_path, role in roles if role == 'ALL']
+
+    conn = open_state_store(state_dir)
+    started = datetime.now().isoformat(timespec='seconds')
+    run_id = conn.execute("INSERT INTO runs (started) VALUES (?)", (started,)).lastrowid
+    print(f"State store: {os.path.join(state_dir, STATE_FILE_NAME)} (run {run_id})")
+
+    for file_path, role in roles:
+        if role is None or role == 'ALL':
+            continue
+        file_name = os.path.basename(file_path)
+        if file_unchanged(conn, file_path):
+            print(f"Skipped unchanged {role} file: {file_name}")
+            continue
+        try:
+            new_ids_query = "SELECT COUNT(*) FROM aios_ids WHERE run_id = ?"
+            before = conn.execute(new_ids_query, (run_id,)).fetchone()[0]
+            count = index_aios_file(conn, file_path, role, run_id)
+            new_ids = conn.execute(new_ids_query, (run_id,)).fetchone()[0] - before
+            remember_file(conn, file_path, run_id)
+            print(f"Indexed {role} file: {file_name} ({count} rows, {new_ids} new)")
+        except Exception as e:
+            print(f"Error processing {file_name}: {str(e)}")
+
+    if all_files:
+        all_file = all_files[-1]
+        if file_unchanged(conn, all_file):
+            print(f"Skipped unchanged ALL file: {os.path.basename(all_file)}")
+        else:
+            count, changed = upsert_all_file(conn, all_file, run_id)
+            remember_file(conn, all_file, run_id)
+            print(f"Processed ALL file: {os.path.basename(all_file)} ({count} rows, {changed} new/changed)")
+    elif conn.execute("SELECT COUNT(*) FROM applications").fetchone()[0] == 0:
+        print("No ALL file found!")
+        conn.close()
+        return False
+
+    activated = mark_new_activations(conn, run_id, started)
+    conn.commit()
+
+    matches = streaming_probable_matches(conn, """
+        SELECT n.app, n.display FROM aios_names n
+        WHERE NOT EXISTS (SELECT 1 FROM applications a WHERE a.app = n.app)
+    """, "SELECT seq, surname, name, app FROM applications WHERE status = ?", (NOT_ACTIVE,))
+
+    output_path = os.path.join(output_dir, 'result.xlsx')
+    rows = conn.execute("""
+        SELECT seq, surname, name, app, mobile, status = ? FROM applications
+        ORDER BY status = ?, seq
+    """, (ACTIVE, ACTIVE))
+    counts = write_streaming_result(rows, output_path, matches)
+    delta_path = os.path.join(output_dir, 'activated_delta.xlsx')
+    write_delta_report(conn, run_id, delta_path)
+    conn.close()
+
+    print(f"Final results saved to: {output_path}")
+    print(f"Newly activated applications saved to: {delta_path}")
+    print(f"\n📋Συνολικές αιτήσεις: {counts[ACTIVE] + counts[NOT_ACTIVE]}")
+    print(f"✅Ενεργοποιημένες: {counts[ACTIVE]} (νέες σε αυτή την εκτέλεση: {activated})")
+    print(f"❌Μη ενεργοποιημένες: {counts[NOT_ACTIVE]}")
+    return True
+
+def use_streaming_mode(input_files):
+    if os.environ.get('STREAMING_MODE') == '1':
+        return True
+    for file_path in input_files:
+        if detect_file_role(os.path.basename(file_path)) == 'ALL' and os.path.exists(file_path):
+            if os.path.getsize(file_path) > STREAMING_THRESHOLD_MB * 1024 * 1024:
+                return True
+    return False
+
 def main():
-    input_files = sys.argv[1:]
+    input_files = resolve_input_files()
     output_dir = os.environ.get('OUTPUT_DIR', os.getcwd())
     
     if not input_files:
@@ -204,7 +694,15 @@ def main():
     print(f"Processing {len(input_files)} files...")
     print(f"Output directory: {output_dir}")
     
-    success = process_files(input_files, output_dir)
+    if os.environ.get('INCREMENTAL_MODE') == '1':
+        state_dir = os.environ.get('AIOS_STATE_DIR') or final_output_dir()
+        print("Incremental mode: only new or changed rows are reconciled")
+        success = process_files_incremental(input_files, output_dir, state_dir)
+    elif use_streaming_mode(input_files):
+        print("Streaming mode: reading ALL in chunks with an on-disk index")
+        success = process_files_streaming(input_files, output_dir)
+    else:
+        success = process_files(input_files, output_dir)
     
     if success:
         print("Processing completed successfully!")
@@ -3,90 +3,274 @@ import matplotlib.pyplot as plt
 import openpyxl
 import zipfile
 import os
+import re
 import sys
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 
-# ✅ Accept file argument (drag & drop support)
-if len(sys.argv) > 1:
-    csv_file = sys.argv[1]
-else:
-    csv_file = "agent.csv"  # fallback for manual runs
-
-# ✅ Output folder from GUI or fallback to current directory
-output_dir = os.environ.get("OUTPUT_DIR", ".")
-print(f"📁 Output folder set to: {output_dir}\n")
-
-# 🔎 Read file line by line to find header row
-with open(csv_file, 'r', encoding='utf-8') as f:
-    lines = f.readlines()
-
-header_index = None
-for i, line in enumerate(lines):
-    if 'CALLS' in line and 'TALK TIME' in line:
-        header_index = i
-        break
-
-# ✅ Load data into DataFrame
-df = pd.read_csv(csv_file, skiprows=header_index, encoding='utf-8')
-df.rename(columns={'Χρήστης ': 'agent'}, inplace=True)
-
-# ✅ Keep only relevant columns
-columns_of_interest = ['agent', 'CALLS', 'TALK TIME %', 'PAUSETIME %', 'DEAD TIME %']
-df_filtered = df[columns_of_interest].copy()
-
-# ✅ Clean percentage columns
-for col in ['TALK TIME %', 'PAUSETIME %', 'DEAD TIME %']:
-    df_filtered[col] = df_filtered[col].str.replace('%', '').str.strip().astype(float)
-
-# 📊 Create charts
-charts = {
-    'CALLS': os.path.join(output_dir, 'calls_chart.png'),
-    'TALK TIME %': os.path.join(output_dir, 'talk_time_chart.png'),
-    'PAUSETIME %': os.path.join(output_dir, 'pause_time_chart.png'),
-    'DEAD TIME %': os.path.join(output_dir, 'dead_time_chart.png')
-}
-
-for col, filename in charts.items():
-    plt.figure(figsize=(10, 6))
-    plt.bar(df_filtered['agent'], df_filtered[col], color='red')
-    plt.xticks(rotation=90)
-    plt.title(f'{col} by Agent')
-    plt.xlabel('Agent')
-    plt.ylabel(col)
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
-    print(f"📊 Chart created: {filename}")
-
-# 📄 Save filtered Excel
-output_file = os.path.join(output_dir, "filtered_agent_data.xlsx")
-df_filtered.to_excel(output_file, index=False)
-print(f"📄 Excel file created: {output_file}")
-
-# 📦 Bundle all files into ZIP
-files_to_zip = list(charts.values()) + [
-    output_file,
-    os.path.join(output_dir, "filtered_agent_time_with_agent_column.xlsx"),
-    os.path.join(output_dir, "filtered_agent_time_with_names.xlsx")
-]
-
-zip_filename = os.path.join(output_dir, "agent_performance_package.zip")
-with zipfile.ZipFile(zip_filename, 'w') as zipf:
+# Shared helpers live one level up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from script_helpers import (resolve_input_files, read_delimited, optimize_frame, log_memory,
+                            final_output_dir, compile_rules, validate_frame, write_rejects)
+
+METRICS = ['CALLS', 'TALK TIME %', 'PAUSETIME %', 'DEAD TIME %']
+PERCENT_COLUMNS = ['TALK TIME %', 'PAUSETIME %', 'DEAD TIME %']
+ROLLUP_FILE_NAME = 'agent_rollup.sqlite'
+# Rollup columns for each report column
+ROLLUP_COLUMNS = {'CALLS': 'calls', 'TALK TIME %': 'talk_pct', 'PAUSETIME %': 'pause_pct', 'DEAD TIME %': 'dead_pct'}
+TIME_RANGE_PATTERN = re.compile(r'^\s*Time range:\s*(\d{4})-(\d{2})-\d{2}', re.IGNORECASE)
+REPORT_RULES = compile_rules({
+    'agent': {'required': True},
+    'CALLS': {'required': True, 'min': 0},
+    **{col: {'required': True, 'min': 0, 'max': 100} for col in PERCENT_COLUMNS},
+})
+
+
+# 🔎 Parsing one dialer report
+def detect_period(csv_file, preamble):
+    """Month of the report: the "Time range" line, else a date in the file name, else its mtime"""
+    for line in preamble:
+        match = TIME_RANGE_PATTERN.match(line)
+        if match:
+            return f"{match.group(1)}-{match.group(2)}"
+    match = re.search(r'(20\d{2})[-_.]?(0[1-9]|1[0-2])', os.path.basename(csv_file))
+    if match:
+        return f"{match.group(1)}-{match.group(2)}"
+    return datetime.fromtimestamp(os.path.getmtime(csv_file)).strftime('%Y-%m')
+
+
+def parse_report(csv_file):
+    """Return (period, DataFrame of agent + METRICS, rejected rows) for one dialer CSV"""
+    # Read file line by line to find header row
+    header_index = None
+    preamble = []
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        for i, line in enumerate(f):
+            if 'CALLS' in line and 'TALK TIME' in line:
+                header_index = i
+                break
+            preamble.append(line)
+
+    df = read_delimited(csv_file, skiprows=header_index or 0, encoding='utf-8')
+    df.rename(columns={'Χρήστης ': 'agent'}, inplace=True)
+    df, rejects = validate_frame(df, REPORT_RULES)
+    rejects.insert(0, 'SOURCE_FILE', os.path.basename(csv_file))
+
+    # Keep only relevant columns (the full report is not needed after this)
+    df_filtered = df[['agent'] + METRICS].copy()
+    del df
+
+    # Clean percentage columns
+    for col in PERCENT_COLUMNS:
+        df_filtered[col] = df_filtered[col].astype(str).str.replace('%', '').str.strip().astype(float)
+    return detect_period(csv_file, preamble if header_index is not None else []), df_filtered, rejects
+
+
+# 🗄️ Rollup store: one row per report file and agent, kept next to the outputs
+def open_rollup(rollup_dir):
+    conn = sqlite3.connect(os.path.join(rollup_dir, ROLLUP_FILE_NAME))
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS ingested_files (
+            path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, period TEXT, ingested_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS agent_periods (
+            source TEXT, agent TEXT, period TEXT,
+            calls INTEGER, talk_pct REAL, pause_pct REAL, dead_pct REAL,
+            PRIMARY KEY (source, agent)
+        );
+        CREATE INDEX IF NOT EXISTS agent_periods_period ON agent_periods (period);
+    """)
+    return conn
+
+
+def already_ingested(conn, csv_file):
+    stat = os.stat(csv_file)
+    row = conn.execute("SELECT size, mtime_ns, period FROM ingested_files WHERE path = ?",
+                       (os.path.abspath(csv_file),)).fetchone()
+    if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+        return row[2]
+    return None
+
+
+def ingest(conn, csv_file, period, df):
+    """Replace everything an earlier version of this file added (a re-export drops agents it no longer lists)"""
+    stat = os.stat(csv_file)
+    source = os.path.abspath(csv_file)
+    rows = [(source, str(agent), period, *(float(v) for v in values))
+            for agent, *values in df[['agent'] + METRICS].itertuples(index=False)]
+    with conn:
+        conn.execute("DELETE FROM agent_periods WHERE source = ?", (source,))
+        conn.executemany("INSERT OR REPLACE INTO agent_periods VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute("INSERT OR REPLACE INTO ingested_files VALUES (?, ?, ?, ?, ?)",
+                     (os.path.abspath(csv_file), stat.st_size, stat.st_mtime_ns, period,
+                      datetime.now().isoformat(timespec='seconds')))
+
+
+def load_rollup(conn):
+    """One row per agent and month; an agent listed in several reports of a month is combined
+    (calls added up, percentages weighted by calls)"""
+    df = pd.read_sql_query("""
+        SELECT agent, period, SUM(calls) AS calls,
+               COALESCE(SUM(talk_pct * calls) / NULLIF(SUM(calls), 0), AVG(talk_pct)) AS talk_pct,
+               COALESCE(SUM(pause_pct * calls) / NULLIF(SUM(calls), 0), AVG(pause_pct)) AS pause_pct,
+               COALESCE(SUM(dead_pct * calls) / NULLIF(SUM(calls), 0), AVG(dead_pct)) AS dead_pct
+        FROM agent_periods GROUP BY agent, period ORDER BY period, agent
+    """, conn)
+    return df.rename(columns={column: metric for metric, column in ROLLUP_COLUMNS.items()})
+
+
+# 📈 Trends from the rollup
+def write_trend_charts(rollup, output_dir):
+    """Team totals (CALLS) and averages (percentages) per month"""
+    per_period = rollup.groupby('period').agg(
+        {'CALLS': 'sum', **{col: 'mean' for col in PERCENT_COLUMNS}})
+    files = []
+    for col in METRICS:
+        filename = os.path.join(output_dir, f"trend_{ROLLUP_COLUMNS[col]}.png")
+        plt.figure(figsize=(10, 6))
+        plt.plot(per_period.index, per_period[col], marker='o', color='red')
+        plt.title(f"{col} per month ({'total' if col == 'CALLS' else 'agent average'})")
+        plt.xlabel('Month')
+        plt.ylabel(col)
+        plt.tight_layout()
+        plt.savefig(filename)
+        plt.close()
+        print(f"📈 Trend chart created: {filename}")
+        files.append(filename)
+    return files
+
+
+def write_period_tables(rollup, output_dir):
+    """One sheet per metric: agents x months, plus the change from the previous month"""
+    filename = os.path.join(output_dir, "agent_trends.xlsx")
+    periods = sorted(rollup['period'].unique())
+    with pd.ExcelWriter(filename) as writer:
+        for col in METRICS:
+            table = rollup.pivot_table(index='agent', columns='period', values=col, aggfunc='sum')
+            table = table.reindex(columns=periods)
+            if len(periods) > 1:
+                table[f"Δ {periods[-1]} vs {periods[-2]}"] = table[periods[-1]] - table[periods[-2]]
+            table.to_excel(writer, sheet_name=ROLLUP_COLUMNS[col])
+    print(f"📄 Period-over-period tables created: {filename}")
+    return filename
+
+
+def main():
+    # ✅ Accept file arguments (drag & drop support, or @manifest)
+    input_files = resolve_input_files() or ["agent.csv"]  # fallback for manual runs
+
+    # ✅ Output folder from GUI or fallback to current directory
+    output_dir = os.environ.get("OUTPUT_DIR", ".")
+    print(f"📁 Output folder set to: {output_dir}\n")
+    rollup_dir = os.environ.get("AGENT_ROLLUP_DIR") or final_output_dir()
+    conn = open_rollup(rollup_dir)
+
+    # ⏭️ Months already in the rollup are not parsed again
+    to_parse = []
+    run_periods = set()
+    for csv_file in input_files:
+        period = already_ingested(conn, csv_file)
+        if period:
+            print(f"⏭️ {os.path.basename(csv_file)} ({period}) already in the rollup")
+            run_periods.add(period)
+        else:
+            to_parse.append(csv_file)
+
+    # ⚡ Parse the new reports in parallel (the CSV reader releases the GIL)
+    rejects = []
+    if to_parse:
+        with ThreadPoolExecutor(max_workers=min(len(to_parse), os.cpu_count() or 1)) as pool:
+            futures = {pool.submit(parse_report, csv_file): csv_file for csv_file in to_parse}
+            for future in as_completed(futures):
+                csv_file = futures[future]
+                # ❌ A broken report is skipped; the other files still reach the rollup
+                try:
+                    period, df, file_rejects = future.result()
+                    log_memory(os.path.basename(csv_file), df)
+                    ingest(conn, csv_file, period, df)
+                except Exception as e:
+                    print(f"❌ Error processing {os.path.basename(csv_file)}: {e}")
+                    continue
+                run_periods.add(period)
+                rejects.append(file_rejects)
+                print(f"🗄️ {os.path.basename(csv_file)}: {len(df)} agents added to {period}")
+        # Rows with a missing agent or a malformed number, with the reason
+        if rejects:
+            write_rejects(pd.concat(rejects, ignore_index=True), os.path.join(output_dir, "agent_rejects.csv"))
+
+    if not run_periods:
+        conn.close()
+        print("❌ No report could be read.")
+        sys.exit(1)
+
+    rollup = optimize_frame(load_rollup(conn))
+    conn.close()
+    log_memory("rollup", rollup)
+    print(f"🗄️ Rollup: {rollup['period'].nunique()} month(s), {rollup['agent'].nunique()} agents "
+          f"({os.path.join(rollup_dir, ROLLUP_FILE_NAME)})")
+
+    # 📊 Per-agent charts and Excel for the latest month of this run
+    latest = max(run_periods)
+    df_filtered = rollup[rollup['period'] == latest][['agent'] + METRICS]
+    print(f"📅 Month: {latest}")
+
+    charts = {
+        'CALLS': os.path.join(output_dir, 'calls_chart.png'),
+        'TALK TIME %': os.path.join(output_dir, 'talk_time_chart.png'),
+        'PAUSETIME %': os.path.join(output_dir, 'pause_time_chart.png'),
+        'DEAD TIME %': os.path.join(output_dir, 'dead_time_chart.png')
+    }
+
+    for col, filename in charts.items():
+        plt.figure(figsize=(10, 6))
+        plt.bar(df_filtered['agent'].astype(str), df_filtered[col], color='red')
+        plt.xticks(rotation=90)
+        plt.title(f'{col} by Agent')
+        plt.xlabel('Agent')
+        plt.ylabel(col)
+        plt.tight_layout()
+        plt.savefig(filename)
+        plt.close()
+        print(f"📊 Chart created: {filename}")
+
+    # 📄 Save filtered Excel
+    output_file = os.path.join(output_dir, "filtered_agent_data.xlsx")
+    df_filtered.to_excel(output_file, index=False)
+    print(f"📄 Excel file created: {output_file}")
+
+    # 📈 Trends across all months in the rollup
+    trend_files = write_trend_charts(rollup, output_dir) + [write_period_tables(rollup, output_dir)]
+
+    # 📦 Bundle all files into ZIP
+    files_to_zip = list(charts.values()) + [
+        output_file,
+        os.path.join(output_dir, "filtered_agent_time_with_agent_column.xlsx"),
+        os.path.join(output_dir, "filtered_agent_time_with_names.xlsx")
+    ] + trend_files
+
+    zip_filename = os.path.join(output_dir, "agent_performance_package.zip")
+    with zipfile.ZipFile(zip_filename, 'w') as zipf:
+        for file in files_to_zip:
+            if os.path.exists(file):
+                zipf.write(file, os.path.basename(file))
+                print(f"📦 Added to ZIP: {file}")
+
+    # 🗑️ Delete intermediate files (keep only ZIP)
     for file in files_to_zip:
-        if os.path.exists(file):
-            zipf.write(file, os.path.basename(file))
-            print(f"📦 Added to ZIP: {file}")
-
-# 🗑️ Delete intermediate files (keep only ZIP)
-for file in files_to_zip:
-    if os.path.exists(file) and file != zip_filename:
-        os.remove(file)
-        print(f"🗑️ Deleted temporary file: {file}")
-
-# ✅ Final Summary
-print("\n========================================")
-print("✅ Agent Performance Package Created")
-print(f"📦 ZIP file: {zip_filename}")
-print("📂 Contents:")
-for file in files_to_zip:
-    print(f"   - {os.path.basename(file)}")
-print("========================================\n")
+        if os.path.exists(file) and file != zip_filename:
+            os.remove(file)
+            print(f"🗑️ Deleted temporary file: {file}")
+
+    # ✅ Final Summary
+    print("\n========================================")
+    print("✅ Agent Performance Package Created")
+    print(f"📦 ZIP file: {zip_filename}")
+    print("📂 Contents:")
+    for file in files_to_zip:
+        print(f"   - {os.path.basename(file)}")
+    print("========================================\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,13 @@ import zipfile
 import os
 import shutil
 import sys
+import json
+import tempfile
+import zlib
+
+# Shared helpers live one level up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from script_helpers import resolve_input_files
 
 # --------- Step 1: Define the folder structure ---------
 folder_structure = [
@@ -19,59 +26,169 @@ for folder in folder_structure:
     os.makedirs(folder, exist_ok=True)
 
 # --------- Step 2: Handle ZIP file input ---------
-if len(sys.argv) < 2:
+input_files = resolve_input_files()
+if not input_files:
     print("❌ Please drag & drop your ZIP file onto this script or provide its path as an argument.")
     sys.exit(1)
 
-zip_path = sys.argv[1]
+zip_path = input_files[0]
 
 if not os.path.isfile(zip_path):
     print(f"❌ File not found: {zip_path}")
     sys.exit(1)
 
 # --------- Step 3: Copy files from ZIP into tree ---------
+SYNC_MODE = os.environ.get("SYNC_MODE") == "1"
+PRUNE = os.environ.get("PRUNE") == "1"
+SYNC_MANIFEST = os.path.join("MediaTrack", ".sync_manifest.json")
+CHUNK_SIZE = 1024 * 1024
+
+
 def safe_copy(src, dst):
     os.makedirs(os.path.dirname(dst), exist_ok=True)
     shutil.copy2(src, dst)
 
-with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-    for member in zip_ref.namelist():
-        if member.endswith('/'):
-            continue  # skip directories
-        
-        temp_path = zip_ref.extract(member, 'temp_extract')
-        filename = os.path.basename(member)
-
-        # --- Step 4: Smart placement based on file names ---
-        # Frontend files
-        if filename in ["index_updated.html", "style_updated.css", "app_updated.js"]:
-            dest_path = os.path.join("MediaTrack/Updated Frontend Files", filename)
-        # Backend files
-        elif filename in ["server.js", "package.json"]:
-            dest_path = os.path.join("MediaTrack/Backend Files", filename)
-        elif filename == "database.js":
-            dest_path = os.path.join("MediaTrack/Backend Files/config", filename)
-        elif filename.endswith(".js"):
-            if filename == "externalApis.js":
-                dest_path = os.path.join("MediaTrack/Backend Files/services", filename)
+
+# --- Step 4: Smart placement based on file names ---
+def destination_for(member):
+    filename = os.path.basename(member)
+    # Frontend files
+    if filename in ["index_updated.html", "style_updated.css", "app_updated.js"]:
+        return os.path.join("MediaTrack/Updated Frontend Files", filename)
+    # Backend files
+    elif filename in ["server.js", "package.json"]:
+        return os.path.join("MediaTrack/Backend Files", filename)
+    elif filename == "database.js":
+        return os.path.join("MediaTrack/Backend Files/config", filename)
+    elif filename.endswith(".js"):
+        if filename == "externalApis.js":
+            return os.path.join("MediaTrack/Backend Files/services", filename)
+        else:
+            return os.path.join("MediaTrack/Backend Files/routes", filename)
+    # Deployment configuration
+    elif filename in ["Dockerfile", "docker-compose.yml", "netlify.toml", "vercel.json", "setup.sh", "PROJECT_README.md"]:
+        return os.path.join("MediaTrack/Deployment Configuration", filename)
+    # GitHub workflow
+    elif member.startswith(".github/workflows/"):
+        return os.path.join("MediaTrack/Deployment Configuration", member)
+    # Environment template
+    elif filename == ".env.example":
+        return os.path.join("MediaTrack/Backend Files", filename)
+    else:
+        # Unknown files go to root MediaTrack
+        return os.path.join("MediaTrack", filename)
+
+
+def copy_all(zip_path):
+    """Original behaviour: extract and copy every member"""
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for member in zip_ref.namelist():
+            if member.endswith('/'):
+                continue  # skip directories
+
+            temp_path = zip_ref.extract(member, 'temp_extract')
+            safe_copy(temp_path, destination_for(member))
+
+    # Clean up temp folder
+    shutil.rmtree('temp_extract', ignore_errors=True)
+    print("✅ MediaTrack tree created and files added successfully!")
+
+
+# --------- Sync mode: only write what changed ---------
+def load_sync_manifest():
+    try:
+        with open(SYNC_MANIFEST, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def atomic_write_json(path, data):
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def file_crc32(path):
+    crc = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def is_unchanged(dest_path, info, entry):
+    """Compare a ZIP member (CRC32 + size from the central directory) with the file on disk"""
+    try:
+        stat = os.stat(dest_path)
+    except OSError:
+        return False
+    if stat.st_size != info.file_size:
+        return False
+    if entry and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return entry.get("crc") == info.CRC and entry.get("size") == info.file_size
+    # Not in the manifest yet, or touched since: hash the local copy once
+    return file_crc32(dest_path) == info.CRC
+
+
+def extract_atomically(zip_ref, info, dest_path):
+    """Stream one member into a temp file next to its destination, then rename it over"""
+    dest_dir = os.path.dirname(dest_path)
+    os.makedirs(dest_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=dest_dir, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as dst, zip_ref.open(info) as src:
+            shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        os.replace(temp_path, dest_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def sync_zip(zip_path, prune=False):
+    manifest = load_sync_manifest()
+    new_manifest = {}
+    added = changed = unchanged = removed = 0
+
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                continue
+            dest_path = destination_for(info.filename)
+            entry = manifest.get(dest_path)
+            if is_unchanged(dest_path, info, entry):
+                unchanged += 1
             else:
-                dest_path = os.path.join("MediaTrack/Backend Files/routes", filename)
-        # Deployment configuration
-        elif filename in ["Dockerfile", "docker-compose.yml", "netlify.toml", "vercel.json", "setup.sh", "PROJECT_README.md"]:
-            dest_path = os.path.join("MediaTrack/Deployment Configuration", filename)
-        # GitHub workflow
-        elif member.startswith(".github/workflows/"):
-            dest_path = os.path.join("MediaTrack/Deployment Configuration", member)
-        # Environment template
-        elif filename == ".env.example":
-            dest_path = os.path.join("MediaTrack/Backend Files", filename)
+                existed = os.path.exists(dest_path)
+                extract_atomically(zip_ref, info, dest_path)
+                if existed:
+                    changed += 1
+                else:
+                    added += 1
+            new_manifest[dest_path] = {
+                "member": info.filename,
+                "crc": info.CRC,
+                "size": info.file_size,
+                "mtime_ns": os.stat(dest_path).st_mtime_ns,
+            }
+
+    for dest_path in manifest.keys() - new_manifest.keys():
+        if prune:
+            if os.path.exists(dest_path):
+                os.remove(dest_path)
+                removed += 1
         else:
-            # Unknown files go to root MediaTrack
-            dest_path = os.path.join("MediaTrack", filename)
+            # Not pruned: keep tracking it so a later prune can still remove it
+            new_manifest[dest_path] = manifest[dest_path]
 
-        safe_copy(temp_path, dest_path)
+    atomic_write_json(SYNC_MANIFEST, new_manifest)
+    print(f"✅ MediaTrack tree synced: {added} added, {changed} changed, {unchanged} unchanged"
+          + (f", {removed} removed" if prune else ""))
 
-# Clean up temp folder
-shutil.rmtree('temp_extract')
 
-print("✅ MediaTrack tree created and files added successfully!")
+if SYNC_MODE:
+    sync_zip(zip_path, prune=PRUNE)
+else:
+    copy_all(zip_path)
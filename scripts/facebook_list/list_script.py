@@ -4,15 +4,33 @@ import os
 import sys
 import datetime
 
-# ✅ Accept file argument
-if len(sys.argv) > 1:
-    INPUT_FILE = sys.argv[1]
+# Shared helpers live one level up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from script_helpers import (resolve_input_files, write_output_frame, read_input_frame,
+                            read_delimited, optimize_frame, log_memory, ARROW_FORMATS,
+                            compile_rules, validate_frame, write_rejects, enrich_providers)
+
+# ✅ Accept file argument (or @manifest)
+input_files = resolve_input_files()
+if input_files:
+    INPUT_FILE = input_files[0]
 else:
     INPUT_FILE = "forma.csv"  # fallback for old behavior
 
 output_dir = os.environ.get("OUTPUT_DIR", ".")
 OUTPUT_FILE = os.path.join(output_dir, "List_Ready.xlsx")
 
+# The only export columns the list needs
+INPUT_COLUMNS = ["adset_name", "full name", "phone"]
+
+# clean_phone keeps the last 10 digits, so any value with at least 10 digits is usable;
+# the other columns only have to exist (they are added empty if the export lacks them)
+INPUT_RULES = compile_rules({
+    "phone": {"required": True, "regex": r"(?:\D*\d){10,}\D*", "message": "fewer than 10 digits"},
+    "adset_name": {},
+    "full name": {},
+})
+
 
 def clean_phone(number):
     """
@@ -41,9 +59,21 @@ def clean_phone(number):
 
 
 def main():
-    # Read CSV
-    df = pd.read_csv(INPUT_FILE, encoding="utf-16", sep="\t")
+    # Read CSV (or the frame of a previous pipeline stage)
+    if INPUT_FILE.lower().endswith(ARROW_FORMATS):
+        df = read_input_frame(INPUT_FILE)
+        # Frames already in List_Ready layout (e.g. from leads)
+        df = df.rename(columns={"CUS_NAME": "full name", "MSISDN": "phone", "FORM_NAME": "adset_name"})
+    else:
+        # Columns the export lacks are added empty (and reported) by validate_frame
+        df = read_delimited(INPUT_FILE, sep="\t", usecols=lambda column: column in INPUT_COLUMNS)
     print("✅ Columns:", df.columns.tolist())
+    log_memory("input", df)
+
+    # Rows without a usable phone go to the rejects file, with the reason
+    df, rejects = validate_frame(df, INPUT_RULES)
+    write_rejects(rejects, os.path.join(output_dir, "List_Ready_rejects.csv"))
+    del rejects
 
     # Clean phone numbers for calling
     cleaned = df["phone"].apply(clean_phone)
@@ -62,9 +92,13 @@ def main():
         "TILEFONO_KATIKIAS": cleaned
     })
 
-    # Save to Excel
-    result.to_excel(OUTPUT_FILE, index=False)
-    print(f"✅ File created: {OUTPUT_FILE}")
+    del df, cleaned
+    result = optimize_frame(enrich_providers(result))
+    log_memory("result", result)
+
+    # Save to Excel (or hand over to the next pipeline stage)
+    written = write_output_frame(result, OUTPUT_FILE)
+    print(f"✅ File created: {written}")
 
 
 if __name__ == "__main__":
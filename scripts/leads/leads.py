@@ -5,9 +5,26 @@ import sys
 import datetime
 import glob
 
+# Shared helpers live one level up, in scripts/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from script_helpers import (resolve_input_files, write_output_frame, read_input_frame,
+                            read_delimited, optimize_frame, log_memory, BatchCheckpoint,
+                            ARROW_FORMATS, compile_rules, validate_frame, write_rejects,
+                            enrich_providers)
+
+# Facebook export columns used for the list
+CSV_COLUMNS = ['full name', 'phone', 'adset_name']
+
+# clean_phone keeps the last 10 digits, so any value with at least 10 digits is usable;
+# 'full name' only has to exist (it is added empty if an export lacks it)
+LEAD_RULES = compile_rules({
+    'phone': {'required': True, 'regex': r'(?:\D*\d){10,}\D*', 'message': 'fewer than 10 digits'},
+    'full name': {},
+})
+
 def get_input_files():
-    """Get input files from command line arguments or auto-detect lead generation files"""
-    input_files = sys.argv[1:] if len(sys.argv) > 1 else []
+    """Get input files from command line arguments/manifest or auto-detect lead generation files"""
+    input_files = resolve_input_files()
     # If no files provided as arguments, look for lead generation files in current directory
     if not input_files:
         pattern_files = glob.glob("lead_generation_*.xlsx")
@@ -51,6 +68,18 @@ def detect_source(filepath):
     else:
         return "unknown"
 
+def is_list_ready(df):
+    return 'MSISDN' in df.columns and 'CUS_NAME' in df.columns
+
+def map_list_ready(df, source):
+    """Map a List_Ready layout (e.g. a previous pipeline stage) back to lead columns"""
+    return pd.DataFrame({
+        'full name': df['CUS_NAME'],
+        'phone': df['MSISDN'],
+        'adset_name': df.get('FORM_NAME', 'Unknown'),
+        'SOURCE': df['SOURCE'] if 'SOURCE' in df.columns else source
+    })
+
 def process_lead_file(file_path):
     """Process a single lead generation file"""
     try:
@@ -67,13 +96,24 @@ def process_lead_file(file_path):
                     'adset_name': df.get('ad_name', df.get('form_name', 'Unknown')),
                     'SOURCE': source
                 })
+            elif is_list_ready(df):
+                df_mapped = map_list_ready(df, source)
             else:
                 # Assume it's already in the expected format
                 df_mapped = df
                 df_mapped['SOURCE'] = source
+        elif file_path.lower().endswith(ARROW_FORMATS):
+            # Frame handed over by a previous pipeline stage
+            df = read_input_frame(file_path)
+            if is_list_ready(df):
+                df_mapped = map_list_ready(df, source)
+            else:
+                df_mapped = df
+                if 'SOURCE' not in df_mapped.columns:
+                    df_mapped['SOURCE'] = source
         elif file_path.endswith('.csv'):
-            # Handle CSV files (original format)
-            df = pd.read_csv(file_path, encoding="utf-16", sep="\t")
+            # Handle CSV files (original format); a missing column is added empty later by validate_frame
+            df = read_delimited(file_path, sep="\t", usecols=lambda column: column in CSV_COLUMNS)
             df['SOURCE'] = source
             df_mapped = df
         else:
@@ -96,16 +136,30 @@ def main():
     for f in input_files:
         print(f" - {f}")
 
-    # Process all files and combine
-    combined_df = pd.DataFrame()
+    # Process all files and combine (one concat, not one copy per file)
+    # Finished files are checkpointed, so a resumed batch skips them
+    checkpoint = BatchCheckpoint.from_env()
+    frames = []
     for file_path in input_files:
-        df_mapped = process_lead_file(file_path)
+        df_mapped = checkpoint.load(file_path)
+        if df_mapped is None:
+            df_mapped = process_lead_file(file_path)
+            if not df_mapped.empty:
+                checkpoint.save(file_path, df_mapped)
         if not df_mapped.empty:
-            combined_df = pd.concat([combined_df, df_mapped], ignore_index=True)
+            frames.append(df_mapped)
 
-    if combined_df.empty:
+    if not frames:
         print("❌ No valid data found in input files")
         return
+    combined_df = pd.concat(frames, ignore_index=True)
+    del frames
+    log_memory("combined input", combined_df)
+
+    # Rows without a usable phone go to the rejects file, with the reason
+    combined_df, rejects = validate_frame(combined_df, LEAD_RULES)
+    write_rejects(rejects, os.path.join(output_dir, "List_Ready_rejects.csv"))
+    del rejects
 
     print(f"📊 Total combined records: {len(combined_df)}")
     print(f"📋 Available columns: {list(combined_df.columns)}")
@@ -129,16 +183,13 @@ def main():
         "SOURCE": combined_df["SOURCE"]
     })
 
-    # Filter out empty phone numbers
-    valid_records = len(result)
-    result = result[result["MSISDN"] != ""]
-    filtered_records = len(result)
-    if filtered_records < valid_records:
-        print(f"⚠️ Filtered out {valid_records - filtered_records} records with invalid phone numbers")
+    del combined_df, cleaned
+    result = optimize_frame(enrich_providers(result))
+    log_memory("result", result)
 
-    # Save to Excel
-    result.to_excel(OUTPUT_FILE, index=False)
-    print(f"✅ File created: {OUTPUT_FILE}")
+    # Save to Excel (or hand over to the next pipeline stage)
+    written = write_output_frame(result, OUTPUT_FILE)
+    print(f"✅ File created: {written}")
     print(f"✅ Total valid records: {len(result)}")
 
     # Show sample of results
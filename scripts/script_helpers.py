@@ -0,0 +1,781 @@
+"""Helpers shared by the scripts in the scripts/ folder.
+
+The GUI only turns sub-folders of scripts/ into tabs, so plain modules
+living next to them (like this one) are not picked up as scripts.
+Each script adds this folder to sys.path before importing from here.
+"""
+import json
+import os
+import sys
+
+# Alternative to "@file": the GUI (or a scheduler) can point this at a manifest
+MANIFEST_ENV = "INPUT_MANIFEST"
+
+
+def read_manifest(manifest_path):
+    """Read a manifest file: either a JSON list or one path per line"""
+    with open(manifest_path, encoding="utf-8-sig") as f:
+        content = f.read()
+    if content.lstrip().startswith("["):
+        return [str(path) for path in json.loads(content)]
+    return [line.strip() for line in content.splitlines() if line.strip()]
+
+
+def resolve_input_files(argv=None):
+    """
+    Return the input files passed to the script:
+    - plain command line arguments are used as-is
+    - an "@manifest" argument is replaced by the paths listed in the manifest
+    - INPUT_MANIFEST (if set) adds the paths of one more manifest
+    """
+    args = sys.argv[1:] if argv is None else argv
+    input_files = []
+    for arg in args:
+        if arg.startswith("@") and os.path.isfile(arg[1:]):
+            input_files.extend(read_manifest(arg[1:]))
+        else:
+            input_files.append(arg)
+
+    manifest_path = os.environ.get(MANIFEST_ENV)
+    if manifest_path and os.path.isfile(manifest_path):
+        input_files.extend(read_manifest(manifest_path))
+    return input_files
+
+
+# ---------- Pipeline stages ----------
+# Set by the GUI pipeline runner: where intermediate stages put their frames,
+# and whether this script is the last stage (the one writing for users)
+PIPELINE_DIR_ENV = "PIPELINE_DIR"
+PIPELINE_FINAL_ENV = "PIPELINE_FINAL_STAGE"
+ARROW_FORMATS = (".arrow", ".feather")
+
+
+def is_intermediate_stage():
+    return bool(os.environ.get(PIPELINE_DIR_ENV)) and os.environ.get(PIPELINE_FINAL_ENV) != "1"
+
+
+def write_output_frame(df, output_path):
+    """
+    Save the script's result. Inside a pipeline (and not the last stage) the
+    frame goes to PIPELINE_DIR as Arrow IPC/Feather, which keeps dtypes and
+    skips the xlsx round-trip; otherwise it is written to output_path as Excel.
+    Returns the path actually written.
+    """
+    if is_intermediate_stage():
+        try:
+            import pyarrow  # noqa: F401  (pandas needs it for Feather)
+        except ImportError:
+            print("⚠️ pyarrow is not installed, passing this stage on as Excel")
+        else:
+            stem = os.path.splitext(os.path.basename(output_path))[0]
+            arrow_path = os.path.join(os.environ[PIPELINE_DIR_ENV], stem + ".arrow")
+            df.reset_index(drop=True).to_feather(arrow_path)
+            return arrow_path
+    df.to_excel(output_path, index=False)
+    return output_path
+
+
+def read_input_frame(path):
+    """Read a frame handed over by a previous pipeline stage"""
+    import pandas as pd
+    if path.lower().endswith(ARROW_FORMATS):
+        return pd.read_feather(path)
+    return pd.read_excel(path)
+
+
+# ---------- Output staging ----------
+# OUTPUT_DIR is a private staging folder that the GUI moves into place when
+# the run succeeds; FINAL_OUTPUT_DIR is the folder the user picked
+FINAL_OUTPUT_DIR_ENV = "FINAL_OUTPUT_DIR"
+
+
+def final_output_dir():
+    """The user's output folder, for state that has to outlive this run"""
+    return os.environ.get(FINAL_OUTPUT_DIR_ENV) or os.environ.get("OUTPUT_DIR", os.getcwd())
+
+
+# ---------- Delimited text input ----------
+TRANSCODE_BLOCK_SIZE = 4 * 1024 * 1024
+
+BOM_ENCODINGS = [
+    (b"\xef\xbb\xbf", "utf-8-sig"),
+    (b"\xff\xfe", "utf-16"),
+    (b"\xfe\xff", "utf-16"),
+]
+
+
+def sniff_encoding(path, default="utf-8"):
+    """Guess a text file's encoding from its BOM (Facebook exports are UTF-16)"""
+    with open(path, "rb") as f:
+        head = f.read(4)
+    for bom, encoding in BOM_ENCODINGS:
+        if head.startswith(bom):
+            return encoding
+    if len(head) >= 4 and head[1:4:2] == b"\x00\x00" and head[0:4:2] != b"\x00\x00":
+        return "utf-16-le"  # UTF-16 without a BOM, ASCII text
+    return default
+
+
+def transcode_to_utf8(path, encoding, destination):
+    """Re-encode a file to UTF-8 in blocks, without loading it whole"""
+    import codecs
+    decoder = codecs.getincrementaldecoder(encoding)()
+    with open(path, "rb") as src, open(destination, "wb") as dst:
+        while True:
+            block = src.read(TRANSCODE_BLOCK_SIZE)
+            text = decoder.decode(block, final=not block)
+            if text:
+                dst.write(text.encode("utf-8"))
+            if not block:
+                break
+
+
+def read_delimited(path, sep=",", usecols=None, skiprows=0, encoding=None):
+    """
+    Read a CSV/TSV into a DataFrame. With pyarrow installed the file is
+    parsed by Arrow's multithreaded reader (UTF-16 input is transcoded to
+    UTF-8 in a temp file first); otherwise, or if Arrow rejects the file,
+    this is plain pandas.read_csv.
+    usecols may be a list (every column must exist) or, like pandas, a
+    callable on the column name, which simply skips columns the file lacks.
+    """
+    import pandas as pd
+    encoding = encoding or sniff_encoding(path)
+    try:
+        from pyarrow import csv as pa_csv
+        import pyarrow as pa
+    except ImportError:
+        pa_csv = None
+
+    if pa_csv is not None:
+        temp_path = None
+        source = path
+        try:
+            if encoding not in ("utf-8", "utf-8-sig", "ascii"):
+                import tempfile
+                fd, temp_path = tempfile.mkstemp(suffix=".csv", prefix="utf8_")
+                os.close(fd)
+                transcode_to_utf8(path, encoding, temp_path)
+                source = temp_path
+            read_options = pa_csv.ReadOptions(skip_rows=skiprows, use_threads=True)
+            parse_options = pa_csv.ParseOptions(delimiter=sep, newlines_in_values=True)
+            include_columns = list(usecols) if usecols and not callable(usecols) else None
+            if callable(usecols):
+                names = pa_csv.open_csv(source, read_options=read_options,
+                                        parse_options=parse_options).schema.names
+                # Arrow reads every column for an empty list; keep one to get the row count
+                include_columns = [name for name in names if usecols(name)] or names[:1]
+            convert_options = pa_csv.ConvertOptions(
+                include_columns=include_columns,
+                strings_can_be_null=True,
+            )
+            # Arrow also infers dates/times; keep those as text like pandas does
+            schema = pa_csv.open_csv(source, read_options=read_options, parse_options=parse_options,
+                                     convert_options=convert_options).schema
+            convert_options.column_types = {
+                field.name: pa.string() for field in schema
+                if not (pa.types.is_integer(field.type) or pa.types.is_floating(field.type)
+                        or pa.types.is_boolean(field.type) or pa.types.is_string(field.type)
+                        or pa.types.is_null(field.type))
+            }
+            table = pa_csv.read_csv(source, read_options=read_options,
+                                    parse_options=parse_options, convert_options=convert_options)
+            df = table.to_pandas()
+            if callable(usecols):
+                df = df[[column for column in df.columns if usecols(column)]]
+            return df
+        except (pa.ArrowInvalid, KeyError) as e:
+            print(f"⚠️ Arrow could not parse {os.path.basename(path)} ({e}), using pandas")
+        finally:
+            if temp_path:
+                os.remove(temp_path)
+
+    return pd.read_csv(path, sep=sep, usecols=usecols, skiprows=skiprows,
+                       encoding=encoding)
+
+
+# ---------- Excel streaming ----------
+XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+XLSX_STRING_BATCH = 50_000
+SQLITE_MAX_PARAMS = 900
+
+
+def xlsx_first_sheet(archive):
+    """Path of the first worksheet inside an .xlsx (the sheet pandas reads by default)"""
+    from xml.etree import ElementTree
+    workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    sheet = next(workbook.iter(XLSX_NS + "sheet"))
+    rel_id = next(value for key, value in sheet.attrib.items() if key.endswith("}id"))
+    rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    target = next(el.get("Target") for el in rels if el.get("Id") == rel_id)
+    return target.lstrip("/") if target.startswith("/") else "xl/" + target
+
+
+def xlsx_column_index(ref):
+    """0-based column of a cell reference such as "AB12"""
+    column = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        column = column * 26 + ord(ch.upper()) - 64
+    return column - 1
+
+
+def xlsx_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def iter_xml_children(stream, parent_tag, child_tag):
+    """Yield each child_tag element under parent_tag, dropping it from the tree afterwards"""
+    from xml.etree import ElementTree
+    parent = None
+    for event, el in ElementTree.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            if el.tag == parent_tag:
+                parent = el
+        elif el.tag == child_tag:
+            yield el
+            if parent is not None:
+                parent.remove(el)  # keeps memory flat, even for a million rows
+
+
+def shared_string_text(si):
+    """Plain <t>, or the runs of rich text; phonetic hints (<rPh>) are not part of the value"""
+    parts = []
+    for child in si:
+        if child.tag == XLSX_NS + "t":
+            parts.append(child.text or "")
+        elif child.tag == XLSX_NS + "r":
+            parts.extend(t.text or "" for t in child.iter(XLSX_NS + "t"))
+    return "".join(parts)
+
+
+def load_shared_strings(archive, conn):
+    """Copy the shared-string table into SQLite (idx -> text) in batches"""
+    conn.execute("CREATE TABLE strings (idx INTEGER PRIMARY KEY, text TEXT)")
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return
+    batch = []
+    with archive.open("xl/sharedStrings.xml") as stream:
+        for idx, si in enumerate(iter_xml_children(stream, XLSX_NS + "sst", XLSX_NS + "si")):
+            batch.append((idx, shared_string_text(si)))
+            if len(batch) >= XLSX_STRING_BATCH:
+                conn.executemany("INSERT INTO strings VALUES (?, ?)", batch)
+                batch = []
+    conn.executemany("INSERT INTO strings VALUES (?, ?)", batch)
+
+
+def lookup_shared_strings(conn, indexes):
+    texts = {}
+    indexes = sorted(indexes)
+    for start in range(0, len(indexes), SQLITE_MAX_PARAMS):
+        part = indexes[start:start + SQLITE_MAX_PARAMS]
+        texts.update(conn.execute(
+            f"SELECT idx, text FROM strings WHERE idx IN ({','.join('?' * len(part))})", part))
+    return texts
+
+
+def iter_xlsx_chunks(path, columns, chunk_rows=50_000, first_row=2):
+    """
+    Yield lists of row tuples (only the given 0-based columns) from the first
+    sheet of an .xlsx, streamed from the sheet XML.
+
+    openpyxl keeps the whole shared-string table in memory even in read-only
+    mode, which for string-heavy exports is most of the file. Here the table
+    is copied into a temporary SQLite file first and looked up per chunk, so
+    memory is bounded by chunk_rows. Numbers come back as int/float; date
+    styles are not applied.
+    """
+    import sqlite3
+    import tempfile
+    import zipfile
+
+    positions = {column: position for position, column in enumerate(columns)}
+    with zipfile.ZipFile(path) as archive, tempfile.TemporaryDirectory(prefix="xlsx_strings_") as tmp_dir:
+        conn = sqlite3.connect(os.path.join(tmp_dir, "strings.sqlite"))
+        try:
+            conn.execute("PRAGMA journal_mode=OFF")
+            conn.execute("PRAGMA synchronous=OFF")
+            load_shared_strings(archive, conn)
+
+            chunk, pending = [], []  # pending: (row in chunk, position, shared-string index)
+            with archive.open(xlsx_first_sheet(archive)) as stream:
+                for row_number, row in enumerate(
+                        iter_xml_children(stream, XLSX_NS + "sheetData", XLSX_NS + "row"), 1):
+                    row_number = int(row.get("r", row_number))
+                    if row_number < first_row:
+                        continue
+                    values = [None] * len(columns)
+                    for column, cell in enumerate(row):
+                        if cell.get("r"):
+                            column = xlsx_column_index(cell.get("r"))
+                        position = positions.get(column)
+                        if position is None:
+                            continue
+                        kind = cell.get("t")
+                        if kind == "inlineStr":
+                            values[position] = "".join(t.text or "" for t in cell.iter(XLSX_NS + "t"))
+                            continue
+                        value = cell.find(XLSX_NS + "v")
+                        if value is None or value.text is None:
+                            continue
+                        if kind == "s":
+                            pending.append((len(chunk), position, int(value.text)))
+                        elif kind == "b":
+                            values[position] = value.text == "1"
+                        elif kind in ("str", "e"):
+                            values[position] = value.text
+                        else:
+                            values[position] = xlsx_number(value.text)
+                    chunk.append(values)
+                    if len(chunk) >= chunk_rows:
+                        yield resolve_chunk(conn, chunk, pending)
+                        chunk, pending = [], []
+            if chunk:
+                yield resolve_chunk(conn, chunk, pending)
+        finally:
+            conn.close()
+
+
+def resolve_chunk(conn, chunk, pending):
+    texts = lookup_shared_strings(conn, {idx for _row, _position, idx in pending})
+    for row, position, idx in pending:
+        chunk[row][position] = texts.get(idx)
+    return [tuple(values) for values in chunk]
+
+
+# ---------- Memory footprint ----------
+# String columns with fewer distinct values than this share of rows become category
+CATEGORY_MAX_RATIO = 0.5
+
+
+def process_rss_mb():
+    """Resident memory of this process in MB (None if it cannot be read)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        # Linux without psutil: second field is resident pages
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def frame_memory_mb(df):
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def log_memory(stage, df=None):
+    """Print the frame's deep memory usage and the process RSS for one stage"""
+    parts = []
+    if df is not None:
+        parts.append(f"frame {frame_memory_mb(df):.1f} MB ({len(df)} rows)")
+    rss = process_rss_mb()
+    if rss is not None:
+        parts.append(f"RSS {rss:.1f} MB")
+    print(f"🧠 {stage}: {', '.join(parts) or 'n/a'}")
+
+
+def arrow_string_dtype():
+    """Arrow-backed string dtype with NaN (not pd.NA) for missing values, or None"""
+    import pandas as pd
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=float("nan"))  # pandas >= 2.3
+    except TypeError:
+        try:
+            return pd.StringDtype("pyarrow_numpy")  # pandas 2.1 / 2.2
+        except (TypeError, ValueError):
+            return None
+
+
+def optimize_frame(df, category_max_ratio=CATEGORY_MAX_RATIO):
+    """
+    Shrink a DataFrame: downcast numeric columns and store repetitive
+    strings as category (other strings as Arrow-backed strings when
+    pyarrow is installed). Returns a new frame; values are unchanged.
+    """
+    import pandas as pd
+    text_dtype = arrow_string_dtype()
+
+    optimized = {}
+    for name, column in df.items():
+        kind = column.dtype.kind
+        if kind in "iu":
+            optimized[name] = pd.to_numeric(column, downcast="integer" if kind == "i" else "unsigned")
+        elif kind == "f":
+            smaller = pd.to_numeric(column, downcast="float")
+            # float32 only when it round-trips exactly (counts, whole amounts)
+            lossless = ((smaller.astype(column.dtype) == column) | column.isna()).all()
+            optimized[name] = smaller if lossless else column
+        elif kind == "O" or pd.api.types.is_string_dtype(column.dtype):
+            non_null = column.dropna()
+            if len(non_null) and not all(isinstance(v, str) for v in non_null.head(1000)):
+                optimized[name] = column  # mixed types, leave as-is
+            elif len(column) and column.nunique() <= len(column) * category_max_ratio:
+                optimized[name] = column.astype("category")
+            elif text_dtype:
+                optimized[name] = column.astype(text_dtype)
+            else:
+                optimized[name] = column
+        else:
+            optimized[name] = column
+    return pd.DataFrame(optimized, index=df.index)
+
+
+# ---------- Checkpoints ----------
+# Set by the GUI for scripts that declare "checkpoints = true": where per-file
+# results of a batch are kept, and whether this run resumes the previous one
+CHECKPOINT_DIR_ENV = "CHECKPOINT_DIR"
+RESUME_ENV = "RESUME"
+CHECKPOINT_MANIFEST = "checkpoint.json"
+
+
+class BatchCheckpoint:
+    """
+    Per-input-file results of a batch run, so a stopped or failed batch can
+    resume without redoing the files it already finished:
+
+        checkpoint = BatchCheckpoint.from_env()
+        for path in input_files:
+            df = checkpoint.load(path)
+            if df is None:
+                df = expensive_read(path)
+                checkpoint.save(path, df)
+
+    Without CHECKPOINT_DIR every call is a no-op. A saved frame is only
+    reused while its input file keeps the same size and modification time.
+    """
+
+    def __init__(self, directory=None, resume=False):
+        self.directory = directory
+        self.entries = {}
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        manifest = os.path.join(directory, CHECKPOINT_MANIFEST)
+        if resume and os.path.exists(manifest):
+            with open(manifest, encoding="utf-8") as f:
+                self.entries = json.load(f)
+            print(f"♻️ Resuming: {len(self.entries)} file(s) already done")
+        else:
+            # A fresh run never picks up results of an older batch
+            for name in os.listdir(directory):
+                if name == CHECKPOINT_MANIFEST or name.endswith(".pkl"):
+                    os.remove(os.path.join(directory, name))
+
+    @classmethod
+    def from_env(cls):
+        return cls(os.environ.get(CHECKPOINT_DIR_ENV), os.environ.get(RESUME_ENV) == "1")
+
+    @staticmethod
+    def file_signature(path):
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load(self, path):
+        """The frame saved for this input file, or None if it still has to be processed"""
+        entry = self.entries.get(os.path.abspath(path))
+        if not entry:
+            return None
+        try:
+            if self.file_signature(path) != entry["signature"]:
+                return None
+            import pandas as pd
+            df = pd.read_pickle(os.path.join(self.directory, entry["frame"]))
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+        print(f"⏭️ {os.path.basename(path)}: taken from checkpoint ({len(df)} rows)")
+        return df
+
+    def save(self, path, df):
+        if not self.directory:
+            return
+        key = os.path.abspath(path)
+        frame_name = self.entries.get(key, {}).get("frame") or f"{len(self.entries) + 1:05d}.pkl"
+        df.to_pickle(os.path.join(self.directory, frame_name))
+        self.entries[key] = {"frame": frame_name, "rows": len(df),
+                             "signature": self.file_signature(path)}
+        # Manifest last and atomically: a frame only counts once it is listed
+        manifest = os.path.join(self.directory, CHECKPOINT_MANIFEST)
+        temp_path = manifest + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(temp_path, manifest)
+
+
+# ---------- Validation ----------
+# Column added to rejected rows; rejects files are plain CSV (utf-8-sig opens in Excel)
+REJECT_REASON_COLUMN = "REJECT_REASON"
+RULE_KEYS = {"required", "regex", "min", "max", "enum", "message"}
+
+
+def compile_rules(rules):
+    """
+    Check and prepare a script's column rules once, at import time:
+
+        RULES = compile_rules({
+            "phone": {"required": True, "regex": r"(?:\\D*\\d){10,}\\D*",
+                      "message": "fewer than 10 digits"},
+            "TALK TIME %": {"min": 0, "max": 100},
+            "status": {"enum": ["ACTIVE", "INACTIVE"]},
+        })
+
+    "min"/"max" parse the value as a number ("45.2%" counts as 45.2).
+    Missing values only fail "required"; "message" replaces the text of
+    the regex/enum/range reasons.
+    """
+    import re
+    compiled = []
+    for column, rule in rules.items():
+        unknown = set(rule) - RULE_KEYS
+        if unknown:
+            raise ValueError(f"Unknown validation rule(s) for {column}: {', '.join(sorted(unknown))}")
+        prepared = dict(rule)
+        if "regex" in rule:
+            re.compile(rule["regex"])  # fail at import, not halfway through a batch
+        if "enum" in rule:
+            prepared["enum"] = [str(value) for value in rule["enum"]]
+        compiled.append((column, prepared))
+    return compiled
+
+
+def column_failures(column, values, rule):
+    """[(reason, boolean mask)] for one column, all rules on vectorised string ops"""
+    import pandas as pd
+    text = values.astype(str).str.strip()
+    blank = (values.isna() | (text == "")).to_numpy(dtype=bool)
+    present = ~blank
+    message = rule.get("message")
+    failures = []
+    if rule.get("required"):
+        failures.append((f"{column}: missing", blank))
+    if "regex" in rule:
+        matched = text.str.fullmatch(rule["regex"]).fillna(False).to_numpy(dtype=bool)
+        failures.append((f"{column}: {message or 'invalid format'}", present & ~matched))
+    if "enum" in rule:
+        allowed = text.isin(rule["enum"]).to_numpy(dtype=bool)
+        failures.append((f"{column}: {message or 'not one of ' + ', '.join(rule['enum'])}", present & ~allowed))
+    if "min" in rule or "max" in rule:
+        numbers = pd.to_numeric(text.str.rstrip("%").str.strip(), errors="coerce")
+        failures.append((f"{column}: not a number", present & numbers.isna().to_numpy(dtype=bool)))
+        if "min" in rule:
+            failures.append((f"{column}: {message or 'below ' + str(rule['min'])}",
+                             (numbers < rule["min"]).to_numpy(dtype=bool)))
+        if "max" in rule:
+            failures.append((f"{column}: {message or 'above ' + str(rule['max'])}",
+                             (numbers > rule["max"]).to_numpy(dtype=bool)))
+    return failures
+
+
+def validate_frame(df, rules):
+    """
+    Split df into (valid, rejects) with the rules of compile_rules. Rejects
+    keep their original values plus REJECT_REASON (every failed rule).
+    A missing column is added empty, so later code can still index it.
+    """
+    import numpy as np
+    if not isinstance(rules, list):
+        rules = compile_rules(rules)
+    failures = []
+    for column, rule in rules:
+        if column not in df.columns:
+            df = df.assign(**{column: None})
+            if rule.get("required"):
+                failures.append((f"{column}: column missing", np.ones(len(df), dtype=bool)))
+            continue
+        failures.extend(column_failures(column, df[column], rule))
+
+    failures = [(reason, mask) for reason, mask in failures if mask.any()]
+    if not failures:
+        return df, df.iloc[0:0].assign(**{REJECT_REASON_COLUMN: ""})
+    bad = np.logical_or.reduce([mask for _reason, mask in failures])
+    rejects = df[bad].copy()
+    # Reason strings only for the rejected rows
+    per_rule = [np.where(mask[bad], reason, "") for reason, mask in failures]
+    rejects[REJECT_REASON_COLUMN] = ["; ".join(part for part in parts if part) for parts in zip(*per_rule)]
+    return df[~bad], rejects
+
+
+def write_rejects(rejects, path):
+    """Save rejected rows (if any) and print how many failed on what; returns the path or None"""
+    if rejects is None or rejects.empty:
+        return None
+    rejects.to_csv(path, index=False, encoding="utf-8-sig")
+    print(f"⚠️ {len(rejects)} row(s) rejected, see {path}")
+    reasons = rejects[REJECT_REASON_COLUMN].str.split("; ").explode().value_counts()
+    for reason, count in reasons.head(5).items():
+        print(f"   - {reason}: {count}")
+    return path
+
+
+# ---------- Number ranges ----------
+# Operator table we maintain by hand: number ranges (or prefixes) -> operator.
+# The sorted index built from it is cached in the temp folder, keyed by the
+# CSV's size and modification time.
+NUMBER_RANGES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "number_ranges.csv")
+NUMBER_LENGTH = 10
+LOOKUP_BATCH_SIZE = 1_000_000
+PROVIDER_COLUMNS = {"mobile": "MOBILE PROVIDER", "fixed": "FIXED PROVIDER"}
+
+
+class NumberRangeIndex:
+    """
+    Sorted, non-overlapping [start, end] ranges with an operator and a line
+    type each. Lookups are np.searchsorted over the starts, so millions of
+    numbers take a few vectorised passes.
+    """
+
+    def __init__(self, starts, ends, operator_codes, type_codes, operators, types):
+        self.starts = starts
+        self.ends = ends
+        self.operator_codes = operator_codes
+        self.type_codes = type_codes
+        self.operators = operators
+        self.types = types
+
+    @staticmethod
+    def cache_path(csv_path):
+        import tempfile
+        import zlib
+        key = zlib.crc32(os.path.abspath(csv_path).encode("utf-8"))
+        return os.path.join(tempfile.gettempdir(), f"number_ranges_{key:08x}.npz")
+
+    @classmethod
+    def load(cls, csv_path=NUMBER_RANGES_FILE):
+        """The index for csv_path, from the cache when the CSV has not changed"""
+        import numpy as np
+        import tempfile
+        import zipfile
+        stat = os.stat(csv_path)
+        signature = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        cache = cls.cache_path(csv_path)
+        try:
+            with np.load(cache, allow_pickle=False) as data:
+                if np.array_equal(data["signature"], signature):
+                    return cls(data["starts"], data["ends"], data["operator_codes"], data["type_codes"],
+                               list(data["operators"]), list(data["types"]))
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            pass  # missing, stale or damaged cache: rebuild
+        index = cls.build(csv_path)
+        # Parallel runs (e.g. partitions) build it at once: write aside, then swap in
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(prefix="number_ranges_", suffix=".tmp",
+                                             dir=os.path.dirname(cache))
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, signature=signature, starts=index.starts, ends=index.ends,
+                         operator_codes=index.operator_codes, type_codes=index.type_codes,
+                         operators=np.array(index.operators, dtype=str),
+                         types=np.array(index.types, dtype=str))
+            os.replace(temp_path, cache)
+            temp_path = None
+        except OSError:
+            pass  # read-only temp folder: rebuild next time
+        finally:
+            if temp_path:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+        return index
+
+    @classmethod
+    def build(cls, csv_path):
+        """
+        Parse the table: "from" and "to" are numbers or prefixes ("694" to
+        "694" covers 6940000000-6949999999); type is mobile or fixed.
+        """
+        import numpy as np
+        import pandas as pd
+        table = pd.read_csv(csv_path, dtype=str, comment="#", skipinitialspace=True).dropna(how="all")
+        starts = table["from"].str.strip().str.ljust(NUMBER_LENGTH, "0").astype(np.int64).to_numpy()
+        ends = table["to"].str.strip().str.ljust(NUMBER_LENGTH, "9").astype(np.int64).to_numpy()
+        operator_codes, operators = pd.factorize(table["operator"].str.strip())
+        type_codes, types = pd.factorize(table["type"].str.strip().str.lower())
+        unknown = set(types) - set(PROVIDER_COLUMNS)
+        if unknown:
+            raise ValueError(f"{csv_path}: unknown line type(s) {', '.join(sorted(unknown))}")
+
+        order = np.argsort(starts, kind="stable")
+        starts, ends = starts[order], ends[order]
+        operator_codes, type_codes = operator_codes[order], type_codes[order]
+        bad = np.flatnonzero(ends < starts)
+        if len(bad):
+            raise ValueError(f"{csv_path}: range ends before it starts at {starts[bad[0]]}")
+        overlap = np.flatnonzero(starts[1:] <= ends[:-1])
+        if len(overlap):
+            i = overlap[0]
+            raise ValueError(f"{csv_path}: ranges {starts[i]}-{ends[i]} and {starts[i + 1]}-{ends[i + 1]} overlap")
+        return cls(starts, ends, operator_codes.astype(np.int32), type_codes.astype(np.int8),
+                   list(operators), list(types))
+
+    def lookup(self, numbers):
+        """(operator code, type code) arrays for 10-digit number strings, -1 where no range matches"""
+        import numpy as np
+        values = numbers_to_int64(numbers)
+        if not len(self.starts):
+            missing = np.full(len(values), -1)
+            return missing, missing
+        position = np.searchsorted(self.starts, values, side="right") - 1
+        clipped = np.clip(position, 0, None)
+        found = (position >= 0) & (values <= self.ends[clipped])
+        return (np.where(found, self.operator_codes[clipped], -1),
+                np.where(found, self.type_codes[clipped], -1))
+
+
+def numbers_to_int64(numbers):
+    """Number strings as int64, -1 where a value is not a number"""
+    import numpy as np
+    import pandas as pd
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        try:
+            # About 10x faster than to_numeric on object strings
+            array = pc.cast(pa.array(numbers, type=pa.string()), pa.int64())
+            return array.fill_null(-1).to_numpy(zero_copy_only=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass  # blanks or stray characters: the slower, forgiving path
+    except ImportError:
+        pass
+    return pd.to_numeric(pd.Series(numbers, copy=False), errors="coerce").fillna(-1).to_numpy(np.int64)
+
+
+def enrich_providers(df, number_column="MSISDN", csv_path=NUMBER_RANGES_FILE):
+    """
+    Fill MOBILE PROVIDER / FIXED PROVIDER of df (in place, df is returned)
+    from the number-range table, in batches of LOOKUP_BATCH_SIZE. Without a
+    table the columns are left as they are.
+    """
+    import numpy as np
+    import pandas as pd
+    if not os.path.exists(csv_path):
+        print(f"ℹ️ No {os.path.basename(csv_path)}, provider columns left empty")
+        return df
+    index = NumberRangeIndex.load(csv_path)
+    numbers = np.asarray(df[number_column], dtype=object)
+    operator_codes = np.empty(len(df), dtype=np.int32)
+    type_codes = np.empty(len(df), dtype=np.int8)
+    for start in range(0, len(df), LOOKUP_BATCH_SIZE):
+        batch = slice(start, start + LOOKUP_BATCH_SIZE)
+        operator_codes[batch], type_codes[batch] = index.lookup(numbers[batch])
+
+    # Categoricals: one small code per row instead of a string object
+    categories = index.operators + [""]
+    blank = len(index.operators)
+    for kind, column in PROVIDER_COLUMNS.items():
+        kind_code = index.types.index(kind) if kind in index.types else -2
+        codes = np.where((type_codes == kind_code) & (operator_codes >= 0), operator_codes, blank)
+        df[column] = pd.Categorical.from_codes(codes, categories=categories)
+    print(f"📡 Providers found for {int((operator_codes >= 0).sum())} of {len(df)} numbers")
+    return df
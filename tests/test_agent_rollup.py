@@ -0,0 +1,75 @@
+"""Tests for the monthly rollup of scripts/agent_monthly/monthly_report_script.py"""
+import os
+import sys
+import tempfile
+import unittest
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "agent_monthly"))
+import monthly_report_script as report  # noqa: E402
+
+HEADER = "Χρήστης ,ID,CALLS,TIME,PAUSE,PAUSETIME %,WAIT,TALK,TALK TIME %,DISPO,DEAD,DEAD TIME %\n"
+
+
+class RollupTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+
+    def write_report(self, name, month, agents, preamble=""):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Agent Time Detail\n{preamble}"
+                    f"Time range: {month}-01 00:00:00 to {month}-28 23:59:59\n\n{HEADER}")
+            for agent, calls, talk in agents:
+                f.write(f"{agent},0,{calls},1:00:00,0:10:00,10.0%,0:0:0,0:0:0,{talk}%,0,0,5.0%\n")
+        return path
+
+    def ingest(self, conn, path):
+        period, df, _rejects = report.parse_report(path)
+        report.ingest(conn, path, period, df)
+        return period
+
+    def rollup(self, conn):
+        rollup = report.load_rollup(conn)
+        columns = ["agent", "period", "CALLS", "TALK TIME %"]
+        return {(agent, period): (calls, talk)
+                for agent, period, calls, talk in rollup[columns].itertuples(index=False)}
+
+    def test_period_comes_from_the_time_range_line(self):
+        path = self.write_report("export_2024_12.csv", "2025-02", [("a1", 1, 50)],
+                                 preamble="Generated 2024-12-31 08:00\n")
+        self.assertEqual(report.parse_report(path)[0], "2025-02")
+
+    def test_agent_across_months_and_reopen(self):
+        conn = report.open_rollup(self.dir)
+        self.ingest(conn, self.write_report("jan.csv", "2025-01", [("a1", 100, 50)]))
+        self.ingest(conn, self.write_report("feb.csv", "2025-02", [("a1", 200, 60)]))
+        conn.close()
+        conn = report.open_rollup(self.dir)
+        self.addCleanup(conn.close)
+        self.assertEqual(self.rollup(conn), {("a1", "2025-01"): (100, 50.0), ("a1", "2025-02"): (200, 60.0)})
+
+    def test_reports_of_one_month_add_up_and_reexport_replaces(self):
+        conn = report.open_rollup(self.dir)
+        self.addCleanup(conn.close)
+        team_a = self.write_report("team_a.csv", "2025-02", [("a1", 100, 40), ("a2", 10, 10)])
+        self.ingest(conn, team_a)
+        self.ingest(conn, self.write_report("team_b.csv", "2025-02", [("a1", 300, 80), ("b1", 5, 5)]))
+        rollup = self.rollup(conn)
+        self.assertEqual(rollup[("a1", "2025-02")], (400, 70.0))  # talk % weighted by calls
+        self.assertIn(("a2", "2025-02"), rollup)
+
+        # Re-export of team_a without a2
+        self.write_report("team_a.csv", "2025-02", [("a1", 100, 40)])
+        self.ingest(conn, team_a)
+        rollup = self.rollup(conn)
+        self.assertNotIn(("a2", "2025-02"), rollup)
+        self.assertEqual(rollup[("a1", "2025-02")], (400, 70.0))
+        self.assertEqual(report.already_ingested(conn, team_a), "2025-02")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Tests for the incremental state store of scripts/AIOS/AIOS.py"""
+import os
+import sys
+import tempfile
+import unittest
+
+from openpyxl import Workbook
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts")
+sys.path.insert(0, os.path.join(SCRIPTS_DIR, "AIOS"))
+import AIOS as aios  # noqa: E402
+
+
+def write_workbook(path, role, rows):
+    """rows of values in the FILE_LAYOUTS column order of role"""
+    columns = aios.FILE_LAYOUTS[role][0]
+    wb = Workbook()
+    ws = wb.active
+    ws.append([f"COL_{i}" for i in range(max(columns) + 1)])
+    for values in rows:
+        row = [None] * (max(columns) + 1)
+        for column, value in zip(columns, values):
+            row[column] = value
+        ws.append(row)
+    wb.save(path)
+
+
+class StateStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.conn = aios.open_state_store(self.tmp.name)
+        self.addCleanup(self.conn.close)
+        self.all_path = os.path.join(self.tmp.name, "ALL_export.xlsx")
+
+    def new_run(self, started="2025-01-01T10:00:00"):
+        return self.conn.execute("INSERT INTO runs (started) VALUES (?)", (started,)).lastrowid
+
+    def application(self, app):
+        return self.conn.execute("SELECT surname, name, changed_run, activated_run FROM applications "
+                                 "WHERE app = ?", (app,)).fetchone()
+
+    def test_first_occurrence_wins_within_a_run(self):
+        write_workbook(self.all_path, 'ALL', [
+            ("ΠΑΠΑΣ", "ΝΙΚΟΣ", "1-100", "6900000000"),
+            ("ΑΛΛΟΣ", "ΓΙΩΡΓΟΣ", "1-100", "6911111111"),
+        ])
+        run_id = self.new_run()
+        self.assertEqual(aios.upsert_all_file(self.conn, self.all_path, run_id), (2, 1))
+        self.assertEqual(self.application("1-100")[:2], ("ΠΑΠΑΣ", "ΝΙΚΟΣ"))
+
+        # Unchanged row seen again in a later run: still first occurrence wins
+        run_id = self.new_run()
+        self.assertEqual(aios.upsert_all_file(self.conn, self.all_path, run_id), (2, 0))
+        self.assertEqual(self.application("1-100")[:2], ("ΠΑΠΑΣ", "ΝΙΚΟΣ"))
+
+    def test_only_changed_rows_are_marked(self):
+        write_workbook(self.all_path, 'ALL', [("Α", "Β", "1-1", "6900000000"), ("Γ", "Δ", "1-2", "6900000001")])
+        first = self.new_run()
+        aios.upsert_all_file(self.conn, self.all_path, first)
+        write_workbook(self.all_path, 'ALL', [("Α", "Β", "1-1", "6900000000"), ("Γ", "Ε", "1-2", "6900000001")])
+        second = self.new_run()
+        self.assertEqual(aios.upsert_all_file(self.conn, self.all_path, second), (2, 1))
+        self.assertEqual(self.application("1-1")[2], first)
+        self.assertEqual(self.application("1-2")[2], second)
+
+    def test_delta_is_keyed_on_the_run_not_the_timestamp(self):
+        write_workbook(self.all_path, 'ALL', [("Α", "Β", "1-1", "6900000000"), ("Γ", "Δ", "1-2", "6900000001")])
+        aios_path = os.path.join(self.tmp.name, "AIOS_MOB.xlsx")
+
+        first = self.new_run()
+        aios.upsert_all_file(self.conn, self.all_path, first)
+        write_workbook(aios_path, 'AIOS_MOB', [("1-1", "Α Β")])
+        aios.index_aios_file(self.conn, aios_path, 'AIOS_MOB', first)
+        self.assertEqual(aios.mark_new_activations(self.conn, first, "2025-01-01T10:00:00"), 1)
+
+        # Second run within the same second activates the other application
+        second = self.new_run()
+        write_workbook(aios_path, 'AIOS_MOB', [("1-1", "Α Β"), ("1-2", "Γ Δ")])
+        aios.index_aios_file(self.conn, aios_path, 'AIOS_MOB', second)
+        self.assertEqual(aios.mark_new_activations(self.conn, second, "2025-01-01T10:00:00"), 1)
+
+        delta_path = os.path.join(self.tmp.name, "delta.xlsx")
+        aios.write_delta_report(self.conn, second, delta_path)
+        from openpyxl import load_workbook
+        rows = list(load_workbook(delta_path).active.iter_rows(min_row=2, values_only=True))
+        self.assertEqual([row[2] for row in rows], ["1-2"])
+
+
+class ProbableMatchTests(unittest.TestCase):
+    def test_candidates_between_prefilter_and_score_threshold_are_kept(self):
+        # Name score 0.8 (the lowest that can pass) with an identical application number
+        pool = aios.index_pool([("1-12345", "ΑΒΓΔΕ ΖΗΘΙΚ")])
+        name_score = aios.SequenceMatcher(None, "ΑΒΓΔΕ ΖΗΘΙΚ", "ΑΒΓΔΕ ΖΗΘΛΜ").ratio()
+        self.assertGreaterEqual(name_score, aios.FUZZY_MIN_NAME_SCORE)
+        self.assertLess(name_score, aios.FUZZY_MIN_SCORE)
+        matches = aios.find_probable_matches([(0, "ΑΒΓΔΕ", "ΖΗΘΛΜ", "1-12345")], *pool)
+        self.assertIn(0, matches)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""Tests for scripts/script_helpers.py (run with: python -m unittest discover tests)"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+import script_helpers as helpers  # noqa: E402
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+
+    def path(self, name):
+        return os.path.join(self.dir, name)
+
+
+class ManifestTests(TempDirTestCase):
+    def test_json_and_line_manifests(self):
+        with open(self.path("list.json"), "w", encoding="utf-8") as f:
+            json.dump(["a.csv", "β.csv"], f)
+        with open(self.path("list.txt"), "w", encoding="utf-8-sig") as f:
+            f.write("c.csv\n\n  d.csv  \n")
+        self.assertEqual(helpers.read_manifest(self.path("list.json")), ["a.csv", "β.csv"])
+        self.assertEqual(helpers.read_manifest(self.path("list.txt")), ["c.csv", "d.csv"])
+
+    def test_resolve_input_files_expands_at_manifest_and_env(self):
+        with open(self.path("list.txt"), "w", encoding="utf-8") as f:
+            f.write("b.csv\n")
+        with open(self.path("extra.txt"), "w", encoding="utf-8") as f:
+            f.write("c.csv\n")
+        os.environ[helpers.MANIFEST_ENV] = self.path("extra.txt")
+        self.addCleanup(os.environ.pop, helpers.MANIFEST_ENV, None)
+        files = helpers.resolve_input_files(["a.csv", "@" + self.path("list.txt"), "@missing"])
+        self.assertEqual(files, ["a.csv", "b.csv", "@missing", "c.csv"])
+
+
+class ReadDelimitedTests(TempDirTestCase):
+    def write_tsv(self, text, encoding="utf-16"):
+        with open(self.path("in.tsv"), "w", encoding=encoding) as f:
+            f.write(text)
+        return self.path("in.tsv")
+
+    def test_callable_usecols_skips_missing_columns(self):
+        path = self.write_tsv("full name\tphone\textra\nA\t6900000000\tx\n")
+        wanted = ["full name", "phone", "adset_name"]
+        df = helpers.read_delimited(path, sep="\t", usecols=lambda column: column in wanted)
+        self.assertEqual(list(df.columns), ["full name", "phone"])
+        self.assertEqual(len(df), 1)
+
+    def test_callable_usecols_matching_nothing_keeps_row_count(self):
+        path = self.write_tsv("a\tb\n1\t2\n3\t4\n")
+        df = helpers.read_delimited(path, sep="\t", usecols=lambda column: False)
+        self.assertEqual(df.shape, (2, 0))
+
+
+class XlsxStreamingTests(TempDirTestCase):
+    def test_chunks_match_openpyxl(self):
+        from openpyxl import Workbook
+        wb = Workbook()
+        ws = wb.active
+        ws.append(["name", "skip", "number", "text"])
+        rows = [[f"ΟΝΟΜΑ {i}", "x", i * 1.5 if i % 2 else i, None if i % 3 == 0 else "same"]
+                for i in range(25)]
+        for row in rows:
+            ws.append(row)
+        wb.save(self.path("book.xlsx"))
+
+        chunks = list(helpers.iter_xlsx_chunks(self.path("book.xlsx"), [0, 2, 3], chunk_rows=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        streamed = [tuple(row) for chunk in chunks for row in chunk]
+        self.assertEqual(streamed, [(name, number, text) for name, _skip, number, text in rows])
+
+    def test_column_index(self):
+        self.assertEqual(helpers.xlsx_column_index("A1"), 0)
+        self.assertEqual(helpers.xlsx_column_index("Z9"), 25)
+        self.assertEqual(helpers.xlsx_column_index("AB12"), 27)
+
+
+class BatchCheckpointTests(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.input = self.path("input.csv")
+        with open(self.input, "w", encoding="utf-8") as f:
+            f.write("a\n1\n")
+        self.checkpoint_dir = self.path("checkpoints")
+        self.frame = pd.DataFrame({"a": [1, 2]})
+
+    def test_without_directory_is_a_no_op(self):
+        checkpoint = helpers.BatchCheckpoint()
+        checkpoint.save(self.input, self.frame)
+        self.assertIsNone(checkpoint.load(self.input))
+
+    def test_resume_reuses_saved_frame(self):
+        helpers.BatchCheckpoint(self.checkpoint_dir).save(self.input, self.frame)
+        resumed = helpers.BatchCheckpoint(self.checkpoint_dir, resume=True)
+        pd.testing.assert_frame_equal(resumed.load(self.input), self.frame)
+
+    def test_fresh_run_discards_old_batch(self):
+        helpers.BatchCheckpoint(self.checkpoint_dir).save(self.input, self.frame)
+        fresh = helpers.BatchCheckpoint(self.checkpoint_dir, resume=False)
+        self.assertIsNone(fresh.load(self.input))
+        self.assertEqual(os.listdir(self.checkpoint_dir), [])
+
+    def test_changed_input_is_processed_again(self):
+        helpers.BatchCheckpoint(self.checkpoint_dir).save(self.input, self.frame)
+        with open(self.input, "a", encoding="utf-8") as f:
+            f.write("2\n")
+        resumed = helpers.BatchCheckpoint(self.checkpoint_dir, resume=True)
+        self.assertIsNone(resumed.load(self.input))
+
+
+class ValidationTests(unittest.TestCase):
+    RULES = helpers.compile_rules({
+        "phone": {"required": True, "regex": r"(?:\D*\d){10,}\D*", "message": "fewer than 10 digits"},
+        "pct": {"min": 0, "max": 100},
+        "status": {"enum": ["ACTIVE", "INACTIVE"]},
+    })
+
+    def test_unknown_rule_and_bad_regex_fail_at_compile_time(self):
+        with self.assertRaises(ValueError):
+            helpers.compile_rules({"a": {"requird": True}})
+        with self.assertRaises(Exception):
+            helpers.compile_rules({"a": {"regex": "("}})
+
+    def test_split_valid_and_rejects_with_every_reason(self):
+        df = pd.DataFrame({
+            "phone": ["6900000000", None, "123", "6911111111"],
+            "pct": ["45.5%", "10", "abc", "150"],
+            "status": ["ACTIVE", "ACTIVE", "ACTIVE", "OTHER"],
+        })
+        valid, rejects = helpers.validate_frame(df, self.RULES)
+        self.assertEqual(valid.index.tolist(), [0])
+        self.assertEqual(rejects.index.tolist(), [1, 2, 3])
+        reasons = rejects[helpers.REJECT_REASON_COLUMN].tolist()
+        self.assertEqual(reasons[0], "phone: missing")
+        self.assertEqual(reasons[1], "phone: fewer than 10 digits; pct: not a number")
+        self.assertEqual(reasons[2], "pct: above 100; status: not one of ACTIVE, INACTIVE")
+
+    def test_missing_column_is_added_empty(self):
+        df = pd.DataFrame({"phone": ["6900000000"], "pct": ["1"]})
+        valid, rejects = helpers.validate_frame(df, self.RULES)
+        self.assertIn("status", valid.columns)
+        self.assertTrue(rejects.empty)
+
+    def test_missing_required_column_rejects_every_row(self):
+        valid, rejects = helpers.validate_frame(pd.DataFrame({"pct": ["1", "2"]}), self.RULES)
+        self.assertTrue(valid.empty)
+        self.assertEqual(rejects[helpers.REJECT_REASON_COLUMN].unique().tolist(), ["phone: column missing"])
+
+
+class NumberRangeIndexTests(TempDirTestCase):
+    def write_table(self, rows):
+        path = self.path("ranges.csv")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# comment line\nfrom,to,operator,type\n" + "".join(row + "\n" for row in rows))
+        return path
+
+    def test_lookup_prefixes_and_full_ranges(self):
+        index = helpers.NumberRangeIndex.build(self.write_table([
+            "694,694,Vodafone,mobile",
+            "2100000000,2109999999,OTE,fixed",
+            "697,698,Cosmote,mobile",
+        ]))
+        operators, types = index.lookup(["6941234567", "2101234567", "6989999999", "6990000000", "abc", ""])
+        names = [index.operators[code] if code >= 0 else None for code in operators]
+        self.assertEqual(names, ["Vodafone", "OTE", "Cosmote", None, None, None])
+        self.assertEqual(types[3], -1)
+        self.assertEqual(index.types[types[1]], "fixed")
+
+    def test_overlap_and_unknown_type_are_rejected(self):
+        with self.assertRaises(ValueError):
+            helpers.NumberRangeIndex.build(self.write_table(["694,695,A,mobile", "695,695,B,mobile"]))
+        with self.assertRaises(ValueError):
+            helpers.NumberRangeIndex.build(self.write_table(["694,694,A,satellite"]))
+
+    def test_damaged_cache_is_rebuilt(self):
+        path = self.write_table(["694,694,Vodafone,mobile"])
+        cache = helpers.NumberRangeIndex.cache_path(path)
+        self.addCleanup(lambda: os.path.exists(cache) and os.remove(cache))
+        for damaged in (b"", b"PK\x03\x04 torn"):
+            with open(cache, "wb") as f:
+                f.write(damaged)
+            index = helpers.NumberRangeIndex.load(path)
+            self.assertEqual(index.operators, ["Vodafone"])
+        # ... and the rewritten cache is complete and used next time
+        with np.load(cache) as data:
+            self.assertEqual(list(data["operators"]), ["Vodafone"])
+
+    def test_enrich_providers_fills_categoricals(self):
+        path = self.write_table(["694,694,Vodafone,mobile", "210,210,OTE,fixed"])
+        df = pd.DataFrame({"MSISDN": ["6941234567", "2101234567", "123"]})
+        helpers.enrich_providers(df, csv_path=path)
+        self.assertEqual(df["MOBILE PROVIDER"].tolist(), ["Vodafone", "", ""])
+        self.assertEqual(df["FIXED PROVIDER"].tolist(), ["", "OTE", ""])
+
+
+if __name__ == "__main__":
+    unittest.main()